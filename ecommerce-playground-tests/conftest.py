@@ -1,32 +1,216 @@
 import os
+import functools
 import pytest
+import shutil
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
+import tempfile
+from collections import Counter
+from support.account_pool import AccountPool
+from support.asset_cache import AssetCache
+from support.accounts import AccountProvisioner
+from support.auth_state import all_stores, auth_state_store
+from support.driver_factory import DEFAULT_PROFILE, PROFILES, create_driver
+from support.driver_pool import DriverPool, summarize
+from support.har_proxy import LIVE, MODES, RECORD, REPLAY, HarProxy, merge_session_archives
+from support.helpers import Helpers
+from support.locator_cache import locator_cache
+from support.screenshots import ALWAYS, MODE as SCREENSHOT_MODE, MODES as SCREENSHOT_MODES, active_writer, screenshot_writer
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
 
 DEFAULT_BROWSER = os.environ.get("EP_BROWSER", "chrome").lower()
-HEADLESS = os.environ.get("EP_HEADLESS", "1") not in ("0", "false", "False")
+PROFILE_OVERRIDE = os.environ.get("EP_PROFILE", "").lower()
+POOL_SIZE = int(os.environ.get("EP_POOL_SIZE", "1"))
+POOL_MAX_USES = int(os.environ.get("EP_POOL_MAX_USES", "20"))
+PREWARM = int(os.environ.get("EP_PREWARM", "1"))
+ISOLATION = os.environ.get("EP_ISOLATION", "context").lower()
+IMPLICIT_WAIT = float(os.environ.get("EP_IMPLICIT_WAIT", "5"))
+BASE_URL = "https://ecommerce-playground.lambdatest.io/"
+NETWORK = os.environ.get("EP_NETWORK", LIVE).lower()
+REPLAY_LATENCY = os.environ.get("EP_REPLAY_LATENCY", "zero").lower()
+LOCAL = "local"
+ASSET_CACHE = os.environ.get("EP_ASSET_CACHE", "0") == "1"
+
+_POOLS_KEY = pytest.StashKey()
+_WORKER_REPORTS_KEY = pytest.StashKey()
+_WORKER_LOCATOR_KEY = pytest.StashKey()
+_ACCOUNT_POOL_KEY = pytest.StashKey()
+_WORKER_ACCOUNTS_KEY = pytest.StashKey()
+_WORKER_AUTH_KEY = pytest.StashKey()
+_PROXY_KEY = pytest.StashKey()
+_ASSET_CACHE_KEY = pytest.StashKey()
+_WORKER_NETWORK_KEY = pytest.StashKey()
+_WORKER_ASSETS_KEY = pytest.StashKey()
+_WORKER_SCREENSHOTS_KEY = pytest.StashKey()
+_STAND_IN_KEY = pytest.StashKey()
+_STAND_IN_DIR_KEY = pytest.StashKey()
+_WORKER_STAND_IN_KEY = pytest.StashKey()
 
 
 def pytest_configure(config):
+    if NETWORK not in MODES + (LOCAL,):
+        raise pytest.UsageError(f"EP_NETWORK must be one of {', '.join(MODES + (LOCAL,))}, got {NETWORK!r}")
+    if SCREENSHOT_MODE not in SCREENSHOT_MODES:
+        raise pytest.UsageError(
+            f"EP_SCREENSHOTS must be one of {', '.join(SCREENSHOT_MODES)}, got {SCREENSHOT_MODE!r}"
+        )
     config.addinivalue_line("markers", "integration: marks tests as integration tests")
-    
-def _chrome_driver():
-    opts = ChromeOptions()
-    if HEADLESS:
-        opts.add_argument("--headless=new")
-        opts.add_argument("--window-size=1920,1080")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    service = ChromeService(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=opts)
+    config.addinivalue_line("markers", "functional: marks tests as functional (account-level) tests")
+    config.addinivalue_line(
+        "markers", f"profile(name): driver profile for the test, one of {', '.join(PROFILES)} (EP_PROFILE overrides)"
+    )
+    config.addinivalue_line(
+        "markers", "static: read-only test of server-rendered HTML; `driver` is a StaticDriver (HTTP, no browser)"
+    )
+
+
+def _new_pool(browser_name, profile, assets=None):
+    if browser_name != "chrome":
+        raise ValueError(f"Unsupported browser: {browser_name}")
+    factory = functools.partial(create_driver, profile, offline=NETWORK in (REPLAY, LOCAL), assets=assets)
+    return DriverPool(factory, max_idle=POOL_SIZE, max_uses=POOL_MAX_USES, implicit_wait=IMPLICIT_WAIT,
+                      spares=PREWARM, name=profile, isolation=ISOLATION)
+
+
+def _get_pool(config, browser_name, profile):
+    pools = config.stash.setdefault(_POOLS_KEY, {})
+    if profile not in pools:
+        pools[profile] = _new_pool(browser_name, profile, _get_asset_cache(config))
+    return pools[profile]
+
+
+def _get_account_pool(config):
+    if _ACCOUNT_POOL_KEY not in config.stash:
+        # the stand-in forgets its accounts when it stops, so its pool must not outlive the session
+        path = os.path.join(config.stash[_STAND_IN_DIR_KEY], "accounts") if _get_stand_in(config) else None
+        config.stash[_ACCOUNT_POOL_KEY] = AccountPool(AccountProvisioner(_base_url(config)), path=path)
+    return config.stash[_ACCOUNT_POOL_KEY]
+
+
+def _get_proxy(config):
+    """The record/replay proxy (support.har_proxy), started on first use; None unless EP_NETWORK=record|replay."""
+    if NETWORK not in (RECORD, REPLAY):
+        return None
+    if _PROXY_KEY not in config.stash:
+        config.stash[_PROXY_KEY] = HarProxy(BASE_URL, NETWORK, latency=REPLAY_LATENCY).start()
+    return config.stash[_PROXY_KEY]
+
+
+def _get_asset_cache(config):
+    """
+    The shared static asset cache (support.asset_cache) every browser is wired to; None unless EP_ASSET_CACHE=1
+    in live mode (recordings and the stand-in must see the browser's own requests).
+    """
+    if not (ASSET_CACHE and NETWORK == LIVE):
+        return None
+    if _ASSET_CACHE_KEY not in config.stash:
+        config.stash[_ASSET_CACHE_KEY] = AssetCache()
+    return config.stash[_ASSET_CACHE_KEY]
+
+
+def _get_stand_in(config):
+    """The local stand-in store (support.stand_in), started on first use; None unless EP_NETWORK=local."""
+    if NETWORK != LOCAL:
+        return None
+    if _STAND_IN_KEY not in config.stash:
+        stand_in = StandIn().start()
+        # login snapshots are per session too: a cookie from an earlier stand-in names no session in this one
+        state_dir = config.stash[_STAND_IN_DIR_KEY] = tempfile.mkdtemp(prefix="ep-stand-in-")
+        auth_state_store(stand_in.base_url, path=os.path.join(state_dir, "auth"))
+        config.stash[_STAND_IN_KEY] = stand_in
+    return config.stash[_STAND_IN_KEY]
+
+
+def _base_url(config):
+    stand_in = _get_stand_in(config)
+    if stand_in:
+        return stand_in.base_url
+    proxy = _get_proxy(config)
+    return proxy.base_url if proxy else BASE_URL
+
 
+def _profile_for(item):
+    if PROFILE_OVERRIDE:
+        return PROFILE_OVERRIDE
+    marker = item.get_closest_marker("profile")
+    return marker.args[0] if marker else DEFAULT_PROFILE
+
+
+def _unit_tests_only(config):
+    # tests/unit needs no browser; only the command line is known before collection
+    unit = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "unit")
+    paths = [os.path.join(str(config.invocation_params.dir), arg.split("::")[0]) for arg in config.args]
+    return bool(paths) and all(os.path.commonpath([unit, os.path.abspath(p)]) == unit for p in paths)
+
+
+def pytest_sessionstart(session):
+    # start launching browsers now so they come up while collection is still running
+    config = session.config
+    if config.option.collectonly or DEFAULT_BROWSER != "chrome" or _unit_tests_only(config):
+        return
+    if not hasattr(config, "workerinput") and getattr(config.option, "dist", "no") != "no":
+        return  # xdist controller: the workers run the tests
+    _get_proxy(config)
+    _get_pool(config, DEFAULT_BROWSER, PROFILE_OVERRIDE or DEFAULT_PROFILE).prewarm()
+
+def pytest_collection_modifyitems(session, config, items):
+    # register whatever accounts the pool lacks while the first tests run
+    needed = sum(1 for item in items if "creds" in getattr(item, "fixturenames", ()))
+    if needed and not (config.option.collectonly or config.option.setupplan):
+        pool = _get_account_pool(config)
+        pool.fill_async(min(needed, pool.size))
 
 @pytest.fixture(scope="session")
-def base_url():
-    return "https://ecommerce-playground.lambdatest.io/" 
+def stand_in(request):
+    """The local stand-in store under EP_NETWORK=local (its in-memory state can be inspected), else None."""
+    return _get_stand_in(request.config)
+
+@pytest.fixture(scope="session")
+def base_url(request, stand_in):
+    """The store's root URL, the record/replay proxy's (EP_NETWORK=record|replay) or the stand-in's (local)."""
+    return _base_url(request.config)
+
+@pytest.fixture(autouse=True)
+def _network_archive(request):
+    # each test's traffic is recorded to / replayed from its own archive
+    proxy = request.config.stash.get(_PROXY_KEY, None)
+    if proxy is None:
+        yield
+        return
+    proxy.start_test(request.node.nodeid)
+    yield
+    proxy.finish_test()
+
+@pytest.fixture(autouse=True)
+def _screenshot_policy(request):
+    # on-failure holds a test's screenshots until its outcome is known; sampled decides per test
+    if SCREENSHOT_MODE == ALWAYS:
+        yield
+        return
+    writer = screenshot_writer()
+    writer.start_test(request.node.nodeid)
+    yield
+    writer.finish_test(_test_failed(request.node), request.node.nodeid)
+
+@pytest.fixture(scope="session")
+def account_provisioner(base_url):
+    """Creates accounts over HTTP and signs drivers in as them (support.accounts)."""
+    return AccountProvisioner(base_url)
+
+@pytest.fixture(scope="function")
+def creds(request):
+    """{"email", "password"} of a pooled account leased to this test alone (support.account_pool)."""
+    pool = _get_account_pool(request.config)
+    account = pool.lease()
+    yield account
+    pool.release(account, retire=_test_failed(request.node), test=request.node.nodeid)
+
+@pytest.fixture(scope="function")
+def helpers(driver, base_url):
+    """open(path), login(email, password) from a cached session snapshot, success_or_warning_text()."""
+    h = Helpers(driver, base_url)
+    yield h
+    h.close()
 
 @pytest.fixture(params=["chrome"], scope="session")
 def browser_name(request):
@@ -36,14 +220,287 @@ def browser_name(request):
     return request.param
 
 @pytest.fixture(scope="function")
-def driver(request, browser_name):
-    if browser_name == "chrome":
-        driver = _chrome_driver()
-    else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
-    driver.implicitly_wait(5)
-    yield driver
-    try:
-        driver.quit()
-    except Exception:
-        pass
+def driver_pool(request, browser_name):
+    return _get_pool(request.config, browser_name, _profile_for(request.node))
+
+@pytest.fixture(scope="function")
+def static_driver():
+    drv = StaticDriver()
+    yield drv
+    drv.quit()
+
+@pytest.fixture(scope="function")
+def driver(request):
+    if request.node.get_closest_marker("static"):
+        yield request.getfixturevalue("static_driver")
+        request.node.user_properties.append(("driver_profile", "static"))
+        return
+    driver_pool = request.getfixturevalue("driver_pool")
+    lease = driver_pool.acquire()
+    yield lease.driver
+    driver_pool.release(lease, failed=_test_failed(request.node), test=request.node.nodeid)
+    request.node.user_properties.append(("driver_profile", driver_pool.name))
+    request.node.user_properties.append(("driver_pool", lease.summary()))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # expose each phase's report on the item so fixtures can see whether the test failed
+    outcome = yield
+    rep = outcome.get_result()
+    setattr(item, f"rep_{rep.when}", rep)
+
+
+def _test_failed(node):
+    """Whether the test failed in setup or call (needs the reports pytest_runtest_makereport stores)."""
+    return any(getattr(getattr(node, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
+
+
+def pytest_sessionfinish(session):
+    # under xdist each worker owns its pool; ship its usage back to the controller
+    workeroutput = getattr(session.config, "workeroutput", None)
+    pools = session.config.stash.get(_POOLS_KEY, {})
+    for pool in pools.values():
+        pool.close()
+    if workeroutput is not None and pools:
+        workeroutput["driver_pool"] = [pool.report() for pool in pools.values()]
+    cache = locator_cache()
+    if cache is not None:
+        cache.save()
+        if workeroutput is not None:
+            workeroutput["locator_cache"] = cache.report()
+    accounts = session.config.stash.get(_ACCOUNT_POOL_KEY, None)
+    if accounts is not None:
+        accounts.close()
+        if workeroutput is not None:
+            workeroutput["account_pool"] = accounts.report()
+    proxy = session.config.stash.get(_PROXY_KEY, None)
+    if proxy is not None:
+        proxy.stop()
+        if workeroutput is not None:
+            workeroutput["network"] = proxy.report()
+    if NETWORK == RECORD and workeroutput is None:
+        # xdist workers each recorded their own session traffic; replay reads one file
+        merge_session_archives()
+    assets = session.config.stash.get(_ASSET_CACHE_KEY, None)
+    if assets is not None and workeroutput is not None:
+        workeroutput["asset_cache"] = assets.report()
+    stand_in = session.config.stash.get(_STAND_IN_KEY, None)
+    if stand_in is not None:
+        stand_in.stop()
+        shutil.rmtree(session.config.stash[_STAND_IN_DIR_KEY], ignore_errors=True)
+        if workeroutput is not None:
+            workeroutput["stand_in"] = stand_in.report()
+    if workeroutput is not None and all_stores():
+        workeroutput["auth_state"] = [store.report() for store in all_stores()]
+    writer = active_writer()
+    if writer is not None:
+        # screenshots still queued are written before the session ends
+        writer.close()
+        if workeroutput is not None:
+            workeroutput["screenshots"] = writer.report()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    for report in getattr(node, "workeroutput", {}).get("driver_pool", []):
+        node.config.stash.setdefault(_WORKER_REPORTS_KEY, []).append((node.gateway.id, report))
+    if "locator_cache" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_LOCATOR_KEY, []).append(node.workeroutput["locator_cache"])
+    if "account_pool" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_ACCOUNTS_KEY, []).append(node.workeroutput["account_pool"])
+    if "network" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_NETWORK_KEY, []).append(node.workeroutput["network"])
+    if "asset_cache" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_ASSETS_KEY, []).append(node.workeroutput["asset_cache"])
+    if "screenshots" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_SCREENSHOTS_KEY, []).append(node.workeroutput["screenshots"])
+    if "stand_in" in getattr(node, "workeroutput", {}):
+        node.config.stash.setdefault(_WORKER_STAND_IN_KEY, []).append(node.workeroutput["stand_in"])
+    for report in getattr(node, "workeroutput", {}).get("auth_state", []):
+        node.config.stash.setdefault(_WORKER_AUTH_KEY, []).append(report)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    _locator_cache_summary(terminalreporter, config)
+    _account_pool_summary(terminalreporter, config)
+    _auth_state_summary(terminalreporter, config)
+    _network_summary(terminalreporter, config)
+    _asset_cache_summary(terminalreporter, config)
+    _stand_in_summary(terminalreporter, config)
+    _screenshot_summary(terminalreporter, config)
+    reports = list(config.stash.get(_WORKER_REPORTS_KEY, []))
+    reports += [("main", pool.report()) for pool in config.stash.get(_POOLS_KEY, {}).values()]
+    if not any(r["leases"] for _, r in reports):
+        return
+    tr = terminalreporter
+    tr.section("driver pool")
+    for worker, report in sorted(reports, key=lambda wr: (wr[0], wr[1]["name"])):
+        for lease in report["leases"]:
+            tr.write_line(
+                f"[{worker}] {report['name']:<8} {'hit ' if lease['hit'] else 'miss'} "
+                f"acquire={lease['acquire_s']:.2f}s reset={lease['reset_s']:.2f}s"
+                f"{' context' if lease.get('isolated') else ''}"
+                f"{' recycled' if lease['recycled'] else ''}  {lease['test']}"
+            )
+    s = summarize([r for _, r in reports])
+    profiles = Counter()
+    for _, report in reports:
+        profiles[report["name"]] += len(report["leases"])
+    tr.write_line("tests per profile: " + ", ".join(f"{name}={n}" for name, n in sorted(profiles.items())))
+    tr.write_line(
+        f"workers={len({w for w, _ in reports})} leases={s['leases']} hits={s['hits']} misses={s['misses']} "
+        f"launches={s['launches']} recycled={s['recycled']} reset_total={s['reset_s']:.2f}s"
+    )
+    tr.write_line(f"prewarmed leases={s['prewarmed']} launch latency hidden={s['hidden_s']:.2f}s")
+    tr.write_line(f"leases isolated in a browser context={s['isolated']}")
+
+    lossy = [(lease["implicit_lost_s"], lease["implicit_misses"], worker, lease["test"])
+             for worker, report in reports for lease in report["leases"] if lease.get("implicit_misses")]
+    if lossy:
+        tr.section("implicit waits")
+        for lost, misses, worker, test in sorted(lossy, reverse=True):
+            tr.write_line(f"[{worker}] lost={lost:.2f}s misses={misses}  {test}")
+        tr.write_line(
+            f"implicit wait={IMPLICIT_WAIT:g}s total lost={s['implicit_lost_s']:.2f}s "
+            f"over {s['implicit_misses']} missed lookups (probe them with support.wait_policy.probing)"
+        )
+
+
+def _totals(reports):
+    """total(key): the sum of `key` over every process's report."""
+    return lambda key: sum(r[key] for r in reports)
+
+
+def _account_pool_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_ACCOUNTS_KEY, []))
+    pool = config.stash.get(_ACCOUNT_POOL_KEY, None)
+    if pool is not None and not hasattr(config, "workerinput"):
+        reports.append(pool.report())
+    if not any(r["leased"] or r["created"] for r in reports):
+        return
+    total = _totals(reports)
+    tr.section("account pool")
+    tr.write_line(
+        f"leased={total('leased')} lease wait={total('lease_wait_s'):.2f}s "
+        f"created={total('created')} in {total('create_s'):.2f}s "
+        f"retired={total('retired')} ({pool.dir if pool else 'per worker'})"
+    )
+    for error in [e for r in reports for e in r["errors"]]:
+        tr.write_line(f"registration failed: {error}")
+
+
+def _auth_state_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_AUTH_KEY, []))
+    if not hasattr(config, "workerinput"):
+        reports += [store.report() for store in all_stores()]
+    if not any(r["form_logins"] or r["restores"] for r in reports):
+        return
+    total = _totals(reports)
+
+    tr.section("login state")
+    tr.write_line(
+        f"form logins={total('form_logins')} ({total('form_login_s'):.2f}s) "
+        f"restored={total('restores')} ({total('restore_s'):.2f}s) "
+        f"expired={total('expired')} login time saved~{total('saved_s'):.2f}s"
+    )
+
+
+def _network_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_NETWORK_KEY, []))
+    proxy = config.stash.get(_PROXY_KEY, None)
+    if proxy is not None and not hasattr(config, "workerinput"):
+        reports.append(proxy.report())
+    if not reports:
+        return
+    total = _totals(reports)
+    tr.section(f"network ({NETWORK})")
+    tr.write_line(
+        f"requests={total('requests')} archives written={total('archives')} "
+        f"upstream time={total('upstream_s'):.2f}s simulated latency={total('simulated_s'):.2f}s "
+        f"replay misses={total('misses')}"
+    )
+    for missed in [m for r in reports for m in r["missed"]]:
+        tr.write_line(f"not recorded: {missed}")
+
+
+def _asset_cache_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_ASSETS_KEY, []))
+    assets = config.stash.get(_ASSET_CACHE_KEY, None)
+    if assets is not None and not hasattr(config, "workerinput"):
+        reports.append(assets.report())
+    if not reports:
+        return
+    total = _totals(reports)
+
+    mb = 1024 * 1024
+    tr.section("asset cache")
+    tr.write_line(
+        f"hits={total('hits')} revalidated={total('revalidated')} misses={total('misses')} "
+        f"saved {total('requests_saved')} requests and {total('bytes_saved') / mb:.1f} MB "
+        f"(fetched {total('bytes_fetched') / mb:.1f} MB)"
+    )
+    # every process shares the directory, so its size is the largest one seen, not a sum
+    tr.write_line(
+        f"stored={max(r['stored_bytes'] for r in reports) / mb:.1f} MB evicted={total('evicted')} ({reports[0]['dir']})"
+    )
+
+
+def _screenshot_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_SCREENSHOTS_KEY, []))
+    writer = active_writer()
+    if writer is not None and not hasattr(config, "workerinput"):
+        reports.append(writer.report())
+    if not any(r["shots"] or r["dropped"] or r["errors"] for r in reports):
+        return
+    total = _totals(reports)
+
+    mb = 1024 * 1024
+    tr.section("screenshots")
+    tr.write_line(
+        f"written={total('shots')} ({total('bytes') / mb:.1f} MB) capture={total('capture_s'):.2f}s "
+        f"queue wait={total('enqueue_s'):.2f}s background write={total('write_s'):.2f}s "
+        f"saved on test threads~{total('saved_s'):.2f}s"
+    )
+    tr.write_line(
+        f"policy={reports[0]['mode']} dropped={total('dropped')} deduplicated={total('deduplicated')} "
+        f"({total('dedup_bytes') / mb:.1f} MB not stored) stored={max(r['stored_bytes'] for r in reports) / mb:.1f} MB "
+        f"evicted={total('evicted')}"
+    )
+    for error in [e for r in reports for e in r["errors"]]:
+        tr.write_line(f"not written: {error}")
+
+
+def _stand_in_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_STAND_IN_KEY, []))
+    stand_in = config.stash.get(_STAND_IN_KEY, None)
+    if stand_in is not None and not hasattr(config, "workerinput"):
+        reports.append(stand_in.report())
+    if not reports:
+        return
+    total = _totals(reports)
+
+    tr.section("stand-in store")
+    tr.write_line(
+        f"requests={total('requests')} sessions={total('sessions')} registered={total('registered')} "
+        f"enquiries={total('enquiries')} comments={total('comments')} reviews={total('reviews')}"
+    )
+    for missing in [m for r in reports for m in r["not_found"]]:
+        tr.write_line(f"not served: {missing}")
+
+
+def _locator_cache_summary(tr, config):
+    reports = list(config.stash.get(_WORKER_LOCATOR_KEY, []))
+    cache = locator_cache()
+    if cache is not None and not hasattr(config, "workerinput"):
+        reports.append(cache.report())
+    total = _totals(reports)
+    lookups = total("lookups")
+    if not lookups:
+        return
+    hits = total("hits")
+    tr.section("locator cache")
+    tr.write_line(
+        f"lookups={lookups} hits={hits} hit rate={hits / lookups:.0%} "
+        f"invalidated={total('invalidated')} ({cache.path if cache else 'disabled'})"
+    )
@@ -1,18 +1,27 @@
 # pages/base_page.py
+import logging
+import sys
 import time
-import os
-from datetime import datetime
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from urllib.parse import urljoin
+from support.extract import extract
+from support.forms import SET_VALUE, fill_form
+from support.screenshots import screenshot_writer
+from support.wait_policy import probing
+from support.waits import BrowserWait, document_ready, idle, page_contains, present
+
+logger = logging.getLogger(__name__)
 
 class BasePage:
     DEFAULT_TIMEOUT = 10
+    # carousels and animation timers can keep a loaded page from ever going idle
+    IDLE_BUDGET = 1.5
     def __init__(self, driver, base_url: str, timeout: int = 10):
         self.driver = driver
         self.base_url = base_url
         self.wait = WebDriverWait(driver, timeout)
+        self.waits = BrowserWait(driver, timeout)
 
     def visit(self, path: str = ""):
         if path is None:
@@ -27,46 +36,88 @@ class BasePage:
         self.driver.get(url)
 
     def find(self, by, value, timeout=None):
-        w = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        return w.until(EC.presence_of_element_located((by, value)))
+        return self.finds(by, value, timeout)[0]
 
     def finds(self, by, value, timeout=None):
-        w = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        return w.until(lambda d: d.find_elements(by, value))
+        return self.waits.until(present((by, value)), timeout, f"No element matched {by}={value!r}")
+
+    def resolve(self, chain, timeout=None, root=None):
+        """
+        Resolve a LocatorChain in one in-browser call; returns a ChainMatch (element, index, locator).
+        The winning candidate is remembered per page object and calling method (support.locator_cache).
+        """
+        caller = sys._getframe(1).f_code.co_name
+        key = f"{type(self).__name__}.{caller}:{chain.name or len(chain)}"
+        return self.waits.first(chain, timeout, root, cache_key=key)
+
+    def fill_form(self, fields, fidelity: str = SET_VALUE, timeout=None, root=None):
+        """
+        Fill several fields at once: {locator or LocatorChain: value}. `fidelity` is one of
+        support.forms.SET_VALUE (default, two round trips), INSERT_TEXT or TYPE_KEYS.
+        """
+        fill_form(self.driver, fields, fidelity, self.waits.timeout if timeout is None else timeout, root)
+
+    def extract(self, spec, root=None):
+        """Read {key: support.extract.Query} from the page in one call; returns plain Python data."""
+        return extract(self.driver, spec, root)
+
+    def page_contains(self, text, scope=None, case_insensitive: bool = True, timeout: float = 0) -> bool:
+        """Whether the page (or the `scope` selector) contains `text`, evaluated in the browser."""
+        return page_contains(self.driver, text, scope, case_insensitive, timeout)
+
+    def wait_for(self, condition, timeout=None):
+        """Wait for a support.waits condition (visible, text_present, any_of, ...) and return its value."""
+        return self.waits.until(condition, timeout)
 
     def title(self):
         return self.driver.title
     
     def take_screenshot(self, name: str = None):
         """
-        Take a screenshot and save it to a screenshots directory.
-        If name is provided, use it; otherwise generate a timestamp-based name.
-        Returns the full path to the saved screenshot.
+        Take a screenshot for the screenshots directory, named after `name` (or "screenshot")
+        plus a unique timestamp. The file is written in the background (support.screenshots), so
+        this returns a Screenshot handle: .result() waits for the file and returns its path. Returns
+        None when EP_SCREENSHOTS skips this test's screenshots.
         """
-        # Create screenshots directory if it doesn't exist
-        screenshots_dir = os.path.join(os.getcwd(), "screenshots")
-        os.makedirs(screenshots_dir, exist_ok=True)
-        
-        # Generate filename
-        if name:
-            filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        shot = screenshot_writer().capture(self.driver, name)
+        if shot is None:
+            logger.debug("screenshot %s skipped (EP_SCREENSHOTS)", name or "screenshot")
         else:
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        
-        filepath = os.path.join(screenshots_dir, filename)
-        self.driver.save_screenshot(filepath)
-        print(f"SCREENSHOT SAVED: {filepath}")
-        return filepath
+            logger.debug("screenshot queued: %s", shot.path)
+        return shot
     
-    def wait_for_page_ready(self, timeout: int = None):
+    def wait_for_page_ready(self, timeout: int = None) -> bool:
+        """
+        wait_for_idle() for at most IDLE_BUDGET seconds; after that a page whose readyState is
+        "complete" counts as ready. Only a page that has not loaded within `timeout` is logged.
+        """
         to = timeout or self.DEFAULT_TIMEOUT
-        wait = WebDriverWait(self.driver, to)
+        start = time.monotonic()
+        if self.wait_for_idle(min(self.IDLE_BUDGET, to)):
+            return True
         try:
-            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        except Exception:
-            pass
-        # small additional pause to allow client-side rendering
-        time.sleep(0.2)
+            self.waits.until(document_ready(), max(0.1, to - (time.monotonic() - start)))
+            return True
+        except TimeoutException:
+            logger.warning("page not loaded after %ss: %s", to, self.driver.current_url)
+            return False
+
+    def wait_for_idle(self, timeout: int = None, quiet_ms: int = 100) -> bool:
+        """
+        Return as soon as the page is loaded and quiescent (no AJAX in flight, no pending
+        short timers or jQuery animations); use it instead of sleeping after an action.
+        Returns False if the page was still busy when the timeout ran out.
+        """
+        to = timeout or self.DEFAULT_TIMEOUT
+        try:
+            self.waits.until(idle(quiet_ms), to)
+            return True
+        except TimeoutException:
+            return False
+
+    def scroll_into_view(self, element):
+        # instant, so nothing has to sleep while a smooth scroll animates
+        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", element)
 
 
 
@@ -75,11 +126,16 @@ class BasePage:
         Best-effort dismissal of cookie banners / overlays / modals that block interaction.
         This method intentionally swallows exceptions so callers can continue even if nothing was dismissed.
         """
+        self.wait_for_page_ready(timeout)
+
+        # banners are usually absent: look for them without paying the implicit wait per selector
         try:
-            WebDriverWait(self.driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
-        except TimeoutException:
+            with probing(self.driver):
+                self._click_overlay_candidates()
+        except Exception:
             pass
 
+    def _click_overlay_candidates(self):
         candidates = [
             "button.cc-allow",
             ".cc-btn",
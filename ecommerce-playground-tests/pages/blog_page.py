@@ -1,9 +1,9 @@
 # pages/blog_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from support.locators import LocatorChain
+from support.extract import Query
+from support.waits import any_of, present, visible
 from .base_page import BasePage
-import time
 
 class BlogPage(BasePage):
     COMMENT_NAME_FIELD = (By.ID, "input-name")
@@ -14,6 +14,19 @@ class BlogPage(BasePage):
     COMMENT_SUCCESS_MESSAGE = (By.CSS_SELECTOR, ".alert.alert-success.alert-dismissible, .alert.alert-success, .success, .text-success")
     COMMENT_SUCCESS_ALERT = (By.CSS_SELECTOR, "#form-comment .alert.alert-success.alert-dismissible, form#form-comment .alert.alert-success")
     COMMENT_ERROR_MESSAGE = (By.CSS_SELECTOR, ".alert.alert-danger, .text-danger, .error")
+    COMMENT_FORM_RESPONSE = (By.CSS_SELECTOR, "#form-comment .alert, #form-comment .text-danger")
+    COMMENT_FORM_ANCHOR = LocatorChain(
+        (By.XPATH, "//div[@data-id and contains(@class, 'content-comment-form')]"),
+        (By.ID, "form-comment"),
+        (By.XPATH, "//h4[contains(text(), 'Write a comment')]"),
+        (By.CSS_SELECTOR, "div[data-id][id*='entry'], div[class*='comment-form']"),
+        name="comment form",
+    )
+    COMMENT_NAME_INPUT = LocatorChain(COMMENT_NAME_FIELD, (By.NAME, "name"), name="comment name")
+    COMMENT_EMAIL_INPUT = LocatorChain(COMMENT_EMAIL_FIELD, (By.NAME, "email"), name="comment email")
+    COMMENT_TEXT_INPUT = LocatorChain(
+        COMMENT_TEXT_FIELD, (By.NAME, "text"), (By.NAME, "comment"), name="comment text"
+    )
 
     def __init__(self, driver, base_url):
         super().__init__(driver, base_url)
@@ -27,95 +40,27 @@ class BlogPage(BasePage):
     def scroll_to_comment_form(self):
         """Scroll directly to the comment form element"""
         try:
-            # Try to find container with data-id 
-            form_container = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@data-id and contains(@class, 'content-comment-form')]"))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", form_container)
-            time.sleep(0.5)
-            return form_container
+            form = self.resolve(self.COMMENT_FORM_ANCHOR, timeout=10).element
+            self.scroll_into_view(form)
+            return form
         except Exception:
-            try:
-                # Try to find form-comment by ID
-                form = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "form-comment"))
-                )
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", form)
-                time.sleep(0.5)
-                return form
-            except Exception:
-                try:
-                   
-                    comment_title = self.driver.find_element(By.XPATH, "//h4[contains(text(), 'Write a comment')]")
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", comment_title)
-                    time.sleep(0.5)
-                    return comment_title
-                except Exception:
-                    try:
-                        # Try to find container with data-id attribute
-                        form_container = self.driver.find_element(By.CSS_SELECTOR, "div[data-id][id*='entry'], div[class*='comment-form']")
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", form_container)
-                        time.sleep(0.5)
-                        return form_container
-                    except Exception:
-                        # Fallback: scroll to bottom
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(0.5)
-                        return None
+            # Fallback: scroll to bottom
+            self.driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'instant'});")
+            return None
 
     def fill_comment_form(self, name: str, email: str, comment: str):
         """Fill the comment form with provided data"""
         # Scroll to comment form if not already visible
         self.scroll_to_comment_form()
-        
-        # Wait for comment form to be visible
-        try:
-            self.wait.until(EC.presence_of_element_located(self.COMMENT_NAME_FIELD))
-        except Exception:
-            pass
-        
-        # Fill name field
-        try:
-            name_el = self.find(*self.COMMENT_NAME_FIELD)
-            name_el.clear()
-            name_el.send_keys(name)
-        except Exception:
-            # Try by name attribute
-            try:
-                name_el = self.driver.find_element(By.NAME, "name")
-                name_el.clear()
-                name_el.send_keys(name)
-            except Exception:
-                pass
-        
-        # Fill email field
-        try:
-            email_el = self.find(*self.COMMENT_EMAIL_FIELD)
-            email_el.clear()
-            email_el.send_keys(email)
-        except Exception:
-            try:
-                email_el = self.driver.find_element(By.NAME, "email")
-                email_el.clear()
-                email_el.send_keys(email)
-            except Exception:
-                pass
-        
-        # Fill comment field
+
+        fields = {self.COMMENT_NAME_INPUT: name, self.COMMENT_EMAIL_INPUT: email, self.COMMENT_TEXT_INPUT: comment}
         try:
-            comment_el = self.find(*self.COMMENT_TEXT_FIELD)
-            comment_el.clear()
-            comment_el.send_keys(comment)
+            self.fill_form(fields)
         except Exception:
-            try:
-                comment_el = self.driver.find_element(By.NAME, "text")
-                comment_el.clear()
-                comment_el.send_keys(comment)
-            except Exception:
+            # fill whatever this theme does have, one field at a time
+            for chain, value in fields.items():
                 try:
-                    comment_el = self.driver.find_element(By.NAME, "comment")
-                    comment_el.clear()
-                    comment_el.send_keys(comment)
+                    self.fill_form({chain: value}, timeout=0)
                 except Exception:
                     pass
 
@@ -136,44 +81,37 @@ class BlogPage(BasePage):
                     self.driver.execute_script("arguments[0].click();", btn)
             except Exception:
                 pass
-        self.wait_for_page_ready()
-        time.sleep(1)
+        # the comment is posted over AJAX; return once the form reports back
+        try:
+            self.wait_for(present(self.COMMENT_FORM_RESPONSE), timeout=5)
+        except Exception:
+            pass
 
     def wait_for_success_alert(self, timeout=10):
         """Wait for the success alert to appear inside the form and scroll to it"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            alert = wait.until(EC.presence_of_element_located(self.COMMENT_SUCCESS_ALERT))
-            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", alert)
-            time.sleep(0.5)
+            # the in-form alert is preferred, any success message will do
+            hit = self.wait_for(any_of(present(self.COMMENT_SUCCESS_ALERT), present(self.COMMENT_SUCCESS_MESSAGE)), timeout)
+            alert = hit["value"][0]
+            self.scroll_into_view(alert)
             return alert
         except Exception:
-            try:
-                wait = WebDriverWait(self.driver, timeout)
-                alert = wait.until(EC.presence_of_element_located(self.COMMENT_SUCCESS_MESSAGE))
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", alert)
-                time.sleep(0.5)
-                return alert
-            except Exception:
-                return None
+            return None
 
     def ensure_success_alert_visible(self):
         """Ensure the success alert is visible in viewport for screenshot"""
         try:
             form = self.driver.find_element(By.ID, "form-comment")
-            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", form)
-            time.sleep(0.5)
+            self.scroll_into_view(form)
             
             try:
                 alert = form.find_element(By.CSS_SELECTOR, ".alert.alert-success.alert-dismissible, .alert.alert-success")
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", alert)
-                time.sleep(0.5)
+                self.scroll_into_view(alert)
                 return True
             except Exception:
                 return True
         except Exception:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
+            self.driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'instant'});")
             return False
 
     def get_success_message(self, timeout=10):
@@ -198,9 +136,7 @@ class BlogPage(BasePage):
             
             for xpath in success_xpath_selectors:
                 try:
-                    message = WebDriverWait(self.driver, 2).until(
-                        EC.visibility_of_element_located((By.XPATH, xpath))
-                    )
+                    message = self.wait_for(visible((By.XPATH, xpath)), timeout=2)[0]
                     text = message.text.strip().replace('×', '').strip()
                     if text and 'thank you' in text.lower() and 'webmaster' in text.lower():
                         return text
@@ -210,8 +146,7 @@ class BlogPage(BasePage):
             pass
         
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            el = wait.until(EC.visibility_of_element_located(self.COMMENT_SUCCESS_MESSAGE))
+            el = self.wait_for(visible(self.COMMENT_SUCCESS_MESSAGE), timeout)[0]
             text = el.text.strip().replace('×', '').strip()
             if text and 'thank you' in text.lower() and 'webmaster' in text.lower():
                 return text
@@ -219,9 +154,11 @@ class BlogPage(BasePage):
             pass
         
         try:
-            alerts = self.driver.find_elements(By.CSS_SELECTOR, "#form-comment .alert, .alert.alert-success")
-            for alert in alerts:
-                text = alert.text.strip().replace('×', '').strip()
+            alerts = self.extract({
+                "alerts": Query((By.CSS_SELECTOR, "#form-comment .alert, .alert.alert-success")),
+            })["alerts"]
+            for text in alerts:
+                text = text.replace('×', '').strip()
                 if text and 'thank you' in text.lower() and 'webmaster' in text.lower():
                     return text
         except Exception:
@@ -232,8 +169,7 @@ class BlogPage(BasePage):
     def get_error_message(self, timeout=5):
         """Get error message if comment submission fails"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            el = wait.until(EC.visibility_of_element_located(self.COMMENT_ERROR_MESSAGE))
+            el = self.wait_for(visible(self.COMMENT_ERROR_MESSAGE), timeout)[0]
             return el.text.strip()
         except Exception:
             return None
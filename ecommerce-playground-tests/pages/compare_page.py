@@ -1,7 +1,8 @@
 # pages/compare_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from support.locators import LocatorChain
+from support.extract import Query
+from support.waits import any_of, present
 from .base_page import BasePage
 
 
@@ -25,6 +26,46 @@ class ComparePage(BasePage):
         ".alert-success, .alert.alert-success, .alert-dismissible.alert-success, "
         "div.alert-success, .alert-success .close"
     )
+    HEADER_COMPARE_LINK = LocatorChain(
+        (By.CSS_SELECTOR, "div#entry_217823 a[aria-label='Compare']"),
+        (By.XPATH, "//div[@id='entry_217823']//a[@aria-label='Compare']"),
+        (By.XPATH, "//header//div[@id='entry_217823']//a[contains(@href, 'product/compare')]"),
+        (By.XPATH, "//header//a[@aria-label='Compare']"),
+        (By.XPATH, "//header//a[contains(@href, 'product/compare')]"),
+        (By.XPATH, "//a[@aria-label='Compare']"),
+        (By.XPATH, "//a[contains(@href, 'product/compare')]"),
+        name="header compare link",
+    )
+    SUCCESS_MESSAGE_FALLBACKS = LocatorChain(
+        (By.XPATH, "//*[contains(@class, 'alert-success')]"),
+        (By.XPATH, "//*[contains(@class, 'alert') and contains(@class, 'success')]"),
+        (By.XPATH, "//*[contains(text(), 'Success') and contains(text(), 'modified')]"),
+        (By.XPATH, "//*[contains(text(), 'You have modified your product comparison')]"),
+        (By.XPATH, "//div[contains(@class, 'alert-success')]"),
+        (By.XPATH, "//*[contains(text(), 'Success:')]"),
+        name="compare success message",
+    )
+    COMPARE_TABLE_ROOT = (By.CSS_SELECTOR, "table#compare-products, #content table, .table-responsive table")
+    # product cells inside the compare table, best candidates first
+    PRODUCT_NAME_IN_TABLE = LocatorChain(
+        (By.CSS_SELECTOR, "thead tr th a[href*='product/product']"),
+        (By.CSS_SELECTOR, "thead tr th strong"),
+        (By.CSS_SELECTOR, "tbody tr:first-child td a[href*='product/product']"),
+        (By.CSS_SELECTOR, "tbody tr:first-child td strong"),
+        (By.CSS_SELECTOR, "tr:first-child td a[href*='product/product']"),
+        (By.CSS_SELECTOR, "tr:first-child td strong"),
+        name="compare table product names",
+    )
+    # used when the page has no recognisable compare table
+    PRODUCT_NAME_ANYWHERE = LocatorChain(
+        (By.CSS_SELECTOR, "table#compare-products td strong"),
+        (By.CSS_SELECTOR, "table#compare-products td a[href*='product/product']:not([href*='remove'])"),
+        (By.CSS_SELECTOR, "#content table td strong"),
+        (By.CSS_SELECTOR, "#content table td a[href*='product/product']:not([href*='remove'])"),
+        (By.CSS_SELECTOR, ".table-responsive table td strong"),
+        (By.CSS_SELECTOR, ".table-responsive table td a[href*='product/product']:not([href*='remove'])"),
+        name="compare product names",
+    )
 
     def __init__(self, driver, base_url):
         super().__init__(driver, base_url)
@@ -40,38 +81,14 @@ class ComparePage(BasePage):
         self.visit("")
         self._dismiss_overlays()
         try:
-            # Finding compare button in header 
-            compare_locators = [
-                (By.CSS_SELECTOR, "div#entry_217823 a[aria-label='Compare']"),
-                (By.XPATH, "//div[@id='entry_217823']//a[@aria-label='Compare']"),
-                (By.XPATH, "//header//div[@id='entry_217823']//a[contains(@href, 'product/compare')]"),
-                (By.XPATH, "//header//a[@aria-label='Compare']"),
-                (By.XPATH, "//header//a[contains(@href, 'product/compare')]"),
-                (By.XPATH, "//a[@aria-label='Compare']"),   
-                (By.XPATH, "//a[contains(@href, 'product/compare')]")
-            ]
-            
-            compare_link = None
-            for locator in compare_locators:
-                try:
-                    compare_link = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located(locator)
-                    )
-                    # Scroll element into view if it's hidden
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", compare_link)
-                    break
-                except Exception:
-                    continue
-            
-            if compare_link:
-                # Try to wait for it to be clickable
-                WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable(compare_link))
-                try:
-                    compare_link.click()
-                except Exception:
-                    self.driver.execute_script("arguments[0].click();", compare_link)
-            else:
-                raise Exception("Compare button not found")
+            # Finding compare button in header (all candidates share one 3 s budget)
+            compare_link = self.resolve(self.HEADER_COMPARE_LINK, timeout=3).element
+            # Scroll element into view if it's hidden
+            self.scroll_into_view(compare_link)
+            try:
+                compare_link.click()
+            except Exception:
+                self.driver.execute_script("arguments[0].click();", compare_link)
         except Exception:
             # Navigating directly to compare page
             self.visit("index.php?route=product/compare")
@@ -118,10 +135,7 @@ class ComparePage(BasePage):
         """Get success message text after removing a product"""
         try:
             # First try CSS selector for alert-success
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(self.SUCCESS_MESSAGE)
-            )
-            message = self.driver.find_element(*self.SUCCESS_MESSAGE)
+            message = self.find(*self.SUCCESS_MESSAGE, timeout=timeout)
             text = message.text.strip()
             # Remove the close button '×' if present
             text = text.replace('×', '').strip()
@@ -132,27 +146,13 @@ class ComparePage(BasePage):
         
         # Try XPath selectors that specifically look for the success message
         try:
-            success_xpath_selectors = [
-                "//*[contains(@class, 'alert-success')]",
-                "//*[contains(@class, 'alert') and contains(@class, 'success')]",
-                "//*[contains(text(), 'Success') and contains(text(), 'modified')]",
-                "//*[contains(text(), 'You have modified your product comparison')]",
-                "//div[contains(@class, 'alert-success')]",
-                "//*[contains(text(), 'Success:')]"
-            ]
-            
-            for xpath in success_xpath_selectors:
-                try:
-                    message = WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((By.XPATH, xpath))
-                    )
-                    text = message.text.strip()
-                    # Remove the close button '×' if present
-                    text = text.replace('×', '').strip()
-                    if text:
-                        return text
-                except Exception:
-                    continue
+            self.resolve(self.SUCCESS_MESSAGE_FALLBACKS, timeout=2)
+            texts = self.extract({"messages": Query(self.SUCCESS_MESSAGE_FALLBACKS)})["messages"]
+            for text in texts:
+                # Remove the close button '×' if present
+                text = text.replace('×', '').strip()
+                if text:
+                    return text
         except Exception:
             pass
         
@@ -165,82 +165,46 @@ class ComparePage(BasePage):
             product_names = []
             seen_names = set()
             
-            #  Looking for product names in the first row of the table (header row with product names)
-            try:
-                # Finding the table
-                table = self.driver.find_element(By.CSS_SELECTOR, "table#compare-products, #content table, .table-responsive table")
-                
-                # Getting all table headers (th) or first row cells (td)
-                first_row_selectors = [
-                    "thead tr th a[href*='product/product']",
-                    "thead tr th strong",
-                    "tbody tr:first-child td a[href*='product/product']",
-                    "tbody tr:first-child td strong",
-                    "tr:first-child td a[href*='product/product']",
-                    "tr:first-child td strong"
-                ]
-                
-                for selector in first_row_selectors:
-                    try:
-                        elements = table.find_elements(By.CSS_SELECTOR, selector)
-                        for elem in elements:
-                            text = elem.text.strip()
-                            href = elem.get_attribute("href") or ""
-                            
-                            # Skip if empty, contains "Remove", already seen, or is a remove link
-                            if (text and text.lower() != "remove" and "remove" not in text.lower() 
-                                and "remove" not in href.lower() and text not in seen_names):
-                                product_names.append(text)
-                                seen_names.add(text)
-                        if product_names:
-                            break
-                    except Exception:
-                        continue
-                
+            def keep(rows):
+                for row in rows:
+                    text = row["text"]
+                    href = row["href"] or ""
+                    # Skip if empty, contains "Remove", already seen, or is a remove link
+                    if (text and text.lower() != "remove" and "remove" not in text.lower()
+                            and "remove" not in href.lower() and text not in seen_names):
+                        product_names.append(text)
+                        seen_names.add(text)
+
+            # every candidate location is read in one call, each candidate on its own so that one
+            # matching only empty or "Remove" cells falls through to the next, as the selector loop did
+            first_row = [Query(loc, ("text", "href"), within=self.COMPARE_TABLE_ROOT)
+                         for loc in self.PRODUCT_NAME_IN_TABLE]
+            anywhere = [Query(loc, ("text", "href")) for loc in self.PRODUCT_NAME_ANYWHERE]
+            data = self.extract({
+                "table": Query(self.COMPARE_TABLE_ROOT, "tag", first=True),
+                #  product names in the first row of the table (header row with product names)
+                **{f"first_row{i}": q for i, q in enumerate(first_row)},
+                # all product links in table cells (excluding remove links)
+                "all_links": Query((By.CSS_SELECTOR, "td a[href*='product/product']:not([href*='remove'])"),
+                                   ("text", "href"), within=self.COMPARE_TABLE_ROOT),
+                # direct selectors if table structure is different
+                **{f"anywhere{i}": q for i, q in enumerate(anywhere)},
+            })
+
+            if data["table"]:
+                for i in range(len(first_row)):
+                    keep(data[f"first_row{i}"])
+                    if product_names:
+                        break
                 # If no products found, looking at all rows but filter properly
                 if not product_names:
-                    try:
-                        # Finding all product links in table cells (excluding remove links)
-                        all_links = table.find_elements(By.CSS_SELECTOR, "td a[href*='product/product']:not([href*='remove'])")
-                        for link in all_links:
-                            text = link.text.strip()
-                            href = link.get_attribute("href") or ""
-                            
-                            # Adding unique product names that are not "Remove"
-                            if (text and text.lower() != "remove" and "remove" not in text.lower() 
-                                and "remove" not in href.lower() and text not in seen_names):
-                                product_names.append(text)
-                                seen_names.add(text)
-                    except Exception:
-                        pass
-                        
-            except Exception:
-                # Trying direct selectors if table structure is different
-                selectors = [
-                    "table#compare-products td strong",
-                    "table#compare-products td a[href*='product/product']:not([href*='remove'])",
-                    "#content table td strong",
-                    "#content table td a[href*='product/product']:not([href*='remove'])",
-                    ".table-responsive table td strong",
-                    ".table-responsive table td a[href*='product/product']:not([href*='remove'])",
-                ]
-                
-                for selector in selectors:
-                    try:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for elem in elements:
-                            text = elem.text.strip()
-                            href = elem.get_attribute("href") or ""
-                            
-                            if (text and text.lower() != "remove" and "remove" not in text.lower() 
-                                and "remove" not in href.lower() and text not in seen_names):
-                                product_names.append(text)
-                                seen_names.add(text)
-                        if product_names:
-                            break
-                    except Exception:
-                        continue
-            
+                    keep(data["all_links"])
+            else:
+                for i in range(len(anywhere)):
+                    keep(data[f"anywhere{i}"])
+                    if product_names:
+                        break
+
             return product_names
         except Exception:
             return []
@@ -248,12 +212,8 @@ class ComparePage(BasePage):
     def is_page_loaded(self):
         """Check if compare page is loaded"""
         try:
-            # Check for either compare table or empty message
-            self.driver.find_element(*self.COMPARE_TABLE)
+            # Check for either compare table or empty message (one explicit wait for both)
+            self.wait_for(any_of(present(self.COMPARE_TABLE), present(self.EMPTY_MESSAGE)), timeout=5)
             return True
         except Exception:
-            try:
-                self.driver.find_element(*self.EMPTY_MESSAGE)
-                return True
-            except Exception:
-                return False
\ No newline at end of file
+            return False
\ No newline at end of file
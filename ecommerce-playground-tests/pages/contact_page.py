@@ -1,7 +1,6 @@
 # pages/contact_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from support.waits import any_of, contains_text, url_contains
 from .base_page import BasePage
 
 
@@ -27,22 +26,11 @@ class ContactPage(BasePage):
    
     def fill_contact_form(self, name,email,enquiry):
         """Fill the contact form with provided data"""
-        self.wait.until(EC.element_to_be_clickable(self.YOUR_NAME))
-        
-        # Fill name field
-        name_el = self.find(*self.YOUR_NAME)
-        name_el.clear()
-        name_el.send_keys(name)
-        
-        # Fill email field
-        email_el = self.find(*self.EMAIL_FIELD)
-        email_el.clear()
-        email_el.send_keys(email)
-        
-        # Fill enquiry field
-        enquiry_el = self.find(*self.ENQUIRY_FIELD)
-        enquiry_el.clear()
-        enquiry_el.send_keys(enquiry)
+        self.fill_form({
+            self.YOUR_NAME: name,
+            self.EMAIL_FIELD: email,
+            self.ENQUIRY_FIELD: enquiry,
+        })
 
     def submit_form(self):
         """Submit the contact form"""
@@ -56,10 +44,9 @@ class ContactPage(BasePage):
     def wait_for_success_page(self, timeout=10):
         """Wait for redirect to success page after form submission"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
             # Wait for URL to contain 'contact/success' or success message to appear
-            wait.until(lambda d: 'contact/success' in d.current_url.lower() or 
-                              self._is_success_page_loaded())
+            self.wait_for(any_of(url_contains("contact/success"),
+                                 contains_text(self.SUCCESS_MESSAGE_TEXT, "body")), timeout)
             return True
         except Exception:
             return False
@@ -68,7 +55,7 @@ class ContactPage(BasePage):
         """Check if success page is loaded"""
         try:
             # Check if success message text is present
-            return self.SUCCESS_MESSAGE_TEXT.lower() in self.driver.page_source.lower()
+            return self.page_contains(self.SUCCESS_MESSAGE_TEXT)
         except Exception:
             return False
 
@@ -1,11 +1,25 @@
+from typing import NamedTuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from support.extract import Query
+from support.fan_out import map_pages
+from support.wait_policy import probing
+from support.waits import clickable, visible
 from .base_page import BasePage
 
+
+class CategoryLink(NamedTuple):
+    name: str
+    href: str
+    final_url: str  # where following the link ended up
+
+
 class HomePage(BasePage):
     FEATURED_SECTION = (By.CSS_SELECTOR, "#content .product-layout, .product-thumb, .product-layout")
     PRODUCT_LINK = (By.CSS_SELECTOR, "#content .product-layout .caption a, .product-thumb a, .product-layout a")
     COOKIE_CLOSE = (By.CSS_SELECTOR, ".cc-btn, .cookie-accept, .cookie-close, .close-cookie, .agree")
+    SHOP_BY_CATEGORY = (By.LINK_TEXT, "Shop by Category")
+    CATEGORY_PANEL = (By.CSS_SELECTOR, "div#widget-navbar-217834 ul.list-unstyled")
 
     def open(self):
         self.visit("")
@@ -13,13 +27,11 @@ class HomePage(BasePage):
 
     def _dismiss_overlays(self, timeout=3):
         # Wait for page load then try clicking common cookie/consent buttons
-        try:
-            self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        except Exception:
-            pass
+        self.wait_for_page_ready()
         for _ in range(2):
             try:
-                btns = self.driver.find_elements(*self.COOKIE_CLOSE)
+                with probing(self.driver):
+                    btns = self.driver.find_elements(*self.COOKIE_CLOSE)
                 if btns:
                     for b in btns:
                         try:
@@ -30,6 +42,47 @@ class HomePage(BasePage):
             except Exception:
                 pass
 
+    def open_category_panel(self, timeout=None):
+        self.wait_for(clickable(self.SHOP_BY_CATEGORY), timeout)[0].click()
+        return self.wait_for(visible(self.CATEGORY_PANEL), timeout)[0]
+
+    def category_links(self):
+        """(name, href) of every named link in the open 'Shop by Category' panel, read in one call."""
+        rows = self.extract({"links": Query((By.TAG_NAME, "a"), ("text", "href"), within=self.CATEGORY_PANEL)})["links"]
+        return [(r["text"].strip(), r["href"]) for r in rows if r["text"].strip()]
+
+    def audit_categories(self, workers=None):
+        """
+        CategoryLink(name, href, final_url) for every link in the 'Shop by Category' panel, in
+        panel order (duplicate names included). The panel is read once; the http(s) links are
+        then followed concurrently over HTTP (support.fan_out), redirects included, so no page
+        is reloaded per category. Only links with no followable href (script handlers, "#") are
+        clicked in the browser. Any link that fails to load raises AssertionError.
+        """
+        self.open_category_panel()
+        links = self.category_links()
+        followable = [i for i, (_, href) in enumerate(links) if href.startswith(("http://", "https://"))]
+        results = dict(zip(followable, map_pages([links[i][1] for i in followable], _follow, workers)))
+        failures = [f"{links[i][0]}: {links[i][1]} -- HTTP {status}"
+                    for i, (_, status) in results.items() if status is not None and status >= 400]
+        if failures:
+            raise AssertionError("Category links that do not load:\n" + "\n".join(failures))
+        return [CategoryLink(name, href, results[i][0] if i in results else self._click_category(i, name))
+                for i, (name, href) in enumerate(links)]
+
+    def _click_category(self, index, name):
+        # by position, so two categories with the same name are each clicked
+        self.visit("")
+        panel = self.open_category_panel()
+        named = [a for a in panel.find_elements(By.TAG_NAME, "a") if a.text.strip()]
+        if index >= len(named) or named[index].text.strip() != name:
+            found = named[index].text.strip() if index < len(named) else f"only {len(named)} links"
+            raise AssertionError(f"Category {name!r} (link {index + 1}) is missing from the re-rendered panel; "
+                                 f"found {found}")
+        named[index].click()
+        self.wait_for_page_ready()
+        return self.driver.current_url
+
     def has_featured_products(self, timeout=10):
         try:
             elems = self.finds(*self.FEATURED_SECTION, timeout=timeout)
@@ -38,4 +91,10 @@ class HomePage(BasePage):
             return len(elems) > 0
         except Exception:
             return False
-        
\ No newline at end of file
+        
+
+
+def _follow(driver, url):
+    # (final URL after redirects, HTTP status or None when the driver cannot tell)
+    driver.get(url)
+    return driver.current_url, getattr(driver, "status_code", None)
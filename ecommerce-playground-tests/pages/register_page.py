@@ -1,7 +1,6 @@
 # pages/register_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from support.waits import clickable, visible
 from .base_page import BasePage
 import re
 
@@ -26,8 +25,7 @@ class RegisterPage(BasePage):
         try:
             # find register via header; prefer waiting for clickable element
             register_locator = (By.XPATH, "//span[normalize-space()='Register']")
-            WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(register_locator))
-            register_btn = self.driver.find_element(*register_locator)
+            register_btn = self.wait_for(clickable(register_locator), timeout=5)[0]
             try:
                 register_btn.click()
             except Exception:
@@ -38,13 +36,14 @@ class RegisterPage(BasePage):
         self.wait_for_page_ready()
 
     def fill_registration_form(self, first, last, email, telephone, password):
-        self.wait.until(EC.element_to_be_clickable(self.FIRST_NAME))
-        el = self.find(*self.FIRST_NAME); el.clear(); el.send_keys(first)
-        el = self.find(*self.LAST_NAME); el.clear(); el.send_keys(last)
-        el = self.find(*self.EMAIL); el.clear(); el.send_keys(email)
-        el = self.find(*self.TELEPHONE); el.clear(); el.send_keys(telephone)
-        el = self.find(*self.PASSWORD); el.clear(); el.send_keys(password)
-        el = self.find(*self.CONFIRM); el.clear(); el.send_keys(password)
+        self.fill_form({
+            self.FIRST_NAME: first,
+            self.LAST_NAME: last,
+            self.EMAIL: email,
+            self.TELEPHONE: telephone,
+            self.PASSWORD: password,
+            self.CONFIRM: password,
+        })
 
     def agree_privacy(self):
         lbl = self.find(*self.PRIVACY_LABEL)
@@ -67,8 +66,7 @@ class RegisterPage(BasePage):
         "Warning: ..." match if found, otherwise the stripped text.
         """
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            el = wait.until(EC.visibility_of_element_located(self.ALERT_DANGER))
+            el = self.wait_for(visible(self.ALERT_DANGER), timeout)[0]
             raw = el.text.strip()
 
             # Prefer an explicit "Warning: ..." substring if present
@@ -0,0 +1,2 @@
+# support/__init__.py
+# test-harness helpers (driver lifecycle, waits, reporting) shared by conftest and pages
@@ -0,0 +1,272 @@
+# support/account_pool.py
+"""
+A pool of ready-made store accounts shared by every test process.
+
+Accounts are kept in <EP_CACHE_DIR>/accounts/<host>/accounts.json and survive
+across runs, so after the first run a test that needs a customer login never
+waits for a registration. Topping the pool up (ensure/fill_async) registers
+the missing accounts concurrently, under fill.lock so parallel workers never
+create the same shortfall twice. The registrations run outside pool.lock,
+which guards accounts.json only for the moment it is read or rewritten, so
+a release at test teardown never waits for the network.
+
+A test leases an account by creating leases/<email>.lock with O_EXCL, which
+no two processes can both win, so xdist workers never share an account. A
+lease whose holder died (same host, process gone; checked with OpenProcess
+on Windows) or that is older than EP_ACCOUNT_LEASE_TTL seconds is broken. On release the account's use count
+is recorded; an account released with retire=True (its test failed, so its
+state is unknown) is never leased again and the pool tops itself back up.
+ensure() drops all but the RETIRED_KEEP most recently retired records, so
+accounts.json does not grow with every failed test.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from .driver_resolver import CACHE_DIR
+
+POOL_SIZE = int(os.environ.get("EP_ACCOUNT_POOL", "4"))
+LEASE_TTL = float(os.environ.get("EP_ACCOUNT_LEASE_TTL", "900"))
+CREATE_WORKERS = 8
+RETIRED_KEEP = 20   # the latest retired records stay in accounts.json for inspection
+_POLL = 0.1
+
+
+class AccountPool:
+    """See the module docstring. Leases are {"email", "password"} dicts."""
+
+    def __init__(self, provisioner, size: int = POOL_SIZE, path: str = None):
+        self.provisioner = provisioner
+        self.size = size
+        # hostname, not netloc: the recording proxy's port changes between runs, cookies ignore ports
+        host = urlparse(provisioner.base_url).hostname
+        self.dir = path or os.path.join(CACHE_DIR, "accounts", host)
+        self.file = os.path.join(self.dir, "accounts.json")
+        self.leases_dir = os.path.join(self.dir, "leases")
+        os.makedirs(self.leases_dir, exist_ok=True)
+        self.created = 0
+        self.create_seconds = 0.0
+        self.leased = 0
+        self.lease_wait_seconds = 0.0
+        self.retired = 0
+        self.errors = []
+        self._held = set()
+        self._filler = None
+        self._lock = threading.Lock()
+
+    def fill_async(self, size: int = None):
+        """Top the pool up to `size` in a background thread (no-op if one is already running)."""
+        with self._lock:
+            if self._filler is None or not self._filler.is_alive():
+                self._filler = threading.Thread(target=self.ensure, args=(size or self.size,),
+                                                name="account-fill", daemon=True)
+                self._filler.start()
+
+    def ensure(self, size: int = None):
+        """Make sure at least `size` usable accounts exist, registering the shortfall concurrently."""
+        size = size or self.size
+        # creating accounts can take a while; only a fill lock older than that is abandoned
+        with self._file_lock("fill.lock", stale=300):
+            with self._pool_lock():
+                records = self._read()
+                kept = _prune_retired(records)
+                if len(kept) < len(records):
+                    self._write(kept)
+                missing = size - sum(1 for r in kept if not r.get("retired"))
+            if missing <= 0:
+                return
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=min(missing, CREATE_WORKERS), thread_name_prefix="account") as ex:
+                new = [a for a in ex.map(self._register, range(missing)) if a]
+            with self._pool_lock():
+                self._write(self._read() + [_record(a) for a in new])
+            self.created += len(new)
+            self.create_seconds += time.perf_counter() - start
+
+    def lease(self) -> dict:
+        """Lease a free account; registers one on the spot only if the pool has none left."""
+        start = time.perf_counter()
+        try:
+            creds = self._lease_free()
+            if creds is None and self._filler is not None:
+                self._filler.join()
+                creds = self._lease_free()
+            if creds is None:
+                account = self.provisioner.register()
+                self.created += 1
+                self._try_lock(account.email)
+                with self._pool_lock():
+                    self._write(self._read() + [_record(account)])
+                creds = {"email": account.email, "password": account.password}
+            self.leased += 1
+            return creds
+        finally:
+            self.lease_wait_seconds += time.perf_counter() - start
+
+    def release(self, creds: dict, retire: bool = False, test: str = None):
+        """Record the use and free the account; retire it when its state can no longer be trusted."""
+        email = creds["email"]
+        with self._pool_lock():
+            records = self._read()
+            for r in records:
+                if r["email"] == email:
+                    r["uses"] = r.get("uses", 0) + 1
+                    r["last_used"] = time.time()
+                    r["last_test"] = test
+                    if retire:
+                        r["retired"] = True
+            self._write(records)
+        if retire:
+            self.retired += 1
+        self._unlock(email)
+        if retire:
+            self.fill_async()
+
+    def close(self):
+        for email in list(self._held):
+            self._unlock(email)
+
+    def report(self):
+        return {
+            "created": self.created,
+            "create_s": round(self.create_seconds, 3),
+            "leased": self.leased,
+            "lease_wait_s": round(self.lease_wait_seconds, 3),
+            "retired": self.retired,
+            "errors": self.errors[-3:],
+        }
+
+    # --- internals ---
+
+    def _register(self, _):
+        try:
+            return self.provisioner.register()
+        except Exception as e:
+            self.errors.append(f"{type(e).__name__}: {e}")
+            return None
+
+    def _lease_free(self):
+        for r in self._read():
+            if not r.get("retired") and self._try_lock(r["email"]):
+                return {"email": r["email"], "password": r["password"]}
+        return None
+
+    def _lease_path(self, email):
+        return os.path.join(self.leases_dir, f"{email}.lock")
+
+    def _try_lock(self, email) -> bool:
+        path = self._lease_path(email)
+        for _ in range(2):
+            if _create_exclusive(path):
+                self._held.add(email)
+                return True
+            if not _is_stale(path, LEASE_TTL):
+                return False
+            _remove(path)
+        return False
+
+    def _unlock(self, email):
+        self._held.discard(email)
+        _remove(self._lease_path(email))
+
+    def _pool_lock(self):
+        # held only around a read-modify-write of accounts.json
+        return self._file_lock("pool.lock", stale=30)
+
+    @contextmanager
+    def _file_lock(self, name, stale):
+        path = os.path.join(self.dir, name)
+        while not _create_exclusive(path):
+            if _is_stale(path, stale):
+                _remove(path)
+            time.sleep(_POLL)
+        try:
+            yield
+        finally:
+            _remove(path)
+
+    def _read(self):
+        try:
+            with open(self.file, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return []
+        return data if isinstance(data, list) else []
+
+    def _write(self, records):
+        tmp = f"{self.file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(records, fh, indent=2)
+        os.replace(tmp, self.file)
+
+
+def _record(account):
+    return {"email": account.email, "password": account.password, "created": time.time(), "uses": 0}
+
+
+def _prune_retired(records):
+    retired = sorted((r for r in records if r.get("retired")),
+                     key=lambda r: r.get("last_used") or r.get("created") or 0, reverse=True)
+    dropped = {id(r) for r in retired[RETIRED_KEEP:]}
+    return [r for r in records if id(r) not in dropped]
+
+
+def _create_exclusive(path) -> bool:
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as fh:
+        json.dump({"pid": os.getpid(), "host": socket.gethostname(), "time": time.time()}, fh)
+    return True
+
+
+def _is_stale(path, ttl) -> bool:
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return True
+        with open(path, encoding="utf-8") as fh:
+            owner = json.load(fh)
+    except (OSError, ValueError):
+        # vanished, or caught half-written: let the caller retry
+        return False
+    if owner.get("host") != socket.gethostname() or not isinstance(owner.get("pid"), int):
+        return False
+    return not _pid_alive(owner["pid"])
+
+
+def _pid_alive(pid) -> bool:
+    """Whether process `pid` still runs on this host; assumes it does when that cannot be told."""
+    if sys.platform.startswith("win"):
+        # os.kill(pid, 0) would send CTRL_C_EVENT here, not probe
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: it exists, someone else's
+        try:
+            code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,133 @@
+# support/accounts.py
+"""
+Creating store accounts over HTTP instead of through the registration form.
+
+    provisioner = AccountProvisioner(base_url)
+    account = provisioner.register()       # POSTs account/register
+    provisioner.sign_in(driver, account)   # the browser is now logged in as it
+
+Registration runs over a session on the shared connection pool
+(support.static_driver.http_session); the form is fetched first so hidden
+fields are posted as the browser would. The store logs a new account in
+straight away, so that session's cookies are the login; sign_in() copies them
+into the WebDriver (via CDP when available, so no page has to be loaded
+first). Only test_registration still exercises the form itself.
+"""
+import random
+import string
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
+from lxml import html as lxml_html
+from .static_driver import http_session
+
+DEFAULT_PASSWORD = "Test@12345"
+REGISTER_ROUTE = "index.php?route=account/register"
+LOGIN_ROUTE = "index.php?route=account/login"
+SUCCESS_TEXT = "Your Account Has Been Created!"
+
+
+class AccountProvisioningError(RuntimeError):
+    """The store rejected the registration or login; the message carries its error text."""
+
+
+@dataclass
+class Account:
+    email: str
+    password: str
+    firstname: str = "Sumangala"
+    lastname: str = "Rao"
+    telephone: str = "0400000000"
+    cookies: list = field(default_factory=list, repr=False)  # [{"name", "value", "path", ...}] of the logged-in session
+
+
+def unique_email(prefix: str = "sumangala"):
+    return f"{prefix}_{''.join(random.choices(string.ascii_lowercase + string.digits, k=7))}@example.com"
+
+
+class AccountProvisioner:
+    """See the module docstring."""
+
+    def __init__(self, base_url: str, timeout: float = 20):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def register(self, email: str = None, password: str = DEFAULT_PASSWORD, **details) -> Account:
+        """Create an account (random email unless given) and return it with its logged-in cookies."""
+        account = Account(email or unique_email(), password, **details)
+        session = http_session()
+        values = {
+            "firstname": account.firstname,
+            "lastname": account.lastname,
+            "email": account.email,
+            "telephone": account.telephone,
+            "password": password,
+            "confirm": password,
+            "newsletter": "0",
+            "agree": "1",
+        }
+        resp = self._submit(session, REGISTER_ROUTE, values)
+        if "account/success" not in resp.url and SUCCESS_TEXT not in resp.text:
+            raise AccountProvisioningError(f"Registering {account.email} failed: {_page_errors(resp) or resp.url}")
+        account.cookies = _cookies(session)
+        return account
+
+    def login(self, account: Account) -> Account:
+        """Start a fresh logged-in session for an existing account (replaces account.cookies)."""
+        session = http_session()
+        resp = self._submit(session, LOGIN_ROUTE, {"email": account.email, "password": account.password})
+        if "account/account" not in resp.url:
+            raise AccountProvisioningError(f"Logging in {account.email} failed: {_page_errors(resp) or resp.url}")
+        account.cookies = _cookies(session)
+        return account
+
+    def sign_in(self, driver, account: Account):
+        """Make `driver` use the account's session; the next page it loads is logged in."""
+        if getattr(driver, "is_static", False):
+            for c in account.cookies:
+                driver.session.cookies.set(c["name"], c["value"], path=c.get("path", "/"))
+            return
+        try:
+            for c in account.cookies:
+                params = {"name": c["name"], "value": c["value"], "url": self.base_url,
+                          "path": c["path"], "secure": c["secure"]}
+                if "expiry" in c:
+                    params["expires"] = c["expiry"]
+                driver.execute_cdp_cmd("Network.setCookie", params)
+            return
+        except Exception:
+            pass
+        # no CDP: cookies can only be added for the page currently loaded
+        if urlparse(driver.current_url).netloc != urlparse(self.base_url).netloc:
+            driver.get(self.base_url)
+        for c in account.cookies:
+            driver.add_cookie(c)
+
+    def _submit(self, session, route, values):
+        url = urljoin(self.base_url, route)
+        page = session.get(url, timeout=self.timeout)
+        page.raise_for_status()
+        doc = lxml_html.document_fromstring(page.content, base_url=page.url)
+        # the page also has search/newsletter forms; the account form is the one asking for a password
+        form = next((f for f in doc.forms if "email" in f.inputs and "password" in f.inputs), None)
+        data = dict(form.form_values()) if form is not None else {}
+        data.update(values)
+        action = form.action if form is not None and form.action else url
+        resp = session.post(action, data=data, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp
+
+
+def _cookies(session):
+    out = []
+    for c in session.cookies:
+        cookie = {"name": c.name, "value": c.value, "path": c.path or "/", "secure": bool(c.secure)}
+        if c.expires:
+            cookie["expiry"] = int(c.expires)
+        out.append(cookie)
+    return out
+
+
+def _page_errors(resp):
+    doc = lxml_html.document_fromstring(resp.content or b"<html></html>")
+    texts = (" ".join(el.text_content().split()) for el in doc.cssselect(".text-danger, .alert-danger"))
+    return "; ".join(t for t in texts if t)
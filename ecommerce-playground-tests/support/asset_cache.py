@@ -0,0 +1,222 @@
+# support/asset_cache.py
+"""
+A disk cache for the store's static assets (CSS, scripts, fonts, images),
+shared by every browser and every test process on the machine.
+
+Chrome starts each pooled browser with an empty cache, so every new browser
+downloads the theme again. With EP_ASSET_CACHE=1 the driver factory hands
+every browser's stylesheet, script, image and font requests to this cache
+(support.asset_interceptor); pages, AJAX and form posts still go straight to
+the store.
+
+Entries live in <EP_CACHE_DIR>/assets/ as <key>.bin (the body) and
+<key>.json (status, headers, validators, when it was stored). An entry is
+served without asking the store while it is fresh: for its Cache-Control
+max-age, or EP_ASSET_TTL seconds (default 600) when the store sends none.
+After that the store is asked with If-None-Match/If-Modified-Since, and a
+304 only refreshes the entry. Every hit touches the body file. Once the
+cache grows past EP_ASSET_CACHE_MB (default 200) the least recently used
+entries are evicted. Responses marked no-store/private, or that set a
+cookie, are never kept.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+from .driver_resolver import CACHE_DIR
+
+ASSET_TTL = float(os.environ.get("EP_ASSET_TTL", "600"))
+MAX_BYTES = int(float(os.environ.get("EP_ASSET_CACHE_MB", "200")) * 1024 * 1024)
+
+_STATIC_EXT = (".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico",
+               ".woff", ".woff2", ".ttf", ".otf", ".eot")
+_STATIC_TYPES = ("text/css", "javascript", "image/", "font/", "application/font", "application/vnd.ms-fontobject")
+_MAX_AGE = re.compile(r"(?:s-)?max-age=(\d+)")
+
+
+class AssetCache:
+    """See the module docstring. fetch() stands in for the upstream request of a static asset."""
+
+    def __init__(self, path: str = None, max_bytes: int = MAX_BYTES, ttl: float = ASSET_TTL):
+        self.dir = path or os.path.join(CACHE_DIR, "assets")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(self.dir, exist_ok=True)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_fetched = 0
+        self.evicted = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    def handles(self, method: str, url: str) -> bool:
+        """Whether a request is for a static asset this cache may answer."""
+        return method == "GET" and urlsplit(url).path.lower().endswith(_STATIC_EXT)
+
+    def fetch(self, session, url: str, headers: dict, timeout: float):
+        """(status, reason, headers, content) for `url`, from disk when the entry is fresh or revalidated."""
+        key = hashlib.sha256(url.encode()).hexdigest()[:40]
+        meta = self._load(key)
+        if meta is not None and time.time() - meta["stored"] < meta["fresh_for"]:
+            content = self._body(key)
+            if content is not None:
+                self._record_hit(key, len(content))
+                return meta["status"], meta["reason"], _headers(meta), content
+        if meta is not None:
+            headers = dict(headers)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        resp = session.get(url, headers=headers, allow_redirects=False, timeout=timeout)
+        resp_headers = [(k, v) for k, v in resp.raw.headers.items()]
+        if resp.status_code == 304 and meta is not None:
+            content = self._body(key)
+            if content is not None:
+                meta.update(stored=time.time(), fresh_for=_fresh_for(dict(_lower(resp_headers)), self.ttl))
+                self._write_meta(key, meta)
+                with self._lock:
+                    self.revalidated += 1
+                    self.bytes_saved += len(content)
+                return meta["status"], meta["reason"], _headers(meta), content
+            # the body vanished under us (evicted by another process): fetch it in full
+            resp = session.get(url, headers={k: v for k, v in headers.items() if not k.startswith("If-")},
+                               allow_redirects=False, timeout=timeout)
+            resp_headers = [(k, v) for k, v in resp.raw.headers.items()]
+        with self._lock:
+            self.misses += 1
+            self.bytes_fetched += len(resp.content)
+        if _storable(resp.status_code, dict(_lower(resp_headers))):
+            self._store(key, url, resp.status_code, resp.reason, resp_headers, resp.content)
+        return resp.status_code, resp.reason, resp_headers, resp.content
+
+    def report(self):
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "requests_saved": self.hits,
+            "bytes_saved": self.bytes_saved,
+            "bytes_fetched": self.bytes_fetched,
+            "evicted": self.evicted,
+            "stored_bytes": self._size if self._size is not None else self._disk_size(),
+            "dir": self.dir,
+        }
+
+    # --- storage ---
+
+    def _load(self, key):
+        try:
+            with open(os.path.join(self.dir, key + ".json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _body(self, key):
+        try:
+            with open(os.path.join(self.dir, key + ".bin"), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _record_hit(self, key, size):
+        try:
+            os.utime(os.path.join(self.dir, key + ".bin"))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+
+    def _store(self, key, url, status, reason, headers, content):
+        lower = dict(_lower(headers))
+        meta = {"url": url, "status": status, "reason": reason, "headers": headers, "stored": time.time(),
+                "fresh_for": _fresh_for(lower, self.ttl), "etag": lower.get("etag"),
+                "last_modified": lower.get("last-modified")}
+        with self._lock:
+            # sized before the write, so the new body is not counted twice
+            if self._size is None:
+                self._size = self._disk_size()
+        # body first: a reader that finds the metadata always finds its body
+        _atomic_write(os.path.join(self.dir, key + ".bin"), content)
+        self._write_meta(key, meta)
+        with self._lock:
+            self._size += len(content)
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _write_meta(self, key, meta):
+        _atomic_write(os.path.join(self.dir, key + ".json"), json.dumps(meta).encode("utf-8"))
+
+    def _evict(self):
+        # other processes share the directory, so the sizes are re-read from disk
+        with self._lock:
+            bodies = []
+            for name in os.listdir(self.dir):
+                if name.endswith(".bin"):
+                    try:
+                        st = os.stat(os.path.join(self.dir, name))
+                    except OSError:
+                        continue
+                    bodies.append((st.st_mtime, st.st_size, name[:-4]))
+            size = sum(s for _, s, _ in bodies)
+            target = self.max_bytes * 0.9
+            for _, bytes_, key in sorted(bodies):
+                if size <= target:
+                    break
+                for ext in (".json", ".bin"):
+                    try:
+                        os.remove(os.path.join(self.dir, key + ext))
+                    except OSError:
+                        pass
+                size -= bytes_
+                self.evicted += 1
+            self._size = size
+
+    def _disk_size(self):
+        total = 0
+        for name in os.listdir(self.dir):
+            if name.endswith(".bin"):
+                try:
+                    total += os.path.getsize(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+        return total
+
+
+def _lower(headers):
+    return [(k.lower(), v) for k, v in headers]
+
+
+def _headers(meta):
+    return [tuple(h) for h in meta["headers"]]
+
+
+def _storable(status, headers):
+    control = headers.get("cache-control", "").lower()
+    if status != 200 or "no-store" in control or "private" in control or "set-cookie" in headers:
+        return False
+    if headers.get("vary", "").lower() not in ("", "accept-encoding"):
+        return False
+    return any(t in headers.get("content-type", "") for t in _STATIC_TYPES)
+
+
+def _fresh_for(headers, default):
+    control = headers.get("cache-control", "").lower()
+    if "no-cache" in control:
+        return 0
+    m = _MAX_AGE.search(control)
+    return int(m.group(1)) if m else default
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
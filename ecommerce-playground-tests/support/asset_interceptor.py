@@ -0,0 +1,125 @@
+# support/asset_interceptor.py
+"""
+Answers a browser's static asset requests from support.asset_cache over
+CDP's Fetch domain. Documents, XHR and form posts are never paused and go
+to the store exactly as they would without the cache.
+
+create_driver(assets=cache) starts one AssetInterceptor per Chrome. It opens
+its own DevTools connection to the browser and auto-attaches to every page,
+including browser contexts opened later for test isolation. On each page it
+enables Fetch for stylesheets, scripts, images and fonts only. A paused
+request the cache handles is fulfilled from it (fetched upstream on a miss,
+CDN hosts included); anything else, or any error, is let through to the
+network. The reader runs on a daemon thread and ends when the browser quits.
+"""
+import base64
+import itertools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import websocket
+from .static_driver import http_session
+
+RESOURCE_TYPES = ("Stylesheet", "Script", "Image", "Font")
+
+# the cache fetches with its own session and validators; Content-* go because bodies arrive decoded
+_SKIP_REQUEST = {"accept-encoding", "if-none-match", "if-modified-since", "range"}
+_SKIP_RESPONSE = {"connection", "keep-alive", "transfer-encoding", "content-length", "content-encoding"}
+
+
+class AssetInterceptor:
+    """See the module docstring. Use intercept_assets() rather than constructing one directly."""
+
+    def __init__(self, driver, cache, timeout: float = 30, workers: int = 4):
+        self.driver = driver
+        self.cache = cache
+        self.timeout = timeout
+        self.served = 0
+        self.passed = 0
+        self._session = http_session()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-intercept")
+        self._ids = itertools.count(1)
+        self._ws = None
+
+    def start(self):
+        address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        url = requests.get(f"http://{address}/json/version", timeout=5).json()["webSocketDebuggerUrl"]
+        # Chrome refuses DevTools clients that send an Origin header unless told to allow them
+        self._ws = websocket.create_connection(url, suppress_origin=True)
+        threading.Thread(target=self._run, name="asset-intercept", daemon=True).start()
+        self._send("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True})
+        return self
+
+    def close(self):
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+        self._pool.shutdown(wait=False)
+
+    def _send(self, method, params=None, session_id=None):
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self._ws.send(json.dumps(message))
+
+    def _run(self):
+        try:
+            while True:
+                message = json.loads(self._ws.recv())
+                method = message.get("method")
+                if method == "Target.attachedToTarget":
+                    self._attached(message["params"])
+                elif method == "Fetch.requestPaused":
+                    self._pool.submit(self._serve, message["sessionId"], message["params"])
+        except Exception:
+            # the browser quit (or the connection broke): pages simply fetch for themselves again
+            self.close()
+
+    def _attached(self, params):
+        session_id = params["sessionId"]
+        if params["targetInfo"]["type"] == "page":
+            patterns = [{"urlPattern": "http*", "resourceType": t, "requestStage": "Request"} for t in RESOURCE_TYPES]
+            self._send("Fetch.enable", {"patterns": patterns}, session_id)
+        if params.get("waitingForDebugger"):
+            self._send("Runtime.runIfWaitingForDebugger", {}, session_id)
+
+    def _serve(self, session_id, params):
+        request = params["request"]
+        try:
+            if self.cache.handles(request["method"], request["url"]):
+                headers = {k: v for k, v in request["headers"].items() if k.lower() not in _SKIP_REQUEST}
+                status, reason, resp_headers, content = self.cache.fetch(
+                    self._session, request["url"], headers, self.timeout
+                )
+                self._send("Fetch.fulfillRequest", {
+                    "requestId": params["requestId"],
+                    "responseCode": status,
+                    "responsePhrase": reason or "OK",
+                    "responseHeaders": [{"name": k, "value": v} for k, v in resp_headers
+                                        if k.lower() not in _SKIP_RESPONSE],
+                    "body": base64.b64encode(content).decode("ascii"),
+                }, session_id)
+                self.served += 1
+                return
+        except Exception:
+            pass
+        try:
+            self._send("Fetch.continueRequest", {"requestId": params["requestId"]}, session_id)
+            self.passed += 1
+        except Exception:
+            pass
+
+
+def intercept_assets(driver, cache):
+    """
+    Serve `driver`'s static assets from `cache`. Best effort: returns None when the
+    browser exposes no DevTools endpoint, and it then downloads assets itself.
+    """
+    try:
+        return AssetInterceptor(driver, cache).start()
+    except Exception:
+        return None
@@ -0,0 +1,131 @@
+# support/auth_state.py
+"""
+Snapshots of a logged-in browser, so a customer logs in through the form once
+and every later test restores the session in one step.
+
+A snapshot holds the cookies (the store's session cookie included) and
+localStorage captured right after a form login, plus how long that login took.
+It is kept per account in <EP_CACHE_DIR>/auth/<host>/<email>.json; accounts are
+leased to one test at a time, so a session is only ever reused by the tests
+that lease its account after each other. Nothing checks a snapshot up front:
+when a page shows the session has expired, the caller logs in through the form
+again and saves a new one (see support.helpers.Helpers).
+"""
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from .driver_resolver import CACHE_DIR
+
+# server-side session ids: a snapshot without one (written before they were kept) is not restored
+SESSION_COOKIES = ("OCSESSID", "PHPSESSID")
+
+CAPTURE_JS = r"""
+const items = {};
+for (let i = 0; i < localStorage.length; i++) {
+  const k = localStorage.key(i);
+  items[k] = localStorage.getItem(k);
+}
+return {origin: location.origin, localStorage: items};
+"""
+
+# registered for every new document, so any navigation (driver.get, page.visit) gets the storage;
+# the sessionStorage mark keeps a later page from overwriting what the test itself stored
+RESTORE_STORAGE_JS = r"""
+(function (origin, items) {
+  if (location.origin !== origin || sessionStorage.getItem('__epAuthStorage')) return;
+  for (const [k, v] of Object.entries(items)) localStorage.setItem(k, v);
+  sessionStorage.setItem('__epAuthStorage', '1');
+})(%s, %s);
+"""
+
+
+class AuthStateStore:
+    """Reads and writes snapshots and keeps the numbers for the "login state" report."""
+
+    def __init__(self, base_url: str, path: str = None):
+        # hostname, not netloc: the recording proxy's port changes between runs, cookies ignore ports
+        host = urlparse(base_url).hostname
+        self.dir = path or os.path.join(CACHE_DIR, "auth", host)
+        self.form_logins = 0
+        self.form_login_seconds = 0.0
+        self.restores = 0
+        self.restore_seconds = 0.0
+        self.expired = 0
+        self.saved_estimate = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, email: str):
+        """The snapshot for `email`, or None when there is none with a session cookie."""
+        try:
+            with open(self._path(email), encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not any(c["name"] in SESSION_COOKIES for c in state.get("cookies", [])):
+            return None
+        return state
+
+    def save(self, email: str, cookies, storage: dict, login_seconds: float):
+        self._write({"email": email, "login_s": round(login_seconds, 3), "origin": storage.get("origin"),
+                     "localStorage": storage.get("localStorage") or {}, "cookies": cookies})
+
+    def _write(self, state):
+        state = dict(state, saved=time.time())
+        os.makedirs(self.dir, exist_ok=True)
+        path = self._path(state["email"])
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp, path)
+
+    def record_form_login(self, seconds: float):
+        with self._lock:
+            self.form_logins += 1
+            self.form_login_seconds += seconds
+
+    def record_restore(self, seconds: float, form_login_seconds: float) -> float:
+        """Count a restore; returns the login time it is estimated to have saved."""
+        saved = max(0.0, form_login_seconds - seconds)
+        with self._lock:
+            self.restores += 1
+            self.restore_seconds += seconds
+            self.saved_estimate += saved
+        return saved
+
+    def record_expired(self, saved: float):
+        """A restored session turned out to have expired: the time record_restore() counted was not saved."""
+        with self._lock:
+            self.expired += 1
+            self.saved_estimate -= saved
+
+    def report(self):
+        return {
+            "form_logins": self.form_logins,
+            "form_login_s": round(self.form_login_seconds, 3),
+            "restores": self.restores,
+            "restore_s": round(self.restore_seconds, 3),
+            "expired": self.expired,
+            "saved_s": round(self.saved_estimate, 3),
+        }
+
+    def _path(self, email):
+        return os.path.join(self.dir, re.sub(r"[^\w@.+-]", "_", email) + ".json")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def auth_state_store(base_url: str, path: str = None) -> AuthStateStore:
+    """The process-wide store for `base_url`; `path` only applies to the call that creates it."""
+    with _stores_lock:
+        if base_url not in _stores:
+            _stores[base_url] = AuthStateStore(base_url, path)
+        return _stores[base_url]
+
+
+def all_stores():
+    return list(_stores.values())
@@ -0,0 +1,64 @@
+# support/driver_factory.py
+import os
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from .asset_interceptor import intercept_assets
+from .driver_resolver import chrome_service
+
+HEADLESS = os.environ.get("EP_HEADLESS", "1") not in ("0", "false", "False")
+
+# images are not needed to drive the store, so "fast" never downloads them. Stylesheets stay:
+# without them hover menus and display:none rules stop applying and visibility checks mean nothing.
+# (Chrome has no content setting for fonts, so they load too.)
+BLOCK_HEAVY_RESOURCES = {
+    "profile.managed_default_content_settings.images": 2,
+}
+
+PROFILES = {
+    # eager page loads + blocked images; the default for functional checks
+    "fast": {"headless": HEADLESS, "page_load_strategy": "eager", "block_resources": True},
+    # renders the page like a user sees it; use for screenshot evidence
+    "faithful": {"headless": HEADLESS, "page_load_strategy": "normal", "block_resources": False},
+    # visible browser, full rendering, no extension/popup suppression
+    "debug": {"headless": False, "page_load_strategy": "normal", "block_resources": False},
+}
+
+DEFAULT_PROFILE = "fast"
+
+# replay runs must not reach the network: only the local proxy resolves
+OFFLINE_RESOLVER_RULES = "MAP * ~NOTFOUND, EXCLUDE 127.0.0.1, EXCLUDE localhost"
+
+
+def chrome_options(profile: str = DEFAULT_PROFILE, offline: bool = False) -> ChromeOptions:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown driver profile: {profile!r} (expected one of {', '.join(PROFILES)})")
+    settings = PROFILES[profile]
+
+    opts = ChromeOptions()
+    if settings["headless"]:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--window-size=1920,1080")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    if profile != "debug":
+        opts.add_argument("--disable-extensions")
+        opts.add_argument("--disable-popup-blocking")
+        opts.add_argument("--log-level=3")
+    if offline:
+        opts.add_argument(f"--host-resolver-rules={OFFLINE_RESOLVER_RULES}")
+    if settings["block_resources"]:
+        opts.add_experimental_option("prefs", BLOCK_HEAVY_RESOURCES)
+    opts.page_load_strategy = settings["page_load_strategy"]
+    return opts
+
+
+def create_driver(profile: str = DEFAULT_PROFILE, offline: bool = False, assets=None):
+    """
+    Start a Chrome session configured for the named profile (`offline`: resolve no host but localhost).
+    With `assets` (a support.asset_cache.AssetCache) its static assets are served from that cache.
+    """
+    driver = webdriver.Chrome(service=chrome_service(), options=chrome_options(profile, offline))
+    if assets is not None:
+        driver._ep_assets = intercept_assets(driver, assets)
+    return driver
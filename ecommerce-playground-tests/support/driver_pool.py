@@ -0,0 +1,281 @@
+# support/driver_pool.py
+import threading
+import time
+from collections import deque
+from .browser_context import BrowserContext
+from .idle_tracker import install_idle_tracker
+from .wait_policy import WaitPolicy
+
+
+class Lease:
+    """A driver handed out by DriverPool plus the bookkeeping for the report."""
+
+    def __init__(self, driver, hit: bool, acquire_seconds: float):
+        self.driver = driver
+        self.hit = hit
+        self.acquire_seconds = acquire_seconds
+        self.reset_seconds = 0.0
+        self.recycled = False
+        self.prewarmed = False
+        self.context = None
+        self.test = None
+        self.wait_policy = None
+        self.implicit_lost_seconds = 0.0
+        self.implicit_misses = 0
+
+    def summary(self):
+        return {
+            "test": self.test,
+            "hit": self.hit,
+            "acquire_s": round(self.acquire_seconds, 3),
+            "reset_s": round(self.reset_seconds, 3),
+            "recycled": self.recycled,
+            "prewarmed": self.prewarmed,
+            "isolated": self.context is not None,
+            "implicit_lost_s": round(self.implicit_lost_seconds, 3),
+            "implicit_misses": self.implicit_misses,
+        }
+
+
+class DriverPool:
+    """
+    Keeps live WebDriver sessions around so tests lease an existing browser
+    instead of paying a Chrome start-up per test.
+
+    Between leases the browser is reset (extra windows closed, storage and
+    cookies cleared, navigated to about:blank). A session is recycled after
+    `max_uses` leases, when its test failed, or when the health check or the
+    reset itself fails.
+
+    With `spares` > 0 the pool launches browsers on background threads
+    (`prewarm`) so a ready session is waiting when a test asks for one; the
+    launch time that never reached a test is reported as hidden latency.
+
+    With `isolation="context"` every lease runs in its own CDP browser context
+    (see BrowserContext) and release just disposes it; drivers that cannot
+    create contexts fall back to the full reset.
+
+    Leased windows get the AJAX idle tracker (support.idle_tracker) registered
+    for every document they load.
+
+    Each leased driver carries a WaitPolicy set to `implicit_wait`; the time
+    the test then loses to implicit waits on lookups that miss is recorded on
+    the lease.
+    """
+
+    BLANK_URL = "about:blank"
+    CLEAR_STORAGE_SCRIPT = (
+        "try { window.localStorage.clear(); } catch (e) {}"
+        "try { window.sessionStorage.clear(); } catch (e) {}"
+    )
+
+    def __init__(self, factory, max_idle: int = 1, max_uses: int = 20, implicit_wait: float = 5,
+                 spares: int = 0, name: str = "default", isolation: str = "reset"):
+        if isolation not in ("reset", "context"):
+            raise ValueError(f"Unknown isolation mode: {isolation!r}")
+        self.factory = factory
+        self.name = name
+        self.isolation = isolation
+        self.max_idle = max(0, max_idle)
+        self.max_uses = max(1, max_uses)
+        self.implicit_wait = implicit_wait
+        self.spares = max(0, spares)
+        self.leases = []
+        self.launches = 0
+        self.hidden_seconds = 0.0
+        self._idle = deque()
+        self._uses = {}
+        self._launch_cost = {}
+        self._launching = 0
+        self._threads = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    def prewarm(self):
+        """Start background launches until `spares` sessions are idle or on their way."""
+        with self._lock:
+            missing = self.spares - len(self._idle) - self._launching
+            if self._closed or missing <= 0:
+                return
+            self._launching += missing
+        for _ in range(missing):
+            t = threading.Thread(target=self._launch_spare, name="driver-prewarm", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def acquire(self) -> Lease:
+        start = time.perf_counter()
+        while True:
+            with self._cond:
+                # a spare that is already starting beats a cold launch of our own
+                while not self._idle and self._launching:
+                    self._cond.wait()
+                drv = self._idle.popleft() if self._idle else None
+            if drv is None:
+                drv = self._launch()
+                hit = False
+                break
+            if self._is_healthy(drv):
+                hit = True
+                break
+            self._discard(drv)
+        policy = WaitPolicy.install(drv, self.implicit_wait)
+        context = self._open_context(drv) if self.isolation == "context" else None
+        if context is not None or not getattr(drv, "_ep_idle_tracked", False):
+            # a context is a new target, so its window needs the tracker registered again
+            drv._ep_idle_tracked = install_idle_tracker(drv) and context is None
+        lease = Lease(drv, hit, time.perf_counter() - start)
+        lease.context = context
+        lease.wait_policy = policy
+        policy.reset_stats()
+        with self._lock:
+            cost = self._launch_cost.pop(id(drv), None)
+            if cost is not None:
+                lease.prewarmed = True
+                self.hidden_seconds += max(0.0, cost - lease.acquire_seconds)
+        self.prewarm()
+        return lease
+
+    def release(self, lease: Lease, failed: bool = False, test: str = None):
+        lease.test = test
+        drv = lease.driver
+        if lease.wait_policy is not None:
+            lease.implicit_lost_seconds = lease.wait_policy.lost_seconds
+            lease.implicit_misses = lease.wait_policy.misses
+        with self._lock:
+            self.leases.append(lease)
+            self._uses[id(drv)] = self._uses.get(id(drv), 0) + 1
+            worn_out = self._uses[id(drv)] >= self.max_uses
+        if failed or worn_out:
+            lease.recycled = True
+            self._discard(drv)
+            return
+
+        start = time.perf_counter()
+        try:
+            if not self._close_context(lease.context):
+                self._reset(drv)
+        except Exception:
+            lease.recycled = True
+            self._discard(drv)
+            return
+        finally:
+            lease.reset_seconds = time.perf_counter() - start
+
+        with self._lock:
+            if len(self._idle) < self.max_idle + self.spares:
+                self._idle.append(drv)
+                self._cond.notify_all()
+                return
+        self._discard(drv)
+
+    def close(self, timeout: float = 30):
+        with self._lock:
+            self._closed = True
+        for t in self._threads:
+            t.join(timeout)
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for drv in idle:
+            self._discard(drv)
+
+    def report(self):
+        """Plain-data view of the pool usage (safe to ship between xdist workers)."""
+        return {
+            "name": self.name,
+            "leases": [l.summary() for l in self.leases],
+            "launches": self.launches,
+            "hidden_s": round(self.hidden_seconds, 3),
+        }
+
+    def _launch(self):
+        drv = self.factory()
+        with self._lock:
+            self.launches += 1
+            self._uses[id(drv)] = 0
+        return drv
+
+    def _launch_spare(self):
+        start = time.perf_counter()
+        try:
+            drv = self.factory()
+        except Exception:
+            drv = None
+        cost = time.perf_counter() - start
+        with self._cond:
+            self._launching -= 1
+            if drv is not None and not self._closed:
+                self.launches += 1
+                self._uses[id(drv)] = 0
+                self._launch_cost[id(drv)] = cost
+                self._idle.append(drv)
+                drv = None
+            self._cond.notify_all()
+        if drv is not None:
+            # pool closed while this browser was starting
+            self._discard(drv)
+
+    def _open_context(self, drv):
+        try:
+            return BrowserContext(drv).open()
+        except Exception:
+            return None
+
+    def _close_context(self, context) -> bool:
+        if context is None:
+            return False
+        try:
+            context.close()
+        except Exception:
+            return False
+        return True
+
+    def _is_healthy(self, drv) -> bool:
+        try:
+            return drv.session_id is not None and drv.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, drv):
+        handles = drv.window_handles
+        for handle in handles[1:]:
+            drv.switch_to.window(handle)
+            drv.close()
+        drv.switch_to.window(handles[0])
+        drv.execute_script(self.CLEAR_STORAGE_SCRIPT)
+        try:
+            # clears every domain, delete_all_cookies only covers the current one
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            drv.delete_all_cookies()
+        drv.get(self.BLANK_URL)
+
+    def _discard(self, drv):
+        with self._lock:
+            self._uses.pop(id(drv), None)
+            self._launch_cost.pop(id(drv), None)
+        try:
+            drv.quit()
+        except Exception:
+            pass
+
+
+def summarize(reports):
+    """Combine DriverPool.report() dicts (one per worker) into run totals."""
+    leases = [l for r in reports for l in r["leases"]]
+    hits = sum(1 for l in leases if l["hit"])
+    return {
+        "leases": len(leases),
+        "hits": hits,
+        "misses": len(leases) - hits,
+        "launches": sum(r["launches"] for r in reports),
+        "recycled": sum(1 for l in leases if l["recycled"]),
+        "reset_s": sum(l["reset_s"] for l in leases),
+        "prewarmed": sum(1 for l in leases if l.get("prewarmed")),
+        "isolated": sum(1 for l in leases if l.get("isolated")),
+        "hidden_s": sum(r.get("hidden_s", 0.0) for r in reports),
+        "implicit_lost_s": sum(l.get("implicit_lost_s", 0.0) for l in leases),
+        "implicit_misses": sum(l.get("implicit_misses", 0) for l in leases),
+    }
@@ -0,0 +1,126 @@
+# support/driver_resolver.py
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+CACHE_DIR = os.environ.get("EP_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "ecommerce-playground-tests"
+)
+OFFLINE = os.environ.get("EP_OFFLINE", "0") not in ("0", "false", "False")
+
+_CACHE_FILE = "chromedriver.json"
+_CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+_WINDOWS_VERSION_KEYS = (
+    r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon",
+    r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon",
+)
+
+
+def chrome_version() -> str:
+    """
+    Return the installed Chrome version without touching the network,
+    or "" when it cannot be determined locally.
+    """
+    if sys.platform.startswith("win"):
+        commands = [["reg", "query", key, "/v", "version"] for key in _WINDOWS_VERSION_KEYS]
+    elif sys.platform == "darwin":
+        commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        commands = [[name, "--version"] for name in _CHROME_BINARIES if shutil.which(name)]
+
+    for cmd in commands:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        m = re.search(r"(\d+\.\d+\.\d+\.\d+)", out)
+        if m:
+            return m.group(1)
+    return ""
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_chromedriver() -> str:
+    """
+    Return a chromedriver path, resolving it at most once per run.
+
+    A previous resolution is reused across runs when the cached binary still
+    has the same content and Chrome has not been upgraded since; in that case
+    nothing touches the network. With EP_OFFLINE=1 a cache miss falls back to
+    a chromedriver on PATH instead of downloading.
+    """
+    version = chrome_version()
+    cached = _load_cache()
+    if cached and _cache_is_valid(cached, version):
+        return cached["path"]
+
+    if OFFLINE:
+        path = shutil.which("chromedriver")
+        if not path:
+            raise RuntimeError(
+                "EP_OFFLINE=1 but no cached chromedriver matches the installed Chrome "
+                f"({version or 'unknown version'}) and none is on PATH"
+            )
+    else:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+
+    _save_cache(path, version)
+    return path
+
+
+def chrome_service():
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    return ChromeService(resolve_chromedriver())
+
+
+def _cache_is_valid(cached: dict, version: str) -> bool:
+    path = cached.get("path")
+    if not path or not os.path.isfile(path):
+        return False
+    if version and cached.get("chrome_version") != version:
+        return False
+    st = os.stat(path)
+    if st.st_size == cached.get("size") and st.st_mtime_ns == cached.get("mtime_ns"):
+        return True
+    # binary was touched since it was cached: only trust it if the content is unchanged
+    return _sha256(path) == cached.get("sha256")
+
+
+def _load_cache():
+    try:
+        with open(os.path.join(CACHE_DIR, _CACHE_FILE), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(path: str, version: str):
+    st = os.stat(path)
+    entry = {
+        "path": path,
+        "chrome_version": version,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": _sha256(path),
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    target = os.path.join(CACHE_DIR, _CACHE_FILE)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(entry, fh, indent=2)
+    # atomic so concurrent runs never read a half-written file
+    os.replace(tmp, target)
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
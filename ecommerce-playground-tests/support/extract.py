@@ -0,0 +1,102 @@
+# support/extract.py
+"""
+Structured reads of the page in a single script call.
+
+A spec maps result keys to Query objects; extract() evaluates all of them in
+the browser and returns plain Python data, instead of one WebDriver call per
+element and attribute (elem.text, elem.get_attribute(...)).
+
+    data = extract(driver, {
+        "names": Query((By.CSS_SELECTOR, ".product-thumb h4 a"), ("text", "href")),
+        "title": Query((By.TAG_NAME, "h1"), "text", first=True),
+    })
+    data["names"]  -> [{"text": ..., "href": ...}, ...]
+    data["title"]  -> "..." or None
+
+Fields: "text" (trimmed rendered text, "" when hidden), "href" (absolute), "value", "html",
+"tag", "visible", and "@name" for any attribute.
+"""
+from .locators import FIND_JS, LocatorChain, as_locator
+
+FIELDS = ("text", "href", "value", "html", "tag", "visible")
+
+
+class Query:
+    """
+    What to read for one key of an extraction spec.
+
+    `locator` is a (By, value) pair or a LocatorChain (the first candidate that
+    matches anything is used). `fields` is one field name, giving a list of
+    values, or a sequence of names, giving a list of dicts. `first` returns
+    only the first match (or None), `within` scopes the lookup to the first
+    element that locator matches, `visible_only` drops hidden matches and
+    `limit` caps the number of rows.
+    """
+
+    def __init__(self, locator, fields="text", first: bool = False, within=None,
+                 visible_only: bool = False, limit: int = None):
+        names = [fields] if isinstance(fields, str) else list(fields)
+        for name in names:
+            if name not in FIELDS and not name.startswith("@"):
+                raise ValueError(f"Unknown extraction field: {name!r}")
+        chain = locator if isinstance(locator, LocatorChain) else LocatorChain(locator)
+        self.locators = [as_locator(loc) for loc in chain]
+        self.fields = fields if isinstance(fields, str) else names
+        self.first = first
+        self.within = as_locator(within) if within else None
+        self.visible_only = visible_only
+        self.limit = limit
+
+    def spec(self):
+        return {
+            "locators": self.locators,
+            "fields": self.fields,
+            "first": self.first,
+            "within": self.within,
+            "visibleOnly": self.visible_only,
+            "limit": self.limit,
+        }
+
+
+EXTRACT_JS = FIND_JS + r"""
+function epValue(el, f) {
+  switch (f) {
+    // like WebElement.text: hidden elements read as empty
+    case 'text': return epVisible(el) ? (el.innerText || '').trim() : '';
+    case 'href': return el.href || el.getAttribute('href') || '';
+    case 'value': return el.value === undefined ? null : el.value;
+    case 'html': return el.innerHTML;
+    case 'tag': return el.tagName.toLowerCase();
+    case 'visible': return epVisible(el);
+  }
+  return el.getAttribute(f.slice(1));
+}
+const spec = arguments[0], top = arguments[1] || document, out = {};
+for (const key of Object.keys(spec)) {
+  const q = spec[key];
+  let root = top, els = [];
+  if (q.within) root = epFind(q.within, top)[0] || null;
+  if (root) {
+    for (const loc of q.locators) {
+      els = epFind(loc, root);
+      if (q.visibleOnly) els = els.filter(epVisible);
+      if (els.length) break;
+    }
+  }
+  if (q.limit) els = els.slice(0, q.limit);
+  const rows = els.map(el => typeof q.fields === 'string'
+    ? epValue(el, q.fields)
+    : Object.fromEntries(q.fields.map(f => [f, epValue(el, f)])));
+  out[key] = q.first ? (rows.length ? rows[0] : null) : rows;
+}
+return out;
+"""
+
+
+def extract(driver, spec, root=None):
+    """Evaluate {key: Query} in one script call; returns {key: rows} (see module docstring)."""
+    specs = {key: q.spec() for key, q in spec.items()}
+    evaluate = getattr(driver, "evaluate_extract", None)
+    if evaluate:
+        return evaluate(specs, root)
+    return driver.execute_script(EXTRACT_JS, specs, root)
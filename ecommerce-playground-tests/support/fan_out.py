@@ -0,0 +1,99 @@
+# support/fan_out.py
+"""
+Running the same read-only check over many URLs concurrently.
+
+    failures = fan_out(urls, check)        # check(driver, url) -> None or a reason
+    for f in failures: print(f"{f.index}. {f.url} -- {f.reason}")
+
+    titles = map_pages(urls, lambda d, u: (d.get(u), d.title)[1])
+
+Each worker thread owns one driver for the whole run: a StaticDriver by
+default (all of them share one HTTP connection pool), or a browser leased
+from `driver_pool` when the check needs JavaScript. Results come back in
+URL order whatever order the pages finished in, so reports read the same as
+the sequential loops they replace.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from .static_driver import StaticDriver
+
+WORKERS = int(os.environ.get("EP_FAN_OUT", "8"))
+
+
+class PageFailure(NamedTuple):
+    index: int  # 1-based position of the URL in the input
+    url: str
+    reason: str
+
+
+class _WorkerDrivers:
+    """One driver per worker thread, created on first use and released by close()."""
+
+    def __init__(self, driver_pool=None):
+        self.driver_pool = driver_pool
+        self._local = threading.local()
+        self._owned = []  # (driver, lease)
+        self._lock = threading.Lock()
+
+    def get(self):
+        if not hasattr(self._local, "driver"):
+            lease = self.driver_pool.acquire() if self.driver_pool is not None else None
+            self._local.driver = lease.driver if lease else StaticDriver()
+            with self._lock:
+                self._owned.append((self._local.driver, lease))
+        return self._local.driver
+
+    def close(self):
+        for drv, lease in self._owned:
+            if lease is not None:
+                self.driver_pool.release(lease, failed=False, test="fan_out")
+            else:
+                drv.quit()
+        self._owned.clear()
+
+
+def _run(urls, fn, workers, driver_pool):
+    urls = list(urls)
+    workers = max(1, min(workers or WORKERS, len(urls) or 1))
+    drivers = _WorkerDrivers(driver_pool)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fan-out") as pool:
+            return list(pool.map(lambda index, url: fn(drivers.get, index, url), range(1, len(urls) + 1), urls))
+    finally:
+        drivers.close()
+
+
+def map_pages(urls, read, workers: int = None, driver_pool=None):
+    """
+    Run `read(driver, url)` for every URL on at most `workers` threads and
+    return the results in URL order. The first exception raised is re-raised.
+    """
+    return _run(urls, lambda driver, index, url: read(driver(), url), workers, driver_pool)
+
+
+def fan_out(urls, check, workers: int = None, driver_pool=None, fail_fast: bool = False):
+    """
+    Run `check(driver, url)` for every URL on at most `workers` threads and
+    return the PageFailures, sorted by index. A check fails by returning a
+    reason string (anything falsy passes) or by raising. With `fail_fast`
+    URLs not yet started are skipped after the first failure.
+    """
+    stop = threading.Event()
+
+    def run(driver, index, url):
+        if stop.is_set():
+            return None
+        try:
+            reason = check(driver(), url)
+        except Exception as e:
+            # WebDriverException.msg skips the "Message:" prefix and stacktrace of str(e)
+            reason = f"{type(e).__name__}: {(getattr(e, 'msg', None) or str(e)).strip() or 'no message'}"
+        if not reason:
+            return None
+        if fail_fast:
+            stop.set()
+        return PageFailure(index, url, reason)
+
+    return [r for r in _run(urls, run, workers, driver_pool) if r is not None]
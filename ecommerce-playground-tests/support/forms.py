@@ -0,0 +1,130 @@
+# support/forms.py
+"""
+Filling whole forms in as few WebDriver round trips as possible.
+
+fill_form() first waits for every field at once (one call), then writes the
+values at the requested fidelity:
+
+- SET_VALUE (default): one script sets every value through the native
+  setter and fires input/change events, so the whole form costs two calls.
+- INSERT_TEXT: text goes in through CDP Input.insertText, which the page
+  sees as real text input (beforeinput/input) but without a key event per
+  character; one focus script plus one CDP call per text field.
+- TYPE_KEYS: clear() + send_keys() per field, exactly as a user types;
+  use it where the page reacts to individual key events.
+
+Selects, checkboxes and radios are always set by script, at every fidelity.
+"""
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from .locators import LocatorChain
+from .waits import BrowserWait, all_of, first_of, present
+
+SET_VALUE = "set"
+INSERT_TEXT = "insert"
+TYPE_KEYS = "type"
+FIDELITIES = (SET_VALUE, INSERT_TEXT, TYPE_KEYS)
+
+SET_VALUES_JS = r"""
+const pairs = arguments[0];
+function setValue(el, value) {
+  const tag = el.tagName.toLowerCase(), type = (el.type || '').toLowerCase();
+  if (type === 'checkbox' || type === 'radio') {
+    el.checked = !!value;
+  } else if (tag === 'select') {
+    const want = String(value).trim().toLowerCase();
+    const opt = Array.from(el.options).find(o => o.value === String(value))
+             || Array.from(el.options).find(o => o.text.trim().toLowerCase() === want);
+    if (!opt) return 'no option ' + JSON.stringify(value);
+    el.value = opt.value;
+  } else {
+    // the prototype setter keeps frameworks that track the value property in sync
+    const proto = tag === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    const desc = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (desc && desc.set && (el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement)) desc.set.call(el, String(value));
+    else el.value = String(value);
+  }
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+  return null;
+}
+const errors = [];
+for (const [el, value] of pairs) {
+  const err = setValue(el, value);
+  if (err) errors.push((el.name || el.id || el.tagName) + ': ' + err);
+}
+return errors;
+"""
+
+PREPARE_INSERT_JS = r"""
+const el = arguments[0];
+el.focus();
+if ('value' in el) {
+  el.value = '';
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+}
+"""
+
+SCRIPTED_FIELDS_JS = r"""
+return arguments[0].map(el => el.tagName.toLowerCase() === 'select'
+                              || ['checkbox', 'radio'].includes((el.type || '').toLowerCase()));
+"""
+
+
+def fill_form(driver, fields, fidelity: str = SET_VALUE, timeout: float = 10, root=None):
+    """
+    Fill `fields` ({(By, value) or LocatorChain: value}) in the page. Values of
+    None are skipped. Raises NoSuchElementException naming the fields that never
+    appeared, and ValueError for select values that match no option.
+    """
+    if fidelity not in FIDELITIES:
+        raise ValueError(f"Unknown fill fidelity: {fidelity!r} (expected one of {', '.join(FIDELITIES)})")
+    fields = [(loc, value) for loc, value in fields.items() if value is not None]
+    if not fields:
+        return
+
+    elements = _locate(driver, [loc for loc, _ in fields], timeout, root)
+    pairs = list(zip(elements, (value for _, value in fields)))
+    if fidelity == SET_VALUE:
+        _set_values(driver, pairs)
+        return
+
+    scripted = driver.execute_script(SCRIPTED_FIELDS_JS, elements)
+    if any(scripted):
+        _set_values(driver, [pair for pair, s in zip(pairs, scripted) if s])
+    for (el, value), is_scripted in zip(pairs, scripted):
+        if is_scripted:
+            continue
+        if fidelity == INSERT_TEXT:
+            driver.execute_script(PREPARE_INSERT_JS, el)
+            driver.execute_cdp_cmd("Input.insertText", {"text": str(value)})
+        else:
+            el.clear()
+            el.send_keys(str(value))
+
+
+def _condition(loc, root):
+    return first_of(loc, root) if isinstance(loc, LocatorChain) else present(loc, root)
+
+
+def _locate(driver, locators, timeout, root):
+    try:
+        found = BrowserWait(driver, timeout).until(all_of(*(_condition(loc, root) for loc in locators)))
+    except TimeoutException:
+        missing = [repr(loc) for loc in locators if not _exists(driver, loc, root)]
+        raise NoSuchElementException(f"Form fields not found: {', '.join(missing)}")
+    return [hit["value"][0] if isinstance(loc, LocatorChain) else hit[0]
+            for loc, hit in zip(locators, found)]
+
+
+def _exists(driver, loc, root):
+    try:
+        BrowserWait(driver, 0).until(_condition(loc, root))
+        return True
+    except TimeoutException:
+        return False
+
+
+def _set_values(driver, pairs):
+    errors = driver.execute_script(SET_VALUES_JS, [[el, value] for el, value in pairs])
+    if errors:
+        raise ValueError("Could not fill form: " + "; ".join(errors))
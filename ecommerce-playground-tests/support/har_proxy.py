@@ -0,0 +1,363 @@
+# support/har_proxy.py
+"""
+A local reverse proxy in front of the store that records its traffic per
+test, or serves a recording back without touching the network.
+
+EP_NETWORK selects the mode:
+
+- live (default): no proxy; tests talk to the store directly.
+- record: requests to http://127.0.0.1:<port>/ are forwarded to the store
+  and every exchange is kept in a HAR-style archive per test,
+  <EP_HAR_DIR>/<test id>.har.gz (traffic outside any test, e.g. the account
+  pool filling up, goes to _session.har.gz). Under xdist each worker writes
+  _session.<worker>.har.gz and the controller merges them into
+  _session.har.gz at the end of the run (merge_session_archives).
+- replay: the same requests are answered from those archives. A request
+  that was not recorded gets a 504 and is counted as a miss. Responses
+  arrive after the recorded time (EP_REPLAY_LATENCY=realistic) or at once
+  (zero, the default).
+
+The `base_url` fixture points at the proxy, and the store's absolute URLs in
+bodies and Location headers are rewritten to it. Cookies lose Domain and
+Secure, since the proxy is plain http on 127.0.0.1. Requests are matched
+on method and URL, without jQuery's "_" cache-buster, and for anything but
+GET/HEAD on a digest of the body too, so different form submissions to one
+route get their own responses. A body that was never recorded (a random
+e-mail address, say) falls back to the recorded requests to that route.
+Repeated requests for the same key are answered with the recorded
+responses in order, and the last one is reused once they run out.
+
+Only traffic addressed to `base_url` goes through the proxy: the store is
+HTTPS, and pointing the browser's own proxy setting at this one would need
+a man-in-the-middle certificate. Tests and helpers must build their URLs
+from `base_url`. Other hosts (CDNs, or a hard-coded store URL) are not
+proxied; in replay the driver factory stops the browser resolving them, so
+such a request fails instead of reaching the network.
+"""
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from .static_driver import http_session
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (LIVE, RECORD, REPLAY)
+
+HAR_DIR = os.environ.get("EP_HAR_DIR") or os.path.join(os.getcwd(), "har")
+SESSION_ARCHIVE = "_session"
+
+# never forwarded either way; Content-Encoding/Length go because bodies are decoded and rewritten
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+               "transfer-encoding", "upgrade", "host", "content-length", "content-encoding", "accept-encoding"}
+_TEXT_TYPES = ("text/", "javascript", "json", "xml", "css")
+
+
+class HarProxy:
+    """See the module docstring. start() it, then bracket each test with start_test()/finish_test()."""
+
+    def __init__(self, upstream: str, mode: str = RECORD, archive_dir: str = HAR_DIR,
+                 latency: str = "zero", port: int = 0, timeout: float = 30):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"HarProxy mode must be {RECORD!r} or {REPLAY!r}, got {mode!r}")
+        parts = urlsplit(upstream)
+        self.upstream = f"{parts.scheme}://{parts.netloc}"
+        self.upstream_host = parts.netloc
+        self.mode = mode
+        self.archive_dir = archive_dir
+        self.realistic = latency == "realistic"
+        self.port = port
+        self.timeout = timeout
+        self.base_url = None
+        self.requests = 0
+        self.misses = []
+        self.archives_written = 0
+        self.upstream_seconds = 0.0
+        self.simulated_seconds = 0.0
+        self._server = None
+        self._lock = threading.Lock()
+        self._test = None
+        self._entries = {}     # archive name -> recorded entries
+        self._recorded = {}    # archive name -> {key: [entries]}
+        self._served = {}      # (archive name, key) -> times served
+        self._session = http_session()
+        # the browser's Cookie header is forwarded as is; the proxy keeps no cookies of its own
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    @property
+    def origin(self):
+        return self.base_url.rstrip("/")
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.proxy = self
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}/"
+        threading.Thread(target=self._server.serve_forever, name="har-proxy", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.mode == RECORD:
+            worker = os.environ.get("PYTEST_XDIST_WORKER")
+            self._write(SESSION_ARCHIVE, f"{SESSION_ARCHIVE}.{worker}" if worker else SESSION_ARCHIVE)
+
+    def start_test(self, nodeid: str):
+        with self._lock:
+            self._test = _archive_name(nodeid)
+            if self.mode == RECORD:
+                self._entries[self._test] = []
+
+    def finish_test(self):
+        with self._lock:
+            name, self._test = self._test, None
+        if name and self.mode == RECORD:
+            self._write(name)
+
+    def report(self):
+        return {
+            "mode": self.mode,
+            "requests": self.requests,
+            "misses": len(self.misses),
+            "missed": self.misses[:5],
+            "archives": self.archives_written,
+            "upstream_s": round(self.upstream_seconds, 3),
+            "simulated_s": round(self.simulated_seconds, 3),
+        }
+
+    # --- request handling ---
+
+    def handle(self, req):
+        length = int(req.headers.get("Content-Length") or 0)
+        body = req.rfile.read(length) if length else b""
+        with self._lock:
+            self.requests += 1
+            archive = self._test or SESSION_ARCHIVE
+        if self.mode == RECORD:
+            entry = self._forward(req, body)
+            with self._lock:
+                self._entries.setdefault(archive, []).append(entry)
+        else:
+            entry = self._lookup(archive, req.command, req.path, body)
+            if entry is None:
+                with self._lock:
+                    self.misses.append(f"{req.command} {req.path}")
+                return self._send(req, 504, [("Content-Type", "text/plain")],
+                                  f"Not in the recorded archive: {req.command} {req.path}".encode())
+            if self.realistic:
+                delay = entry["time"] / 1000
+                time.sleep(delay)
+                with self._lock:
+                    self.simulated_seconds += delay
+        response = entry["response"]
+        headers = [(h["name"], h["value"]) for h in response["headers"]]
+        self._send(req, response["status"], headers, base64.b64decode(response["content"].get("text", "")))
+
+    def _forward(self, req, body):
+        url = self.upstream + req.path
+        headers = {k: self._to_upstream(v) for k, v in req.headers.items() if k.lower() not in _HOP_BY_HOP}
+        started = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            resp = self._session.request(req.command, url, headers=headers, data=body or None,
+                                         allow_redirects=False, timeout=self.timeout)
+            status, reason = resp.status_code, resp.reason
+            resp_headers = [(k, v) for k, v in resp.raw.headers.items() if k.lower() not in _HOP_BY_HOP]
+            content = resp.content
+        except requests.RequestException as e:
+            status, reason, resp_headers, content = 502, "Bad Gateway", [("Content-Type", "text/plain")], str(e).encode()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.upstream_seconds += elapsed
+        return _har_entry(req.command, url, list(req.headers.items()), body, started, elapsed,
+                          status, reason, resp_headers, content)
+
+    def _lookup(self, archive, method, path, body=b""):
+        keys = [_match_key(method, path, body)]
+        if keys[0] != _match_key(method, path):
+            keys.append(_match_key(method, path))
+        for key in keys:
+            for name in (archive, SESSION_ARCHIVE):
+                recorded = self._load(name).get(key)
+                if recorded:
+                    with self._lock:
+                        n = self._served.get((name, key), 0)
+                        self._served[(name, key)] = n + 1
+                    return recorded[min(n, len(recorded) - 1)]
+        return None
+
+    def _send(self, req, status, headers, content):
+        content_type = next((v for k, v in headers if k.lower() == "content-type"), "")
+        if any(t in content_type for t in _TEXT_TYPES):
+            content = self._rewrite_body(content)
+        req.send_response(status)
+        for name, value in headers:
+            lname = name.lower()
+            if lname in _HOP_BY_HOP:
+                continue
+            if lname == "location":
+                value = self._to_proxy(value)
+            elif lname == "set-cookie":
+                value = _local_cookie(value)
+            req.send_header(name, value)
+        req.send_header("Content-Length", str(len(content)))
+        req.end_headers()
+        if req.command != "HEAD":
+            req.wfile.write(content)
+
+    # --- URL rewriting ---
+
+    def _to_proxy(self, text):
+        for scheme in ("https://", "http://"):
+            text = text.replace(scheme + self.upstream_host, self.origin)
+        return text
+
+    def _to_upstream(self, text):
+        return text.replace(self.origin, self.upstream)
+
+    def _rewrite_body(self, content):
+        host = self.upstream_host.encode()
+        local = self.origin.encode()
+        for scheme in (b"https://", b"http://"):
+            content = content.replace(scheme + host, local)
+            # JSON-escaped slashes, as in OpenCart's AJAX responses
+            content = content.replace(scheme.replace(b"/", b"\\/") + host, local.replace(b"/", b"\\/"))
+        return content
+
+    # --- archives ---
+
+    def _load(self, name):
+        with self._lock:
+            if name in self._recorded:
+                return self._recorded[name]
+        recorded = {}
+        for entry in _read_entries(os.path.join(self.archive_dir, name + ".har.gz")):
+            request = entry["request"]
+            parts = urlsplit(request["url"])
+            path = urlunsplit(("", "", parts.path, parts.query, ""))
+            body = request.get("postData", {}).get("text", "").encode("utf-8")
+            # indexed with and without the body digest; see the module docstring
+            keys = {_match_key(request["method"], path, body), _match_key(request["method"], path)}
+            for key in keys:
+                recorded.setdefault(key, []).append(entry)
+        with self._lock:
+            return self._recorded.setdefault(name, recorded)
+
+    def _write(self, name, filename=None):
+        with self._lock:
+            entries = self._entries.pop(name, [])
+        if not entries:
+            return
+        _write_archive(os.path.join(self.archive_dir, (filename or name) + ".har.gz"), entries)
+        with self._lock:
+            self.archives_written += 1
+
+
+def merge_session_archives(archive_dir: str = HAR_DIR) -> int:
+    """
+    Merge the _session.<worker>.har.gz parts of an xdist recording into _session.har.gz (replacing
+    the previous one) and remove them; returns the number of parts merged.
+    """
+    parts = sorted(glob.glob(os.path.join(archive_dir, SESSION_ARCHIVE + ".*.har.gz")))
+    if not parts:
+        return 0
+    entries = [entry for part in parts for entry in _read_entries(part)]
+    entries.sort(key=lambda e: e["startedDateTime"])
+    _write_archive(os.path.join(archive_dir, SESSION_ARCHIVE + ".har.gz"), entries)
+    for part in parts:
+        os.remove(part)
+    return len(parts)
+
+
+def _read_entries(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return json.load(fh)["log"]["entries"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _write_archive(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    har = {"log": {"version": "1.2", "creator": {"name": "ecommerce-playground-tests", "version": "1"},
+                   "entries": entries}}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        json.dump(har, fh)
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _proxy(self):
+        self.server.proxy.handle(self)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _proxy
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _archive_name(nodeid):
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def _match_key(method, path, body=None):
+    """Archive key of a request; with `body` (ignored for GET/HEAD) a digest of it is part of the key."""
+    parts = urlsplit(path)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "_"])
+    key = f"{method} {parts.path}?{query}"
+    if body is not None and method not in ("GET", "HEAD"):
+        # bodies are archived as text, so the digest is taken of the same decoding
+        text = body.decode("utf-8", "replace").encode("utf-8")
+        key += " #" + hashlib.sha256(text).hexdigest()[:16]
+    return key
+
+
+def _local_cookie(value):
+    attrs = [a.strip() for a in value.split(";")]
+    attrs = [a for a in attrs if a.split("=")[0].strip().lower() not in ("domain", "secure")]
+    # SameSite=None is only accepted on Secure cookies
+    return "; ".join("SameSite=Lax" if a.lower().replace(" ", "") == "samesite=none" else a for a in attrs)
+
+
+def _har_entry(method, url, req_headers, body, started, elapsed, status, reason, resp_headers, content):
+    headers = dict((k.lower(), v) for k, v in resp_headers)
+    request_type = next((v for k, v in req_headers if k.lower() == "content-type"), "")
+    entry = {
+        "startedDateTime": started.isoformat(),
+        "time": round(elapsed * 1000, 1),
+        "request": {
+            "method": method,
+            "url": url,
+            "headers": [{"name": k, "value": v} for k, v in req_headers],
+        },
+        "response": {
+            "status": status,
+            "statusText": reason,
+            "headers": [{"name": k, "value": v} for k, v in resp_headers],
+            "content": {"size": len(content), "mimeType": headers.get("content-type", ""),
+                        "text": base64.b64encode(content).decode("ascii"), "encoding": "base64"},
+        },
+        "timings": {"send": 0, "wait": round(elapsed * 1000, 1), "receive": 0},
+    }
+    if body:
+        entry["request"]["postData"] = {"mimeType": request_type,
+                                        "text": body.decode("utf-8", "replace")}
+    return entry
@@ -0,0 +1,150 @@
+# support/helpers.py
+"""
+The `helpers` fixture: small steps shared by the account-level tests.
+
+    helpers.login(creds["email"], creds["password"])   # restored from a snapshot when possible
+    helpers.open("/index.php?route=account/newsletter")
+    msg = helpers.success_or_warning_text()
+
+A restored login works for every later navigation of the driver, not only
+helpers.open(): the cookies are set browser-wide and the localStorage is
+written by a script registered for each new document. Whether the restored
+session is still alive is only checked when a page shows otherwise: if the
+store sends helpers.open() to the login page, the form login is repeated and
+the page reloaded. Page objects navigating on their own can call
+helpers.revalidate(url) after loading.
+"""
+import json
+import time
+from urllib.parse import urljoin
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from .auth_state import CAPTURE_JS, RESTORE_STORAGE_JS, auth_state_store
+from .extract import Query, extract
+from .forms import fill_form
+from .waits import BrowserWait, clickable, url_contains, visible, wait_for_idle
+
+LOGIN_PATH = "index.php?route=account/login"
+LOGIN_ROUTE = "route=account/login"
+LOGIN_BUTTON = (By.CSS_SELECTOR, "input[value='Login'], button[type='submit']")
+ALERTS = (By.CSS_SELECTOR, ".alert-success, .alert-warning, .alert-danger, .alert, .text-danger")
+
+
+class Helpers:
+    """See the module docstring. One per test, over that test's driver."""
+
+    def __init__(self, driver, base_url: str, timeout: float = 15):
+        self.driver = driver
+        self.base_url = base_url
+        self.waits = BrowserWait(driver, timeout)
+        self.store = auth_state_store(base_url)
+        self._storage_script = None   # id of the registered localStorage restore, removed by close()
+        self._restored = None         # (email, password, saved seconds) while a snapshot's session is in use
+
+    def open(self, path: str):
+        """Load `path` (relative to base_url) and wait until the page settles, logging in again if it must."""
+        url = urljoin(self.base_url, path)
+        self.driver.get(url)
+        wait_for_idle(self.driver, self.waits.timeout)
+        self.revalidate(url)
+
+    def login(self, email: str, password: str):
+        """
+        Log in as `email`. With a snapshot, its cookies (session included) and localStorage are
+        handed to the browser and nothing is sent to the store. Otherwise the login form is
+        submitted and a snapshot saved for the next test.
+        """
+        state = self.store.load(email)
+        if state is None:
+            self._form_login(email, password)
+            return
+        start = time.perf_counter()
+        self._restore_cookies(state["cookies"])
+        if state.get("localStorage"):
+            self._restore_storage(state["origin"], state["localStorage"])
+        saved = self.store.record_restore(time.perf_counter() - start, state.get("login_s", 0.0))
+        self._restored = (email, password, saved)
+
+    def revalidate(self, url: str) -> bool:
+        """
+        After loading `url`: if the store sent the browser to the login page instead, the restored
+        session has expired, so log in through the form again and reload `url`. True when it had to.
+        """
+        if self._restored is None or LOGIN_ROUTE in url or LOGIN_ROUTE not in self.driver.current_url:
+            return False
+        email, password, saved = self._restored
+        self._restored = None
+        self.store.record_expired(saved)
+        self.close()
+        self._form_login(email, password)
+        self.driver.get(url)
+        wait_for_idle(self.driver, self.waits.timeout)
+        return True
+
+    def close(self):
+        """Stop restoring localStorage into new documents (the driver goes back to the pool)."""
+        if self._storage_script is not None:
+            try:
+                self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument",
+                                            {"identifier": self._storage_script})
+            except Exception:
+                pass
+            self._storage_script = None
+
+    def success_or_warning_text(self, timeout: float = None) -> str:
+        """Text of the visible alerts after a submit, or "" if none appeared."""
+        try:
+            self.waits.until(visible(ALERTS), timeout)
+        except TimeoutException:
+            return ""
+        texts = extract(self.driver, {"alerts": Query(ALERTS, visible_only=True)})["alerts"]
+        return " ".join(t for t in texts if t)
+
+    def _form_login(self, email, password):
+        start = time.perf_counter()
+        self.driver.get(urljoin(self.base_url, LOGIN_PATH))
+        fill_form(self.driver, {(By.NAME, "email"): email, (By.NAME, "password"): password},
+                  timeout=self.waits.timeout)
+        self.waits.until(clickable(LOGIN_BUTTON))[0].click()
+        self.waits.until(url_contains("account/account"), message=f"Login as {email} did not reach My Account")
+        elapsed = time.perf_counter() - start
+        self.store.save(email, self.driver.get_cookies(), self.driver.execute_script(CAPTURE_JS), elapsed)
+        self.store.record_form_login(elapsed)
+
+    def _restore_cookies(self, cookies):
+        if not cookies:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(c) for c in cookies]})
+            return
+        except Exception:
+            pass
+        # no CDP: cookies can only be added for the page currently loaded
+        self.driver.get(self.base_url)
+        for c in cookies:
+            self.driver.add_cookie({k: v for k, v in c.items() if k != "sameSite" or v in ("Strict", "Lax", "None")})
+
+    def _restore_storage(self, origin, items):
+        source = RESTORE_STORAGE_JS % (json.dumps(origin), json.dumps(items))
+        try:
+            self._storage_script = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )["identifier"]
+            return
+        except Exception:
+            pass
+        # no CDP: write it into the store's origin now
+        if not self.driver.current_url.startswith(origin):
+            self.driver.get(self.base_url)
+        self.driver.execute_script(source)
+
+
+def _cdp_cookie(c):
+    # WebDriver's cookie shape -> CDP Network.CookieParam
+    out = {"name": c["name"], "value": c["value"], "domain": c.get("domain"), "path": c.get("path", "/"),
+           "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False)}
+    if "expiry" in c:
+        out["expires"] = c["expiry"]
+    if c.get("sameSite") in ("Strict", "Lax", "None"):
+        out["sameSite"] = c["sameSite"]
+    return {k: v for k, v in out.items() if v is not None}
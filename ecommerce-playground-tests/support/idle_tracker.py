@@ -0,0 +1,94 @@
+# support/idle_tracker.py
+"""
+In-page bookkeeping of asynchronous work, so waits can tell when the page
+has actually settled rather than when readyState last changed.
+
+IDLE_TRACKER_JS wraps XMLHttpRequest, fetch and short setTimeout calls and
+keeps live counts in window.__epIdle (plus whether the page is unloading); every change fires an "ep-idle-change"
+event on the document, which the wait engine listens for. A timer set from
+inside a tracked timer's callback is not counted: that is a loop re-arming
+itself (carousels, countdowns, polling) and would keep the page busy forever.
+The unloading flag is cleared on pageshow, and UNLOAD_GRACE_MS after
+beforeunload in case the navigation was cancelled. Registered with
+Page.addScriptToEvaluateOnNewDocument it runs before any page script, so
+requests fired during page start-up are counted too. The idle() wait
+condition also installs it on demand for pages that were not instrumented.
+"""
+
+# setTimeouts longer than this are treated as schedules (carousels, session
+# pings), not as work the page is about to finish
+SHORT_TIMER_MS = 1000
+# a navigation that has not replaced the document by then was cancelled (or never started)
+UNLOAD_GRACE_MS = 2000
+
+IDLE_TRACKER_JS = r"""
+function epInstallIdle() {
+  if (window.__epIdle) return window.__epIdle;
+  const s = window.__epIdle = {xhr: 0, fetch: 0, timers: 0, last: performance.now(),
+                               setTimeout: window.setTimeout, clearTimeout: window.clearTimeout};
+  const touch = () => {
+    s.last = performance.now();
+    try { document.dispatchEvent(new Event('ep-idle-change')); } catch (e) {}
+  };
+
+  // a submit/click that navigates leaves this document busy until the next one replaces it
+  let unloadTimer = null;
+  const loaded = () => { s.clearTimeout.call(window, unloadTimer); if (s.unloading) { s.unloading = false; touch(); } };
+  window.addEventListener('beforeunload', () => {
+    s.unloading = true; touch();
+    s.clearTimeout.call(window, unloadTimer);
+    unloadTimer = s.setTimeout.call(window, loaded, %(unload_grace_ms)d);
+  });
+  window.addEventListener('pageshow', loaded);
+
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    s.xhr++; touch();
+    this.addEventListener('loadend', () => { s.xhr--; touch(); }, {once: true});
+    try { return send.apply(this, arguments); } catch (e) { s.xhr--; touch(); throw e; }
+  };
+
+  if (window.fetch) {
+    const fetch = window.fetch;
+    window.fetch = function () {
+      s.fetch++; touch();
+      return fetch.apply(this, arguments).finally(() => { s.fetch--; touch(); });
+    };
+  }
+
+  // the originals stay on s so the wait engine's own timers are never counted
+  const pending = new Set(), setT = s.setTimeout, clearT = s.clearTimeout;
+  let inCallback = 0;
+  window.setTimeout = function (fn, delay) {
+    if (typeof fn !== 'function' || (delay || 0) > %(short_ms)d || inCallback) return setT.apply(window, arguments);
+    const args = Array.prototype.slice.call(arguments, 2);
+    const id = setT(function () {
+      pending.delete(id); s.timers = pending.size;
+      inCallback++;
+      try { fn.apply(this, args); } finally { inCallback--; touch(); }
+    }, delay);
+    pending.add(id); s.timers = pending.size;
+    return id;
+  };
+  window.clearTimeout = function (id) {
+    if (pending.delete(id)) { s.timers = pending.size; touch(); }
+    return clearT.apply(window, arguments);
+  };
+  return s;
+}
+""" % {"short_ms": SHORT_TIMER_MS, "unload_grace_ms": UNLOAD_GRACE_MS}
+
+
+def install_idle_tracker(driver) -> bool:
+    """
+    Register the tracker for every document the current window loads from
+    now on (and run it in the current one). Best effort: returns False when
+    the driver has no CDP, in which case idle() installs it lazily.
+    """
+    source = IDLE_TRACKER_JS + "\nepInstallIdle();"
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        driver.execute_script(source)
+    except Exception:
+        return False
+    return True
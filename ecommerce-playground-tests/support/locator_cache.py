@@ -0,0 +1,123 @@
+# support/locator_cache.py
+import json
+import os
+import threading
+from .driver_resolver import CACHE_DIR
+
+ENABLED = os.environ.get("EP_LOCATOR_CACHE", "1") not in ("0", "false", "False")
+
+_CACHE_FILE = "locators.json"
+
+# Structural hash of the current document: body classes plus the tag/id of
+# every element carrying an id, with digit runs folded so the product page of
+# one item fingerprints like the product page of another.
+FINGERPRINT_JS = r"""
+function epFingerprint() {
+  const parts = [location.pathname, document.body ? document.body.className : ''];
+  const els = document.querySelectorAll('body [id]');
+  for (let i = 0; i < els.length && i < 300; i++) parts.push(els[i].tagName + '#' + els[i].id);
+  const s = parts.join('|').replace(/\d+/g, '0');
+  let h = 0x811c9dc5;
+  for (let i = 0; i < s.length; i++) { h ^= s.charCodeAt(i); h = Math.imul(h, 0x01000193) >>> 0; }
+  return h.toString(16);
+}
+"""
+
+
+class LocatorCache:
+    """
+    Remembers which candidate of a LocatorChain matched, per page object,
+    method and DOM fingerprint, across runs.
+
+    `order()` moves the remembered winner to the front of the chain, but only
+    when the current page's fingerprint matches the one it was learnt on;
+    `record()` stores what actually matched, and counts a hit only when the
+    promoted winner won again. When the page's fingerprint no longer matches
+    the stored one the entry is dropped and relearnt, so a template change
+    never pins a stale locator. Entries are merged into the JSON file on
+    `save()`, which xdist workers can do concurrently.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(CACHE_DIR, _CACHE_FILE)
+        self.lookups = 0
+        self.hits = 0
+        self.invalidated = 0
+        self._entries = None
+        self._dirty = {}
+        self._lock = threading.Lock()
+
+    def order(self, key: str, chain, fingerprint: str):
+        """
+        Return `chain` with the remembered winner for `key` tried first, or `chain`
+        itself when nothing was learnt on a page with this `fingerprint`.
+        """
+        entry = self._get(key)
+        if entry and entry["fingerprint"] == fingerprint and tuple(entry["locator"]) in chain.locators:
+            return chain.prefer(tuple(entry["locator"]))
+        return chain
+
+    def record(self, key: str, fingerprint: str, locator, promoted: bool = False):
+        """Remember that `locator` matched; `promoted`: order() had moved the remembered winner first."""
+        locator = list(locator)
+        with self._lock:
+            entry = self._load().get(key)
+            self.lookups += 1
+            if entry and entry["fingerprint"] != fingerprint:
+                self.invalidated += 1
+                entry = None
+            if entry and entry["locator"] == locator:
+                if promoted:
+                    self.hits += 1
+                return
+            entry = {"fingerprint": fingerprint, "locator": locator}
+            self._entries[key] = entry
+            self._dirty[key] = entry
+
+    def save(self):
+        """Merge what this process learnt into the cache file (atomic replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = _read(self.path)
+            merged.update(self._dirty)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(merged, fh, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty.clear()
+
+    def report(self):
+        return {"lookups": self.lookups, "hits": self.hits, "invalidated": self.invalidated}
+
+    def _get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = _read(self.path)
+        return self._entries
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+_cache = None
+
+
+def locator_cache():
+    """The process-wide cache, or None when EP_LOCATOR_CACHE=0."""
+    global _cache
+    if not ENABLED:
+        return None
+    if _cache is None:
+        _cache = LocatorCache()
+    return _cache
@@ -0,0 +1,104 @@
+# support/locators.py
+"""
+In-browser resolution of Selenium (By, value) locators.
+
+FIND_JS is prepended to scripts that need to look elements up inside the page
+(waits, locator chains, bulk fills/extraction) so a whole lookup costs one
+WebDriver round trip instead of one per locator.
+"""
+
+FIND_JS = r"""
+function epFind(loc, root) {
+  root = root || document;
+  const by = loc[0], value = loc[1];
+  const all = (sel) => Array.from(root.querySelectorAll(sel));
+  switch (by) {
+    case 'css selector': return all(value);
+    case 'id': return all('[id="' + CSS.escape(value) + '"]');
+    case 'name': return all('[name="' + CSS.escape(value) + '"]');
+    case 'class name': return all('.' + CSS.escape(value));
+    case 'tag name': return all(value);
+    case 'link text': return all('a').filter(a => a.innerText.trim() === value.trim());
+    case 'partial link text': return all('a').filter(a => a.innerText.includes(value));
+    case 'xpath': {
+      const doc = root.ownerDocument || root;
+      const snap = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      const out = [];
+      for (let i = 0; i < snap.snapshotLength; i++) {
+        const n = snap.snapshotItem(i);
+        if (n.nodeType === 1) out.push(n);
+      }
+      return out;
+    }
+  }
+  throw new SyntaxError('Unsupported locator strategy: ' + by);
+}
+
+function epVisible(el) {
+  if (!el || !el.isConnected) return false;
+  for (let n = el; n && n.nodeType === 1; n = n.parentElement) {
+    const s = getComputedStyle(n);
+    if (s.display === 'none' || parseFloat(s.opacity) === 0) return false;
+    if (n === el && (s.visibility === 'hidden' || s.visibility === 'collapse')) return false;
+  }
+  const r = el.getBoundingClientRect();
+  return r.width > 0 && r.height > 0;
+}
+
+function epEnabled(el) {
+  return !el.disabled && !el.closest('fieldset[disabled]');
+}
+"""
+
+
+def as_locator(locator):
+    """Normalise a (By, value) pair into the JSON-friendly list the JS side expects."""
+    by, value = locator
+    return [by, value]
+
+
+class LocatorChain:
+    """
+    Ordered fallback locators for one logical element.
+
+    The whole chain is evaluated inside the page in a single call and waited
+    on under one shared timeout; the earliest candidate (in declaration order)
+    that satisfies `require` ("present", "visible" or "clickable") wins.
+    """
+
+    def __init__(self, *locators, name: str = None, require: str = "present"):
+        if not locators:
+            raise ValueError("LocatorChain needs at least one locator")
+        if require not in ("present", "visible", "clickable"):
+            raise ValueError(f"Unknown chain requirement: {require!r}")
+        self.locators = [tuple(loc) for loc in locators]
+        self.name = name
+        self.require = require
+
+    def __iter__(self):
+        return iter(self.locators)
+
+    def __len__(self):
+        return len(self.locators)
+
+    def prefer(self, locator) -> "LocatorChain":
+        """Same chain with `locator` moved to the front (used by the locator cache)."""
+        locator = tuple(locator)
+        rest = [loc for loc in self.locators if loc != locator]
+        return LocatorChain(locator, *rest, name=self.name, require=self.require)
+
+    def __repr__(self):
+        return f"LocatorChain({self.name or ', '.join(f'{b}={v!r}' for b, v in self.locators)})"
+
+
+class ChainMatch:
+    """Result of resolving a LocatorChain: the matched elements and which candidate produced them."""
+
+    def __init__(self, elements, index: int, locator):
+        self.elements = elements
+        self.element = elements[0]
+        self.index = index
+        self.locator = locator
+
+    def __repr__(self):
+        return f"ChainMatch(index={self.index}, locator={self.locator!r}, matches={len(self.elements)})"
@@ -0,0 +1,366 @@
+# support/screenshots.py
+"""
+Screenshots written off the test thread, kept according to a retention policy.
+
+BasePage.take_screenshot only asks the browser for the PNG (base64, as the
+WebDriver protocol returns it) and queues it. One writer thread per process
+decodes it and writes the file. The queue holds EP_SCREENSHOT_QUEUE shots
+(default 16); when it is full the test waits for room, so a burst of
+screenshots cannot hold unbounded memory. Names carry milliseconds and a
+per-process sequence number, and files are created exclusively, so rapid or
+parallel shots of the same name never overwrite each other. The queue is
+drained at session end (conftest), and a "screenshots" section reports how
+long the test thread would otherwise have spent writing.
+
+capture() and submit() return a Screenshot handle rather than a path, since
+the file does not exist yet when they return. handle.result() (or
+os.fspath(handle), so open(handle) works) waits for the writer and returns
+the path the file was actually written to. flush() waits for every queued
+shot at once.
+
+EP_SCREENSHOTS decides which tests keep their screenshots (conftest brackets
+each test with start_test()/finish_test(), keyed by node id). The running
+test's state is shared by every thread of the process, so screenshots taken
+from fan_out workers follow the same policy; it is read and changed under a
+lock, and a shot that lands after its test has finished still gets that
+test's outcome.
+
+- always (default): every screenshot is kept.
+- on-failure: a test's screenshots are held in memory and written only if
+  the test fails.
+- sampled: a fraction EP_SCREENSHOT_SAMPLE (default 0.1) of tests, picked at
+  random, keep theirs; the others skip even the capture.
+
+Storage is content-addressed: the bytes go to
+<EP_SCREENSHOT_DIR>/.objects/<sha256>.png once, and each named screenshot
+is a hard link to that object. A frame identical to one already stored
+(the same page shot twice, or in an earlier run) costs no space. Only
+byte-identical PNGs are merged: frames that differ by a caret blink, an
+animation step or a timestamp are stored separately. A perceptual hash could
+catch those, but it would need an image library this suite does not depend
+on, and it would replace a frame with a different one that merely looks
+alike, which is the wrong trade for test evidence. At session
+end the directory is trimmed to EP_SCREENSHOT_MB (default 200) by removing
+the least recently written or reused images, with all of their names.
+"""
+import base64
+import hashlib
+import itertools
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+from datetime import datetime
+
+ALWAYS = "always"
+ON_FAILURE = "on-failure"
+SAMPLED = "sampled"
+MODES = (ALWAYS, ON_FAILURE, SAMPLED)
+
+QUEUE_SIZE = int(os.environ.get("EP_SCREENSHOT_QUEUE", "16"))
+MODE = os.environ.get("EP_SCREENSHOTS", ALWAYS).lower()
+SAMPLE_RATE = float(os.environ.get("EP_SCREENSHOT_SAMPLE", "0.1"))
+MAX_BYTES = int(float(os.environ.get("EP_SCREENSHOT_MB", "200")) * 1024 * 1024)
+_OBJECTS = ".objects"
+
+
+def screenshots_root():
+    return os.environ.get("EP_SCREENSHOT_DIR") or os.path.join(os.getcwd(), "screenshots")
+
+
+def screenshots_dir():
+    # each xdist worker gets its own folder so parallel runs never write into the same place
+    base = screenshots_root()
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return os.path.join(base, worker) if worker else base
+
+
+class Screenshot:
+    """
+    A queued screenshot. `path` is the name it was given; result() waits until it is on
+    disk and returns the path it was written to (with a "-n" suffix if the name was taken).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.held = False   # on-failure: kept in memory until the test's outcome is known
+        self._done = threading.Event()
+        self._written = None
+        self._error = None
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: float = None) -> str:
+        """Wait for the file and return its path; raises when it will not be (or was not) written."""
+        if self.held:
+            raise RuntimeError(f"{os.path.basename(self.path)} is only written if the test fails (EP_SCREENSHOTS=on-failure)")
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{os.path.basename(self.path)} not written after {timeout}s")
+        if self._error:
+            raise OSError(self._error)
+        return self._written
+
+    def __fspath__(self):
+        return self.result()
+
+    def __repr__(self):
+        state = "held" if self.held else "written" if self._written else "failed" if self._error else "queued"
+        return f"<Screenshot {self.path} ({state})>"
+
+    def _resolve(self, written: str = None, error: str = None):
+        self.held = False
+        self._written, self._error = written, error
+        self._done.set()
+
+
+class ScreenshotWriter:
+    """See the module docstring. submit() from any thread; close() waits for every queued shot."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE, mode: str = MODE, sample_rate: float = SAMPLE_RATE,
+                 max_bytes: int = MAX_BYTES, root: str = None):
+        if mode not in MODES:
+            raise ValueError(f"screenshot mode must be one of {', '.join(MODES)}, got {mode!r}")
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.root = root or screenshots_root()
+        self.shots = 0
+        self.bytes_written = 0
+        self.deduplicated = 0
+        self.bytes_deduplicated = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.stored_bytes = 0
+        self.capture_seconds = 0.0   # browser rendering, still on the test thread
+        self.enqueue_seconds = 0.0   # test thread blocked on a full queue
+        self.write_seconds = 0.0     # decode + disk, moved to the writer thread
+        self.errors = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._seq = itertools.count(1)
+        self._dirs = set()
+        self._thread = None
+        # node id -> {"keep": bool, "failed": None until finished, "pending": [(Screenshot, png_b64)]}
+        self._tests = {}
+        self._current = None
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+
+    def start_test(self, test_id: str = None):
+        keep = self.mode != SAMPLED or random.random() < self.sample_rate
+        with self._lock:
+            self._tests[test_id] = {"keep": keep, "failed": None, "pending": []}
+            self._current = test_id
+
+    def finish_test(self, failed: bool, test_id: str = None):
+        """Queue the held screenshots of a failed test (on-failure); forget them otherwise."""
+        with self._lock:
+            test = self._tests.pop(test_id, None)
+            if self._current == test_id:
+                self._current = None
+            if not test:
+                return
+            test["failed"] = failed
+            pending, test["pending"] = test["pending"], []
+            if not failed:
+                self.dropped += len(pending)
+        for shot, png_b64 in pending:
+            if failed:
+                shot.held = False
+                self._enqueue(shot, png_b64)
+            else:
+                shot._resolve(error="dropped: the test passed (EP_SCREENSHOTS=on-failure)")
+
+    def _running_test(self):
+        with self._lock:
+            return self._tests.get(self._current)
+
+    def capture(self, driver, name: str = None, directory: str = None):
+        """
+        Grab a screenshot from `driver` and queue (or, on-failure, hold) it; returns its
+        Screenshot handle, or None when the policy drops this test's screenshots.
+        """
+        test = self._running_test()
+        if test is not None and not test["keep"]:
+            with self._lock:
+                self.dropped += 1
+            return None
+        start = time.perf_counter()
+        png_b64 = driver.get_screenshot_as_base64()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.capture_seconds += elapsed
+        return self.submit(png_b64, name, directory, test=test)
+
+    def submit(self, png_b64: str, name: str = None, directory: str = None, test: dict = None) -> Screenshot:
+        """Queue `png_b64`; `test` is the state the shot was taken under (default: the running test)."""
+        directory = directory or screenshots_dir()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        shot = Screenshot(os.path.join(directory, f"{name or 'screenshot'}_{stamp}_{next(self._seq):04d}.png"))
+        test = test or self._running_test()
+        if test is not None and self.mode == ON_FAILURE:
+            with self._lock:
+                if test["failed"] is None:
+                    shot.held = True
+                    test["pending"].append((shot, png_b64))
+                    return shot
+                passed = not test["failed"]
+                if passed:
+                    self.dropped += 1
+            if passed:
+                # taken on a worker thread that outlived its (passing) test
+                shot._resolve(error="dropped: the test passed (EP_SCREENSHOTS=on-failure)")
+                return shot
+        self._enqueue(shot, png_b64)
+        return shot
+
+    def _enqueue(self, shot, png_b64):
+        self._ensure_thread()
+        start = time.perf_counter()
+        self._queue.put((shot, png_b64))
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.enqueue_seconds += elapsed
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write everything queued, then trim the directory to the size cap."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self.prune()
+
+    def prune(self):
+        """Remove the least recently used images (every name of each) until the directory fits max_bytes."""
+        images = {}   # inode -> [last written or reused, size, paths]
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                images.setdefault((st.st_dev, st.st_ino), [st.st_mtime, st.st_size, []])[2].append(path)
+        total = sum(size for _, size, _ in images.values())
+        for _, size, paths in sorted(images.values()):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            self.evicted += 1
+        self.stored_bytes = total
+
+    def report(self):
+        return {
+            "mode": self.mode,
+            "shots": self.shots,
+            "bytes": self.bytes_written,
+            "deduplicated": self.deduplicated,
+            "dedup_bytes": self.bytes_deduplicated,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+            "stored_bytes": self.stored_bytes,
+            "capture_s": round(self.capture_seconds, 3),
+            "enqueue_s": round(self.enqueue_seconds, 3),
+            "write_s": round(self.write_seconds, 3),
+            "saved_s": round(max(0.0, self.write_seconds - self.enqueue_seconds), 3),
+            "errors": self.errors[-3:],
+        }
+
+    # --- writer thread ---
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, shot, png_b64):
+        path = shot.path
+        start = time.perf_counter()
+        try:
+            data = base64.b64decode(png_b64)
+            obj = os.path.join(self.root, _OBJECTS, hashlib.sha256(data).hexdigest() + ".png")
+            for directory in (os.path.dirname(path), os.path.dirname(obj)):
+                if directory not in self._dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    self._dirs.add(directory)
+            if os.path.exists(obj):
+                # already stored: reusing it makes it recent for the size cap
+                os.utime(obj)
+                self.deduplicated += 1
+                self.bytes_deduplicated += len(data)
+            else:
+                tmp = f"{obj}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp, obj)
+                self.bytes_written += len(data)
+            shot._resolve(written=_link(obj, path))
+            self.shots += 1
+        except Exception as e:
+            self.errors.append(f"{os.path.basename(path)}: {type(e).__name__}: {e}")
+            shot._resolve(error=f"{type(e).__name__}: {e}")
+        finally:
+            self.write_seconds += time.perf_counter() - start
+
+
+def _link(obj, path):
+    # another process can only collide on the same millisecond, name and sequence number; never overwrite it
+    root, ext = os.path.splitext(path)
+    for n in itertools.count():
+        target = path if n == 0 else f"{root}-{n}{ext}"
+        try:
+            os.link(obj, target)
+            return target
+        except FileExistsError:
+            continue
+        except OSError:
+            # no hard links on this filesystem: fall back to a copy
+            try:
+                with open(target, "xb") as dst, open(obj, "rb") as src:
+                    shutil.copyfileobj(src, dst)
+                return target
+            except FileExistsError:
+                continue
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def screenshot_writer() -> ScreenshotWriter:
+    """The process-wide writer."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ScreenshotWriter()
+        return _writer
+
+
+def active_writer():
+    """The writer if any screenshot was taken in this process, else None."""
+    return _writer
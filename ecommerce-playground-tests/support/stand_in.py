@@ -0,0 +1,880 @@
+# support/stand_in.py
+"""
+A small local stand-in for the demo store, for the stateful flows that a
+recording cannot replay (register, address book, compare, cart, contact,
+blog comments, reviews).
+
+EP_NETWORK=local starts one per test process (the `stand_in` fixture) on
+http://127.0.0.1:<port>/ and points `base_url` at it. It is a plain
+http.server app that renders just enough OpenCart/Maza markup for the
+suite's locators (#input-firstname, #button-cart, #button-comment,
+div#widget-navbar-217834, table#compare-products, the alert classes) and
+runs the same AJAX routes the theme's scripts call.
+
+Everything lives in memory and is gone when the process ends: accounts and
+their address books, and per-session compare lists, carts and flash
+messages keyed by the OCSESSID cookie, so concurrent browsers never see each
+other's state. It behaves like the live store where the tests document its
+quirks: free-text address fields are not validated, and the "Shop by
+Category" links and the washing-machine promotion that are broken there go
+back to the home page here too. Routes it does not know get a 404 and are
+listed in the summary.
+"""
+import html
+import json
+import re
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+SESSION_COOKIE = "OCSESSID"
+
+# registered before the first request; test_register_existing_email and the forgotten-password test rely on them
+SEED_ACCOUNTS = (
+    {"firstname": "First", "lastname": "Last", "email": "firstlast@gmail.com", "telephone": "98765432",
+     "password": "Password123!"},
+    {"firstname": "Valid", "lastname": "User", "email": "valid.user+demo@example.com", "telephone": "0400000000",
+     "password": "Test@12345"},
+)
+
+CATEGORIES = {25: "Components", 33: "Cameras", 24: "Phones & PDAs", 18: "Laptops & Notebooks"}
+# listed under "Shop by Category" but, as on the live store, linked back to the home page
+BROKEN_CATEGORIES = ("Fashion and Accessories", "Beauty and Saloon", "Autoparts and Accessories",
+                     "Washing machine", "Gaming consoles")
+MANUFACTURERS = {5: "HTC", 8: "Apple", 7: "Hewlett-Packard", 9: "Canon", 11: "Nikon", 12: "Asus", 13: "Samsung"}
+PRODUCTS = {
+    28: {"name": "HTC Touch HD", "category": 24, "brand": 5, "price": 146.00, "featured": True},
+    107: {"name": "iPhone", "category": 24, "brand": 8, "price": 123.20, "featured": True},
+    31: {"name": "Nikon D300", "category": 33, "brand": 11, "price": 98.00, "featured": True},
+    32: {"name": "Nikon Coolpix P1000", "category": 33, "brand": 11, "price": 999.00, "featured": False},
+    30: {"name": "Canon EOS 5D", "category": 33, "brand": 9, "price": 134.00, "featured": False},
+    47: {"name": "HP LP3065", "category": 18, "brand": 7, "price": 122.00, "featured": True},
+    44: {"name": "MacBook Air", "category": 18, "brand": 8, "price": 1202.00, "featured": False},
+    60: {"name": "Asus Zenbook 14", "category": 18, "brand": 12, "price": 899.00, "featured": False},
+    61: {"name": "Asus Vivobook 15", "category": 18, "brand": 12, "price": 649.00, "featured": False},
+    33: {"name": "Samsung SyncMaster 941BW", "category": 25, "brand": 13, "price": 242.00, "featured": False},
+    42: {"name": 'Apple Cinema 30"', "category": 25, "brand": 8, "price": 122.00, "featured": True},
+}
+COUNTRIES = {
+    13: ("Australia", {190: "Australian Capital Territory", 191: "New South Wales", 193: "Queensland",
+                       196: "Victoria", 197: "Western Australia"}),
+    222: ("United Kingdom", {3513: "England", 3514: "Northern Ireland", 3515: "Scotland", 3516: "Wales"}),
+    223: ("United States", {3624: "California", 3655: "New York", 3667: "Texas"}),
+}
+ARTICLES = {
+    36: "Top 10 cameras for travel photography",
+    37: "Amazing things you can do with a smartphone camera",
+    38: "Choosing a laptop for work and play",
+}
+
+COMMENT_SUCCESS = "Thank you for your comment. It has been submitted to the webmaster for approval."
+REVIEW_SUCCESS = "Thank you for your review. It has been submitted to the webmaster for approval."
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_COMPARE_MAX = 4
+
+# the theme's scripts, cut down to the calls the tests trigger
+_SCRIPT = r"""
+function epPost(route, data) {
+  return fetch('index.php?route=' + route, {method: 'POST', credentials: 'same-origin',
+    headers: {'Content-Type': 'application/x-www-form-urlencoded'}, body: new URLSearchParams(data)})
+    .then(function (r) { return r.json(); });
+}
+function epAlert(target, json) {
+  var box = document.querySelector(target);
+  box.querySelectorAll('.alert').forEach(function (a) { a.remove(); });
+  var kind = json.success ? 'success' : 'danger', icon = json.success ? 'fa-check-circle' : 'fa-exclamation-circle';
+  box.insertAdjacentHTML('afterbegin', '<div class="alert alert-' + kind + ' alert-dismissible"><i class="fa ' + icon
+    + '"></i> ' + (json.success || json.error) + ' <button type="button" class="close"'
+    + ' onclick="this.parentNode.remove()">&times;</button></div>');
+}
+var cart = {add: function (id, qty) {
+  epPost('checkout/cart/add', {product_id: id, quantity: qty || 1}).then(function (json) {
+    epAlert('#notification', json);
+    if (json.total) document.getElementById('cart-total').textContent = json.total;
+  });
+}};
+var compare = {add: function (id) {
+  epPost('product/compare/add', {product_id: id}).then(function (json) {
+    epAlert('#notification', json);
+    if (json.total) document.getElementById('compare-total').textContent = json.total;
+  });
+}};
+function epForm(form) { return Object.fromEntries(new FormData(form)); }
+function epZones(select) {
+  var zone = document.querySelector("select[name='zone_id']"), keep = zone.getAttribute('data-zone');
+  zone.innerHTML = '<option value="">--- Please Select ---</option>';
+  if (!select.value) return;
+  fetch('index.php?route=localisation/country&country_id=' + select.value).then(function (r) { return r.json(); })
+    .then(function (json) {
+      json.zone.forEach(function (z) {
+        var o = document.createElement('option');
+        o.value = z.zone_id; o.textContent = z.name; o.selected = String(z.zone_id) === keep;
+        zone.appendChild(o);
+      });
+    });
+}
+document.addEventListener('DOMContentLoaded', function () {
+  var country = document.querySelector("select[name='country_id']");
+  if (country) epZones(country);
+  var button = document.getElementById('button-cart');
+  if (button) button.addEventListener('click', function () {
+    cart.add(document.querySelector("input[name='product_id']").value,
+             document.getElementById('input-quantity').value);
+  });
+  var review = document.getElementById('button-review');
+  if (review) review.addEventListener('click', function () {
+    var form = document.getElementById('form-review');
+    epPost('product/product/review&product_id=' + form.getAttribute('data-product'), epForm(form))
+      .then(function (json) { epAlert('#form-review', json); if (json.success) form.reset(); });
+  });
+  var comment = document.getElementById('button-comment');
+  if (comment) comment.addEventListener('click', function () {
+    var form = document.getElementById('form-comment');
+    epPost('extension/maza/blog/comment/write&article_id=' + form.getAttribute('data-article'), epForm(form))
+      .then(function (json) { epAlert('#form-comment', json); if (json.success) form.reset(); });
+  });
+  var shop = document.getElementById('shop-by-category');
+  if (shop) shop.addEventListener('click', function (e) {
+    e.preventDefault();
+    var panel = document.getElementById('widget-navbar-217834');
+    panel.style.display = panel.style.display === 'none' ? 'block' : 'none';
+  });
+});
+"""
+
+
+class StandIn:
+    """See the module docstring. start() it, point the browser at base_url, stop() it at the end."""
+
+    def __init__(self, port: int = 0, accounts=SEED_ACCOUNTS):
+        self.port = port
+        self.base_url = None
+        self.accounts = {}     # email -> account, with its address book
+        self.sessions = {}     # OCSESSID -> {"customer", "compare", "cart", "flash"}
+        self.enquiries = []
+        self.comments = []
+        self.reviews = []
+        self.requests = 0
+        self.registered = 0
+        self.not_found = []
+        self._ids = {"customer": 0, "address": 0}
+        self._server = None
+        self._lock = threading.Lock()
+        for account in accounts:
+            self._add_account(dict(account))
+        self._seeded = len(self.accounts)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}/"
+        threading.Thread(target=self._server.serve_forever, name="stand-in", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self):
+        return {
+            "requests": self.requests,
+            "sessions": len(self.sessions),
+            "registered": self.registered,
+            "accounts": len(self.accounts) - self._seeded,
+            "enquiries": len(self.enquiries),
+            "comments": len(self.comments),
+            "reviews": len(self.reviews),
+            "not_found": self.not_found[:5],
+        }
+
+    # --- request handling ---
+
+    def handle(self, req):
+        parts = urlsplit(req.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        length = int(req.headers.get("Content-Length") or 0)
+        form = dict(parse_qsl(req.rfile.read(length).decode("utf-8", "replace"), keep_blank_values=True)) \
+            if length else {}
+        cookie = SimpleCookie(req.headers.get("Cookie") or "")
+        sid = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+        with self._lock:
+            self.requests += 1
+            fresh = sid not in self.sessions
+            if fresh:
+                # unknown ids too: a snapshot restored from an earlier run must not resurrect a session
+                sid = secrets.token_hex(13)
+                self.sessions[sid] = {"customer": None, "compare": [], "cart": {}, "flash": []}
+            route = query.get("route") or ("common/home" if parts.path in ("/", "/index.php") else parts.path)
+            rq = _Request(req.command, route, query, form, self.sessions[sid])
+            view = _ROUTES.get(route)
+            if view is None:
+                self.not_found.append(f"{req.command} {req.path}")
+                status, headers, body = self._not_found(rq)
+            else:
+                status, headers, body = view(self, rq)
+        if fresh:
+            headers.append(("Set-Cookie", f"{SESSION_COOKIE}={sid}; Path=/; HttpOnly; SameSite=Lax"))
+        req.send_response(status)
+        for name, value in headers:
+            req.send_header(name, value)
+        req.send_header("Content-Length", str(len(body)))
+        req.end_headers()
+        if req.command != "HEAD":
+            req.wfile.write(body)
+
+    # --- catalogue ---
+
+    def home(self, rq):
+        content = (
+            '<div class="promo"><h3>Upto 50% Off on Fully Automatic Top Load Washing Machine</h3>'
+            f'<a class="btn btn-primary" href="{self._url("common/home")}">SHOP NOW</a></div>'
+            f'<h2>Featured</h2><div class="row">{self._thumbs(i for i, p in PRODUCTS.items() if p["featured"])}</div>'
+        )
+        return self._page(rq, "Your Store", content)
+
+    def category(self, rq):
+        path = _int(rq.query.get("path", "").split("_")[-1])
+        if path not in CATEGORIES:
+            return self._not_found(rq, "Category not found!")
+        name = CATEGORIES[path]
+        content = f"<h1>{_e(name)}</h1><div class='row'>{self._thumbs(self._in_category(path))}</div>"
+        return self._page(rq, name, content, [(name, None)])
+
+    def manufacturer(self, rq):
+        brand = _int(rq.query.get("manufacturer_id"))
+        if brand not in MANUFACTURERS:
+            return self._not_found(rq, "Brand not found!")
+        name = MANUFACTURERS[brand]
+        products = [i for i, p in PRODUCTS.items() if p["brand"] == brand]
+        content = f"<h1>{_e(name)}</h1><div class='row'>{self._thumbs(products)}</div>"
+        return self._page(rq, name, content, [("Brand", None), (name, None)])
+
+    def search(self, rq):
+        term = rq.query.get("search", "").strip()
+        found = [i for i, p in PRODUCTS.items() if term.lower() in p["name"].lower()]
+        results = (f"<div class='row'>{self._thumbs(found)}</div>" if found
+                   else "<p>There is no product that matches the search criteria.</p>")
+        title = f"Search - {term}" if term else "Search"
+        return self._page(rq, title, f"<h1>{_e(title)}</h1>{results}", [("Search", None)])
+
+    def product(self, rq):
+        product_id = _int(rq.query.get("product_id"))
+        if product_id not in PRODUCTS:
+            return self._not_found(rq, "Product not found!")
+        p = PRODUCTS[product_id]
+        brand = MANUFACTURERS[p["brand"]]
+        reviews = sum(1 for r in self.reviews if r["product_id"] == product_id)
+        stars = "".join(f'<label><input type="radio" name="rating" value="{n}"> {n}</label>' for n in range(1, 6))
+        content = f"""
+<h1>{_e(p["name"])}</h1>
+<ul class="list-unstyled">
+  <li>Brand: <a href="{self._url("product/manufacturer/info", manufacturer_id=p["brand"])}">{_e(brand)}</a></li>
+  <li>Product Code: Product {product_id}</li>
+  <li>Availability: In Stock</li>
+</ul>
+<h2 class="price">${p["price"]:.2f}</h2>
+<div class="form-group">
+  <input type="hidden" name="product_id" value="{product_id}">
+  <label for="input-quantity">Qty</label>
+  <input type="text" name="quantity" value="1" id="input-quantity" class="form-control">
+  <button type="button" id="button-cart" class="btn btn-primary">Add to Cart</button>
+  <button type="button" class="btn btn-default" title="Compare this Product"
+          onclick="compare.add('{product_id}');"><i class="fa fa-exchange"></i></button>
+</div>
+<ul class="nav nav-tabs">
+  <li><a href="#tab-description" data-toggle="tab">Description</a></li>
+  <li><a href="#tab-review" data-toggle="tab">Reviews ({reviews})</a></li>
+</ul>
+<div class="tab-content">
+  <div id="tab-description" class="description"><p>{_e(p["name"])} by {_e(brand)}.</p></div>
+  <div id="tab-review">
+    <form id="form-review" data-product="{product_id}">
+      <h2>Write a review</h2>
+      <label for="input-name">Your Name</label>
+      <input type="text" name="name" id="input-name" class="form-control">
+      <label for="input-review">Your Review</label>
+      <textarea name="text" rows="5" id="input-review" class="form-control"></textarea>
+      <div class="rating">Rating {stars}</div>
+      <button type="button" id="button-review" class="btn btn-primary">Continue</button>
+    </form>
+  </div>
+</div>"""
+        trail = [(CATEGORIES[p["category"]], self._url("product/category", path=p["category"])),
+                 (brand, self._url("product/manufacturer/info", manufacturer_id=p["brand"])), (p["name"], None)]
+        return self._page(rq, p["name"], content, trail)
+
+    def review(self, rq):
+        name, text = rq.form.get("name", "").strip(), rq.form.get("text", "").strip()
+        if not 3 <= len(name) <= 25:
+            return _json({"error": "Warning: Review Name must be between 3 and 25 characters!"})
+        if not 25 <= len(text) <= 1000:
+            return _json({"error": "Warning: Review Text must be between 25 and 1000 characters!"})
+        if rq.form.get("rating") not in ("1", "2", "3", "4", "5"):
+            return _json({"error": "Warning: Please select a review rating!"})
+        self.reviews.append({"product_id": _int(rq.query.get("product_id")), "name": name, "text": text,
+                             "rating": int(rq.form["rating"])})
+        return _json({"success": REVIEW_SUCCESS})
+
+    # --- compare and cart ---
+
+    def compare(self, rq):
+        remove = _int(rq.query.get("remove"))
+        if remove is not None:
+            if remove in rq.session["compare"]:
+                rq.session["compare"].remove(remove)
+            rq.session["flash"].append(("success", "Success: You have modified your product comparison!"))
+            return _redirect(self._url("product/compare"))
+        items = rq.session["compare"]
+        if not items:
+            content = ('<h1>Product Comparison</h1><p>You have not chosen any products to compare.</p>'
+                       f'<a href="{self._url("common/home")}" class="btn btn-primary">Continue</a>')
+            return self._page(rq, "Product Comparison", content, [("Product Comparison", None)])
+
+        def row(label, cell):
+            return f"<tr><td>{label}</td>{''.join(f'<td>{cell(i, PRODUCTS[i])}</td>' for i in items)}</tr>"
+
+        rows = [
+            row("Product", lambda i, p: f'<a href="{self._product_url(i)}"><strong>{_e(p["name"])}</strong></a>'),
+            row("Price", lambda i, p: f"${p['price']:.2f}"),
+            row("Brand", lambda i, p: _e(MANUFACTURERS[p["brand"]])),
+            row("Availability", lambda i, p: "In Stock"),
+            row("", lambda i, p: f'<input type="button" value="Add to Cart" class="btn btn-primary" '
+                                 f'onclick="cart.add(\'{i}\');"> <a href="{self._url("product/compare", remove=i)}" '
+                                 'class="btn btn-danger">Remove</a>'),
+        ]
+        content = ('<h1>Product Comparison</h1><div class="table-responsive">'
+                   f'<table id="compare-products" class="table table-bordered"><thead><tr>'
+                   f'<td colspan="{len(items) + 1}"><strong>Product Details</strong></td></tr></thead>'
+                   f'<tbody>{"".join(rows)}</tbody></table></div>')
+        return self._page(rq, "Product Comparison", content, [("Product Comparison", None)])
+
+    def compare_add(self, rq):
+        product_id = _int(rq.form.get("product_id"))
+        if product_id not in PRODUCTS:
+            return _json({"error": "Product not found!"})
+        items = rq.session["compare"]
+        if product_id not in items:
+            if len(items) >= _COMPARE_MAX:
+                items.pop(0)
+            items.append(product_id)
+        return _json({
+            "success": f'Success: You have added <a href="{self._product_url(product_id)}">'
+                       f'{_e(PRODUCTS[product_id]["name"])}</a> to your '
+                       f'<a href="{self._url("product/compare")}">product comparison</a>!',
+            "total": f"Product Compare ({len(items)})",
+        })
+
+    def cart_add(self, rq):
+        product_id = _int(rq.form.get("product_id"))
+        if product_id not in PRODUCTS:
+            return _json({"error": "Product not found!"})
+        cart = rq.session["cart"]
+        cart[product_id] = cart.get(product_id, 0) + max(1, _int(rq.form.get("quantity")) or 1)
+        return _json({
+            "success": f'Success: You have added <a href="{self._product_url(product_id)}">'
+                       f'{_e(PRODUCTS[product_id]["name"])}</a> to your '
+                       f'<a href="{self._url("checkout/cart")}">shopping cart</a>!',
+            "total": _cart_total(cart),
+        })
+
+    def cart(self, rq):
+        cart = rq.session["cart"]
+        if not cart:
+            body = "<p>Your shopping cart is empty!</p>"
+        else:
+            lines = "".join(
+                f'<tr><td><a href="{self._product_url(i)}">{_e(PRODUCTS[i]["name"])}</a></td><td>{qty}</td>'
+                f'<td>${PRODUCTS[i]["price"] * qty:.2f}</td></tr>' for i, qty in cart.items())
+            total = sum(PRODUCTS[i]["price"] * qty for i, qty in cart.items())
+            body = (f'<div class="table-responsive"><table class="table table-bordered"><tbody>{lines}</tbody>'
+                    f'</table></div><p><strong>Total:</strong> ${total:.2f}</p>')
+        return self._page(rq, "Shopping Cart", f"<h1>Shopping Cart</h1>{body}", [("Shopping Cart", None)])
+
+    # --- account ---
+
+    def register(self, rq):
+        values, errors, warning = rq.form, {}, None
+        if rq.method == "POST":
+            email = values.get("email", "").strip()
+            for key, label, lo, hi in (("firstname", "First Name", 1, 32), ("lastname", "Last Name", 1, 32),
+                                       ("telephone", "Telephone", 3, 32), ("password", "Password", 4, 20)):
+                if not lo <= len(values.get(key, "").strip()) <= hi:
+                    errors[key] = f"{label} must be between {lo} and {hi} characters!"
+            if not _EMAIL.match(email):
+                errors["email"] = "E-Mail Address does not appear to be valid!"
+            elif email.lower() in self.accounts:
+                warning = "Warning: E-Mail Address is already registered!"
+            if values.get("confirm") != values.get("password"):
+                errors["confirm"] = "Password confirmation does not match password!"
+            if not warning and values.get("agree") != "1":
+                warning = "Warning: You must agree to the Privacy Policy!"
+            if not errors and not warning:
+                self._add_account({k: values.get(k, "").strip() for k in
+                                   ("firstname", "lastname", "email", "telephone")},
+                                  password=values["password"], newsletter=values.get("newsletter") == "1")
+                self.registered += 1
+                rq.session["customer"] = email.lower()
+                return _redirect(self._url("account/success"))
+        fields = "".join(_input(key, label, values, errors, kind) for key, label, kind in (
+            ("firstname", "First Name", "text"), ("lastname", "Last Name", "text"), ("email", "E-Mail", "email"),
+            ("telephone", "Telephone", "tel"), ("password", "Password", "password"),
+            ("confirm", "Password Confirm", "password")))
+        content = f"""
+{_alert("danger", warning) if warning else ""}
+<h1>Register Account</h1>
+<p>If you already have an account with us, please login at the <a href="{self._url("account/login")}">login page</a>.</p>
+<form action="{self._url("account/register")}" method="post" class="form-horizontal">
+  {fields}
+  <fieldset><legend>Newsletter</legend>
+    <label><input type="radio" name="newsletter" value="1"> Yes</label>
+    <label><input type="radio" name="newsletter" value="0" checked> No</label>
+  </fieldset>
+  <div class="buttons">
+    <input type="checkbox" name="agree" value="1" id="input-agree">
+    <label for="input-agree">I have read and agree to the Privacy Policy</label>
+    <input type="submit" value="Continue" class="btn btn-primary">
+  </div>
+</form>"""
+        return self._page(rq, "Register Account", content, [("Account", None), ("Register", None)])
+
+    def register_success(self, rq):
+        content = ("<h1>Your Account Has Been Created!</h1>"
+                   "<p>Congratulations! Your new account has been successfully created!</p>"
+                   f'<a href="{self._url("account/account")}" class="btn btn-primary">Continue</a>')
+        return self._page(rq, "Your Account Has Been Created!", content, [("Account", None), ("Success", None)])
+
+    def login(self, rq):
+        warning = None
+        if rq.method == "POST":
+            account = self.accounts.get(rq.form.get("email", "").strip().lower())
+            if account and account["password"] == rq.form.get("password"):
+                rq.session["customer"] = account["email"].lower()
+                return _redirect(self._url("account/account"))
+            warning = "Warning: No match for E-Mail Address and/or Password."
+        content = f"""
+{_alert("danger", warning) if warning else ""}
+<div class="row">
+  <div class="col-sm-6"><h2>New Customer</h2><p>Register Account</p>
+    <a href="{self._url("account/register")}" class="btn btn-primary">Continue</a></div>
+  <div class="col-sm-6"><h2>Returning Customer</h2>
+    <form action="{self._url("account/login")}" method="post">
+      <label for="input-email">E-Mail Address</label>
+      <input type="text" name="email" value="{_e(rq.form.get("email", ""))}" id="input-email" class="form-control">
+      <label for="input-password">Password</label>
+      <input type="password" name="password" value="" id="input-password" class="form-control">
+      <a href="{self._url("account/forgotten")}">Forgotten Password</a>
+      <input type="submit" value="Login" class="btn btn-primary">
+    </form></div>
+</div>"""
+        return self._page(rq, "Account Login", content, [("Account", None), ("Login", None)])
+
+    def logout(self, rq):
+        rq.session.update(customer=None, cart={})
+        content = ("<h1>Account Logout</h1><p>You have been logged off your account.</p>"
+                   f'<a href="{self._url("common/home")}" class="btn btn-primary">Continue</a>')
+        return self._page(rq, "Account Logout", content, [("Account", None), ("Logout", None)])
+
+    def account(self, rq):
+        if not rq.customer:
+            return _redirect(self._url("account/login"))
+        links = "".join(f'<li><a href="{self._url(route)}">{label}</a></li>' for route, label in (
+            ("account/address", "Modify your address book entries"),
+            ("account/newsletter", "Subscribe / unsubscribe to newsletter"),
+            ("product/compare", "Product comparison"), ("account/logout", "Logout")))
+        content = f'<h2>My Account</h2><ul class="list-unstyled">{links}</ul>'
+        return self._page(rq, "My Account", content, [("Account", None)])
+
+    def newsletter(self, rq):
+        account = self.accounts.get(rq.customer)
+        if account is None:
+            return _redirect(self._url("account/login"))
+        if rq.method == "POST":
+            account["newsletter"] = rq.form.get("newsletter") == "1"
+            rq.session["flash"].append(("success", "Success: Your newsletter subscription has been successfully updated!"))
+            return _redirect(self._url("account/account"))
+        yes, no = ("checked", "") if account["newsletter"] else ("", "checked")
+        content = f"""
+<h1>Newsletter Subscription</h1>
+<form action="{self._url("account/newsletter")}" method="post">
+  <label><input type="radio" name="newsletter" value="1" {yes}> Yes</label>
+  <label><input type="radio" name="newsletter" value="0" {no}> No</label>
+  <input type="submit" value="Continue" class="btn btn-primary">
+</form>"""
+        return self._page(rq, "Newsletter Subscription", content, [("Account", None), ("Newsletter", None)])
+
+    def forgotten(self, rq):
+        warning = None
+        if rq.method == "POST":
+            if rq.form.get("email", "").strip().lower() in self.accounts:
+                rq.session["flash"].append(
+                    ("success", "An email with a confirmation link has been sent your email address."))
+                return _redirect(self._url("account/login"))
+            warning = "Warning: The E-Mail Address was not found in our records, please try again!"
+        content = f"""
+{_alert("danger", warning) if warning else ""}
+<h1>Forgot Your Password?</h1>
+<form action="{self._url("account/forgotten")}" method="post">
+  <label for="input-email">E-Mail Address</label>
+  <input type="text" name="email" value="" id="input-email" class="form-control">
+  <input type="submit" value="Continue" class="btn btn-primary">
+</form>"""
+        return self._page(rq, "Forgot Your Password?", content, [("Account", None), ("Forgotten Password", None)])
+
+    # --- address book ---
+
+    def addresses(self, rq):
+        account = self.accounts.get(rq.customer)
+        if account is None:
+            return _redirect(self._url("account/login"))
+        rows = "".join(
+            f'<tr><td class="text-left">{_e(_address_text(a))}</td><td class="text-right">'
+            f'<a href="{self._url("account/address/delete", address_id=address_id)}" class="btn btn-danger">Delete</a>'
+            "</td></tr>" for address_id, a in account["addresses"].items())
+        table = (f'<div class="table-responsive"><table class="table table-bordered table-hover">'
+                 f'<tbody>{rows}</tbody></table></div>' if rows else "<p>You have no addresses in your account.</p>")
+        content = (f"<h2>Address Book Entries</h2>{table}"
+                   f'<a href="{self._url("account/address/add")}" class="btn btn-primary">New Address</a>')
+        return self._page(rq, "Address Book", content, [("Account", None), ("Address Book", None)])
+
+    def address_add(self, rq):
+        account = self.accounts.get(rq.customer)
+        if account is None:
+            return _redirect(self._url("account/login"))
+        values, errors = rq.form, {}
+        if rq.method == "POST":
+            # like the live store: lengths only, any characters are accepted
+            for key, label, lo, hi in (("firstname", "First Name", 1, 32), ("lastname", "Last Name", 1, 32),
+                                       ("address_1", "Address", 3, 128), ("city", "City", 2, 128),
+                                       ("postcode", "Postcode", 2, 10)):
+                if not lo <= len(values.get(key, "").strip()) <= hi:
+                    errors[key] = f"{label} must be between {lo} and {hi} characters!"
+            country = _int(values.get("country_id"))
+            if country not in COUNTRIES:
+                errors["country_id"] = "Please select a country!"
+            elif _int(values.get("zone_id")) not in COUNTRIES[country][1]:
+                errors["zone_id"] = "Please select a region / state!"
+            if not errors:
+                self._ids["address"] += 1
+                address_id = self._ids["address"]
+                account["addresses"][address_id] = {k: values.get(k, "").strip() for k in (
+                    "firstname", "lastname", "company", "address_1", "address_2", "city", "postcode")}
+                account["addresses"][address_id].update(country=COUNTRIES[country][0],
+                                                        zone=COUNTRIES[country][1][_int(values["zone_id"])])
+                if values.get("default") == "1" or account["address_id"] is None:
+                    account["address_id"] = address_id
+                rq.session["flash"].append(("success", "Your address has been successfully added"))
+                return _redirect(self._url("account/address"))
+        fields = "".join(_input(key, label, values, errors) for key, label in (
+            ("firstname", "First Name"), ("lastname", "Last Name"), ("company", "Company"),
+            ("address_1", "Address 1"), ("address_2", "Address 2"), ("city", "City"), ("postcode", "Post Code")))
+        selected = _int(values.get("country_id")) or 222
+        countries = "".join(f'<option value="{cid}"{" selected" if cid == selected else ""}>{_e(name)}</option>'
+                            for cid, (name, _) in COUNTRIES.items())
+        default_yes = "checked" if values.get("default") == "1" else ""
+        content = f"""
+<h1>Add Address</h1>
+<form action="{self._url("account/address/add")}" method="post" class="form-horizontal">
+  {fields}
+  <div class="form-group required">
+    <label for="input-country">Country</label>
+    <select name="country_id" id="input-country" class="form-control" onchange="epZones(this)">
+      <option value="">--- Please Select ---</option>{countries}</select>
+    {_error(errors, "country_id")}
+  </div>
+  <div class="form-group required">
+    <label for="input-zone">Region / State</label>
+    <select name="zone_id" id="input-zone" class="form-control" data-zone="{_e(values.get("zone_id", ""))}">
+      <option value="">--- Please Select ---</option></select>
+    {_error(errors, "zone_id")}
+  </div>
+  <div class="form-group">
+    <label>Default Address</label>
+    <label><input type="radio" name="default" value="1" {default_yes}> Yes</label>
+    <label><input type="radio" name="default" value="0" {"" if default_yes else "checked"}> No</label>
+  </div>
+  <input type="submit" value="Continue" class="btn btn-primary">
+</form>"""
+        return self._page(rq, "Add Address", content, [("Account", None), ("Add Address", None)])
+
+    def address_delete(self, rq):
+        account = self.accounts.get(rq.customer)
+        if account is None:
+            return _redirect(self._url("account/login"))
+        address_id = _int(rq.query.get("address_id"))
+        if address_id == account["address_id"]:
+            rq.session["flash"].append(("danger", "Warning: You can not delete your default address!"))
+        elif account["addresses"].pop(address_id, None) is not None:
+            rq.session["flash"].append(("success", "Your address has been successfully deleted"))
+        return _redirect(self._url("account/address"))
+
+    def zones(self, rq):
+        country = _int(rq.query.get("country_id"))
+        name, zones = COUNTRIES.get(country, ("", {}))
+        return _json({"country_id": country, "name": name,
+                      "zone": [{"zone_id": zid, "name": zname} for zid, zname in zones.items()]})
+
+    # --- contact and blog ---
+
+    def contact(self, rq):
+        values, errors = rq.form, {}
+        if rq.method == "POST":
+            if not 3 <= len(values.get("name", "").strip()) <= 32:
+                errors["name"] = "Name must be between 3 and 32 characters!"
+            if not _EMAIL.match(values.get("email", "").strip()):
+                errors["email"] = "E-Mail Address does not appear to be valid!"
+            if not 10 <= len(values.get("enquiry", "").strip()) <= 3000:
+                errors["enquiry"] = "Enquiry must be between 10 and 3000 characters!"
+            if not errors:
+                self.enquiries.append({k: values[k].strip() for k in ("name", "email", "enquiry")})
+                return _redirect(self._url("information/contact/success"))
+        content = f"""
+<h1>Contact Us</h1>
+<address>Your Store, Address 1</address>
+<form action="{self._url("information/contact")}" method="post" class="form-horizontal">
+  {_input("name", "Your Name", values, errors)}
+  {_input("email", "E-Mail Address", values, errors)}
+  <div class="form-group required">
+    <label for="input-enquiry">Enquiry</label>
+    <textarea name="enquiry" rows="10" id="input-enquiry" class="form-control">{_e(values.get("enquiry", ""))}</textarea>
+    {_error(errors, "enquiry")}
+  </div>
+  <input class="btn btn-primary" type="submit" value="Submit">
+</form>"""
+        return self._page(rq, "Contact Us", content, [("Contact Us", None)])
+
+    def contact_success(self, rq):
+        content = ("<h1>Contact Us</h1><p>Your enquiry has been successfully sent to the store owner!</p>"
+                   f'<a href="{self._url("common/home")}" class="btn btn-primary">Continue</a>')
+        return self._page(rq, "Contact Us", content, [("Contact Us", None)])
+
+    def article(self, rq):
+        article_id = _int(rq.query.get("article_id"))
+        if article_id not in ARTICLES:
+            return self._not_found(rq, "Article not found!")
+        title = ARTICLES[article_id]
+        approved = [c for c in self.comments if c["article_id"] == article_id and c["approved"]]
+        content = f"""
+<h1 class="article-title">{_e(title)}</h1>
+<div class="description"><p>{_e(title)}: notes from the store's blog.</p></div>
+<div class="comments">{"".join(f"<p><strong>{_e(c['name'])}</strong> {_e(c['text'])}</p>" for c in approved)}</div>
+<div id="entry_210912" data-id="210912" class="content-comment-form">
+  <h4>Write a comment</h4>
+  <form id="form-comment" data-article="{article_id}">
+    <label for="input-name">Your Name</label>
+    <input type="text" name="name" id="input-name" class="form-control">
+    <label for="input-email">Email</label>
+    <input type="email" name="email" id="input-email" class="form-control">
+    <label for="input-comment">Comment</label>
+    <textarea name="text" rows="5" id="input-comment" class="form-control"></textarea>
+    <button type="button" id="button-comment" class="btn btn-primary">Post comment</button>
+  </form>
+</div>"""
+        return self._page(rq, title, content, [("Blog", None), (title, None)])
+
+    def comment(self, rq):
+        name, email, text = (rq.form.get(k, "").strip() for k in ("name", "email", "text"))
+        if not 3 <= len(name) <= 25:
+            return _json({"error": "Warning: Comment Name must be between 3 and 25 characters!"})
+        if not _EMAIL.match(email):
+            return _json({"error": "Warning: E-Mail Address does not appear to be valid!"})
+        if not 3 <= len(text) <= 1000:
+            return _json({"error": "Warning: Comment Text must be between 3 and 1000 characters!"})
+        self.comments.append({"article_id": _int(rq.query.get("article_id")), "name": name, "email": email,
+                              "text": text, "approved": False})
+        return _json({"success": COMMENT_SUCCESS})
+
+    # --- rendering ---
+
+    def _page(self, rq, title, content, trail=()):
+        crumbs = [("Home", self._url("common/home"))] + list(trail)
+        breadcrumb = "".join(f'<li><a href="{url or "#"}">{_e(name)}</a></li>' for name, url in crumbs)
+        flash = "".join(_alert(kind, text) for kind, text in rq.session["flash"])
+        rq.session["flash"] = []
+        if rq.customer:
+            account_links = (f'<a href="{self._url("account/account")}"><span>My account</span></a> '
+                             f'<a href="{self._url("account/logout")}"><span>Logout</span></a>')
+        else:
+            account_links = (f'<a href="{self._url("account/login")}"><span>Login</span></a> '
+                             f'<a href="{self._url("account/register")}"><span>Register</span></a>')
+        categories = "".join(
+            f'<li><a href="{self._url("product/category", path=cid)}">{_e(name)}</a></li>'
+            for cid, name in CATEGORIES.items())
+        categories += "".join(f'<li><a href="{self._url("common/home")}">{_e(name)}</a></li>'
+                              for name in BROKEN_CATEGORIES)
+        laptops = "".join(f'<li><a href="{self._url("product/manufacturer/info", manufacturer_id=mid)}">{_e(name)}</a></li>'
+                          for mid, name in MANUFACTURERS.items())
+        page = f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="UTF-8"><title>{_e(title)}</title><script>{_SCRIPT}</script></head>
+<body>
+<header>
+  <div id="logo"><a href="{self._url("common/home")}">Your Store</a></div>
+  <form id="search" action="{self.base_url}index.php" method="get">
+    <input type="hidden" name="route" value="product/search">
+    <input type="text" name="search" value="" placeholder="Search For Products" class="form-control">
+    <button type="submit" class="btn btn-default">Search</button>
+  </form>
+  <div id="entry_217823"><a href="{self._url("product/compare")}" aria-label="Compare"
+     id="compare-total">Product Compare ({len(rq.session["compare"])})</a></div>
+  <div id="account">{account_links}</div>
+  <a href="{self._url("checkout/cart")}" id="cart-total">{_cart_total(rq.session["cart"])}</a>
+</header>
+<nav id="menu" class="navbar">
+  <ul class="navbar-nav">
+    <li><a href="#" id="shop-by-category">Shop by Category</a></li>
+    <li><a href="{self._url("product/category", path=18)}">Laptops &amp; Notebooks</a>
+      <ul class="mega-menu">{laptops}</ul></li>
+    <li><a href="{self._url("extension/maza/blog/article", article_id=37)}">Blog</a></li>
+    <li><a href="{self._url("information/contact")}">Contact Us</a></li>
+  </ul>
+</nav>
+<div id="widget-navbar-217834" style="display: none"><ul class="list-unstyled">{categories}</ul></div>
+<ul class="breadcrumb">{breadcrumb}</ul>
+<div id="content"><div id="notification">{flash}</div>{content}</div>
+<footer><p>Local stand-in store</p></footer>
+</body></html>"""
+        return 200, [("Content-Type", "text/html; charset=utf-8")], page.encode("utf-8")
+
+    def _not_found(self, rq, message="The page you requested cannot be found."):
+        status, headers, body = self._page(rq, "Page not found!", f"<h1>Page not found!</h1><p>{_e(message)}</p>")
+        return 404, headers, body
+
+    def _thumbs(self, product_ids):
+        out = []
+        for i in product_ids:
+            p = PRODUCTS[i]
+            out.append(f"""
+<div class="product-layout col-sm-3"><div class="product-thumb">
+  <div class="image"><a href="{self._product_url(i)}" title="{_e(p["name"])}"></a></div>
+  <div class="caption"><h4><a href="{self._product_url(i)}">{_e(p["name"])}</a></h4>
+    <p class="price">${p["price"]:.2f}</p></div>
+  <div class="button-group">
+    <button type="button" class="btn btn-cart" onclick="cart.add('{i}');">Add to Cart</button>
+    <button type="button" title="Compare this Product" onclick="compare.add('{i}');"><i class="fa fa-exchange"></i></button>
+  </div>
+</div></div>""")
+        return "".join(out)
+
+    def _in_category(self, category):
+        return [i for i, p in PRODUCTS.items() if p["category"] == category]
+
+    def _url(self, route, **params):
+        query = f"&{urlencode(params)}" if params else ""
+        return _e(f"{self.base_url}index.php?route={route}{query}")
+
+    def _product_url(self, product_id):
+        return self._url("product/product", product_id=product_id)
+
+    def _add_account(self, details, password=None, newsletter=False):
+        self._ids["customer"] += 1
+        account = dict(details, password=password or details["password"], newsletter=newsletter,
+                       customer_id=self._ids["customer"], addresses={}, address_id=None)
+        self.accounts[account["email"].lower()] = account
+        return account
+
+
+class _Request:
+    def __init__(self, method, route, query, form, session):
+        self.method = method
+        self.route = route
+        self.query = query
+        self.form = form if method == "POST" else {}
+        self.session = session
+
+    @property
+    def customer(self):
+        return self.session["customer"]
+
+
+_ROUTES = {
+    "common/home": StandIn.home,
+    "product/category": StandIn.category,
+    "product/manufacturer/info": StandIn.manufacturer,
+    "product/search": StandIn.search,
+    "product/product": StandIn.product,
+    "product/product/review": StandIn.review,
+    "product/compare": StandIn.compare,
+    "product/compare/add": StandIn.compare_add,
+    "checkout/cart": StandIn.cart,
+    "checkout/cart/add": StandIn.cart_add,
+    "account/register": StandIn.register,
+    "account/success": StandIn.register_success,
+    "account/login": StandIn.login,
+    "account/logout": StandIn.logout,
+    "account/account": StandIn.account,
+    "account/newsletter": StandIn.newsletter,
+    "account/forgotten": StandIn.forgotten,
+    "account/address": StandIn.addresses,
+    "account/address/add": StandIn.address_add,
+    "account/address/delete": StandIn.address_delete,
+    "localisation/country": StandIn.zones,
+    "information/contact": StandIn.contact,
+    "information/contact/success": StandIn.contact_success,
+    "extension/maza/blog/article": StandIn.article,
+    "extension/maza/blog/comment/write": StandIn.comment,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _serve(self):
+        self.server.stand_in.handle(self)
+
+    do_GET = do_POST = do_HEAD = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _e(text):
+    return html.escape(str(text))
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _json(data):
+    return 200, [("Content-Type", "application/json")], json.dumps(data).encode("utf-8")
+
+
+def _redirect(url):
+    return 302, [("Location", html.unescape(url))], b""
+
+
+def _alert(kind, text):
+    icon = "fa-check-circle" if kind == "success" else "fa-exclamation-circle"
+    return (f'<div class="alert alert-{kind} alert-dismissible"><i class="fa {icon}"></i> {_e(text)}'
+            ' <button type="button" class="close" onclick="this.parentNode.remove()">&times;</button></div>')
+
+
+def _error(errors, key):
+    return f'<div class="text-danger">{_e(errors[key])}</div>' if key in errors else ""
+
+
+def _input(key, label, values, errors, kind="text"):
+    value = "" if kind == "password" else _e(values.get(key, ""))
+    return (f'<div class="form-group"><label for="input-{key}">{label}</label>'
+            f'<input type="{kind}" name="{key}" value="{value}" id="input-{key}" class="form-control">'
+            f"{_error(errors, key)}</div>")
+
+
+def _cart_total(cart):
+    count = sum(cart.values())
+    total = sum(PRODUCTS[i]["price"] * qty for i, qty in cart.items())
+    return f"{count} item(s) - ${total:.2f}"
+
+
+def _address_text(address):
+    lines = [f"{address['firstname']} {address['lastname']}", address["company"], address["address_1"],
+             address["address_2"], f"{address['city']} {address['postcode']}", address["zone"], address["country"]]
+    return ", ".join(line for line in lines if line.strip())
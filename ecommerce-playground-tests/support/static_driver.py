@@ -0,0 +1,357 @@
+# support/static_driver.py
+"""
+An HTTP-only stand-in for the WebDriver, for checks that only read
+server-rendered HTML.
+
+StaticDriver fetches pages over a pooled requests session and parses them
+with lxml; it offers the part of the WebDriver API page objects use for
+reading (get, current_url, title, find_element(s), element text and
+attributes, link clicks), and the wait engine and support.extract evaluate
+their conditions and specs against the parsed document instead of sending
+scripts. Anything that needs a real browser (scripts, typing, screenshots)
+raises StaticBackendError.
+
+There is no CSS engine, so "visible" means not hidden by a `hidden`
+attribute or an inline display:none / visibility:hidden on the element or
+an ancestor; text hidden by stylesheets still counts.
+"""
+import functools
+from urllib.parse import urljoin
+import requests
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36 ecommerce-playground-tests/static"
+)
+REQUEST_TIMEOUT = 20
+
+# one connection pool per process, shared by every StaticDriver (each keeps its own cookies)
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=2)
+
+_NON_RENDERED = {"script", "style", "noscript", "template", "head", "title", "meta", "link"}
+# elements that start a new line in rendered text, approximating innerText
+_BLOCK = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+          "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+          "ol", "p", "pre", "section", "table", "tr", "ul"}
+
+
+def http_session():
+    """
+    A requests session on the shared connection pool, with its own cookie jar.
+    Never close() it: that would close the shared pool for every other session.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("https://", _ADAPTER)
+    session.mount("http://", _ADAPTER)
+    return session
+
+
+class StaticBackendError(WebDriverException):
+    """The operation needs a real browser; drop the `static` marker for this test."""
+
+
+class StaticElement:
+    """Read-only WebElement look-alike over an lxml node."""
+
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, StaticElement) and other._node is self._node
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+    @property
+    def tag_name(self):
+        return self._node.tag.lower()
+
+    @property
+    def text(self):
+        return _visible_text(self._node)
+
+    def get_attribute(self, name):
+        value = self._node.get(name)
+        if value is not None and name in ("href", "src", "action"):
+            return urljoin(self._driver.current_url, value)
+        if name == "value" and value is None and self.tag_name == "textarea":
+            return self._node.text_content()
+        return value
+
+    get_dom_attribute = get_attribute
+
+    def is_displayed(self):
+        return _is_displayed(self._node)
+
+    def is_enabled(self):
+        return self._node.get("disabled") is None
+
+    def find_element(self, by=By.ID, value=None):
+        return _first(self.find_elements(by, value), by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return [StaticElement(self._driver, n) for n in _find(self._node, by, value, scoped=True)]
+
+    def click(self):
+        """Follow a link; everything else needs a browser."""
+        href = self._node.get("href") if self.tag_name == "a" else None
+        if not href or href.startswith(("#", "javascript:")):
+            raise StaticBackendError(f"Cannot click <{self.tag_name}> without a browser")
+        self._driver.get(urljoin(self._driver.current_url, href))
+
+    def send_keys(self, *value):
+        raise StaticBackendError("Typing needs a browser")
+
+    def clear(self):
+        raise StaticBackendError("Editing fields needs a browser")
+
+    def __repr__(self):
+        return f"<StaticElement {self.tag_name}>"
+
+
+class StaticDriver:
+    """See the module docstring. Use via the `driver` fixture on tests marked `static`."""
+
+    is_static = True
+
+    def __init__(self, timeout: float = REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.session = http_session()
+        self.current_url = "about:blank"
+        self.status_code = None
+        self.page_source = "<html><head></head><body></body></html>"
+        self._doc = lxml_html.document_fromstring(self.page_source)
+        self.pages_loaded = 0
+
+    def get(self, url: str):
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise WebDriverException(f"GET {url} failed: {e}") from e
+        self.current_url = resp.url
+        self.status_code = resp.status_code
+        self.page_source = resp.text
+        self._doc = lxml_html.document_fromstring(resp.content or b"<html></html>", base_url=resp.url)
+        self.pages_loaded += 1
+
+    def refresh(self):
+        self.get(self.current_url)
+
+    @property
+    def title(self):
+        return (self._doc.findtext(".//title") or "").strip()
+
+    def find_element(self, by=By.ID, value=None):
+        return _first(self.find_elements(by, value), by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return [StaticElement(self, n) for n in _find(self._doc, by, value, scoped=False)]
+
+    # --- hooks used by support.waits.BrowserWait and support.extract ---
+
+    def evaluate_condition(self, c):
+        """Python twin of CHECK_JS's epCheck: the condition's value, or None if it does not hold."""
+        kind = c["type"]
+        if kind in ("present", "visible", "clickable", "text"):
+            els = self._lookup(c["locator"], c.get("root"))
+            if kind in ("visible", "clickable"):
+                els = [e for e in els if e.is_displayed()]
+            if kind == "clickable":
+                els = [e for e in els if e.is_enabled()]
+            if kind == "text":
+                els = [e for e in els if c["text"] in e.text]
+            return els or None
+        if kind == "contains":
+            def norm(s):
+                s = " ".join(s.split())
+                return s.lower() if c["ci"] else s
+            want = norm(c["text"])
+            scopes = [e._node for e in self._lookup(c["scope"])] if c["scope"] else [self._doc]
+            return True if any(want in norm(n.text_content()) for n in scopes) else None
+        if kind == "url_changes":
+            return self.current_url if self.current_url != c["url"] else None
+        if kind == "url_contains":
+            return self.current_url if c["text"] in self.current_url else None
+        if kind in ("ready", "idle"):
+            return True
+        if kind == "any":
+            for i, sub in enumerate(c["conditions"]):
+                value = self.evaluate_condition(sub)
+                if value is not None:
+                    return {"index": i, "value": value}
+            return None
+        if kind == "all":
+            out = []
+            for sub in c["conditions"]:
+                value = self.evaluate_condition(sub)
+                if value is None:
+                    return None
+                out.append(value)
+            return out
+        raise InvalidSelectorException(f"Unknown wait condition: {kind}")
+
+    def evaluate_extract(self, spec, root=None):
+        """Python twin of EXTRACT_JS."""
+        out = {}
+        for key, q in spec.items():
+            scope = root
+            if q["within"]:
+                found = self._lookup(q["within"], root)
+                scope = found[0] if found else None
+            els = []
+            if q["within"] is None or scope is not None:
+                for loc in q["locators"]:
+                    els = self._lookup(loc, scope)
+                    if q["visibleOnly"]:
+                        els = [e for e in els if e.is_displayed()]
+                    if els:
+                        break
+            if q["limit"]:
+                els = els[:q["limit"]]
+            if isinstance(q["fields"], str):
+                rows = [_field(e, q["fields"]) for e in els]
+            else:
+                rows = [{f: _field(e, f) for f in q["fields"]} for e in els]
+            out[key] = (rows[0] if rows else None) if q["first"] else rows
+        return out
+
+    # --- the rest of the WebDriver surface ---
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def delete_all_cookies(self):
+        self.session.cookies.clear()
+
+    def execute_script(self, script, *args):
+        raise StaticBackendError("JavaScript needs a browser")
+
+    execute_async_script = execute_script
+
+    def save_screenshot(self, filename=None):
+        raise StaticBackendError("Screenshots need a browser")
+
+    get_screenshot_as_base64 = get_screenshot_as_png = save_screenshot
+
+    def quit(self):
+        # Session.close() would close the adapter every http_session() shares; only drop this driver's state
+        self.session.cookies.clear()
+        self.current_url = "about:blank"
+        self.status_code = None
+
+    close = quit
+
+    def _lookup(self, locator, root=None):
+        by, value = locator
+        return root.find_elements(by, value) if root is not None else self.find_elements(by, value)
+
+
+@functools.lru_cache(maxsize=512)
+def _css(selector):
+    try:
+        return CSSSelector(selector, translator="html")
+    except Exception as e:
+        raise InvalidSelectorException(f"Invalid CSS selector {selector!r}: {e}") from e
+
+
+def _find(node, by, value, scoped):
+    if by == By.CSS_SELECTOR:
+        found = _css(value)(node)
+    elif by == By.ID:
+        found = node.xpath(".//*[@id=$v]", v=value)
+    elif by == By.NAME:
+        found = node.xpath(".//*[@name=$v]", v=value)
+    elif by == By.CLASS_NAME:
+        found = node.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), $v)]", v=f" {value} ")
+    elif by == By.TAG_NAME:
+        found = node.xpath(f".//{value}") if value.isidentifier() else _css(value)(node)
+    elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        links = node.xpath(".//a")
+        if by == By.LINK_TEXT:
+            found = [a for a in links if _visible_text(a) == value.strip()]
+        else:
+            found = [a for a in links if value in _visible_text(a)]
+    elif by == By.XPATH:
+        try:
+            found = node.xpath(value)
+        except Exception as e:
+            raise InvalidSelectorException(f"Invalid XPath {value!r}: {e}") from e
+        found = [n for n in found if isinstance(n, lxml_html.HtmlElement)]
+    else:
+        raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+    # like querySelectorAll on an element, never return the element itself
+    return [n for n in found if n is not node] if scoped else found
+
+
+def _first(elements, by, value):
+    if not elements:
+        raise NoSuchElementException(f"No element matched {by}={value!r}")
+    return elements[0]
+
+
+def _is_hidden(node):
+    if node.get("hidden") is not None or node.get("type") == "hidden":
+        return True
+    style = (node.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def _is_displayed(node):
+    n = node
+    while n is not None:
+        if not isinstance(n.tag, str) or n.tag.lower() in _NON_RENDERED or _is_hidden(n):
+            return False
+        n = n.getparent()
+    return True
+
+
+def _visible_text(node):
+    if not _is_displayed(node):
+        return ""
+    parts = []
+
+    def walk(n):
+        if n.text:
+            parts.append(n.text)
+        for child in n:
+            tag = child.tag.lower() if isinstance(child.tag, str) else None
+            if tag and tag not in _NON_RENDERED and not _is_hidden(child):
+                block = tag in _BLOCK
+                if block:
+                    parts.append("\n")
+                walk(child)
+                if block:
+                    parts.append("\n")
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _field(el, name):
+    if name == "text":
+        return el.text
+    if name == "href":
+        return el.get_attribute("href") or ""
+    if name == "value":
+        return el.get_attribute("value")
+    if name == "html":
+        node = el._node
+        return (node.text or "") + "".join(lxml_html.tostring(c, encoding="unicode") for c in node)
+    if name == "tag":
+        return el.tag_name
+    if name == "visible":
+        return el.is_displayed()
+    return el.get_attribute(name[1:])
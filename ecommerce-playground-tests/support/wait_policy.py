@@ -0,0 +1,114 @@
+# support/wait_policy.py
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.command import Command
+
+FIND_COMMANDS = (
+    Command.FIND_ELEMENT,
+    Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT,
+    Command.FIND_CHILD_ELEMENTS,
+)
+
+
+class WaitPolicy:
+    """
+    Owns a driver's implicit wait and accounts for the time it costs.
+
+    Tests keep the sticky implicit wait for their own find_element calls, but
+    probe-style lookups (cookie banners, optional widgets, "is there any ...")
+    run inside `probing()` with the implicit wait at zero, so an absent element
+    costs one round trip instead of the full wait. Explicit waits belong in
+    support.waits.
+
+    Every lookup that comes back empty while the implicit wait is non-zero is
+    timed; that is the dead time reported per test as "lost to implicit waits".
+    Installing hooks driver.execute, so lookups made through WebElements and
+    implicitly_wait() calls from test code are seen too.
+    """
+
+    def __init__(self, driver, implicit_wait: float = 0):
+        self.driver = driver
+        self.implicit_wait = implicit_wait
+        self.current = implicit_wait
+        self.lost_seconds = 0.0
+        self.misses = 0
+        self._execute = driver.execute
+
+    @classmethod
+    def install(cls, driver, implicit_wait: float = None) -> "WaitPolicy":
+        """
+        Attach a policy to the driver once and apply `implicit_wait` as its
+        default; with None the driver's current implicit wait is adopted as is.
+        """
+        policy = getattr(driver, "_ep_wait_policy", None)
+        if policy is None:
+            current = driver.timeouts.implicit_wait if implicit_wait is None else implicit_wait
+            policy = cls(driver, current)
+            driver.execute = policy._tracked_execute
+            driver._ep_wait_policy = policy
+        if implicit_wait is not None:
+            policy.implicit_wait = implicit_wait
+            policy.apply()
+        return policy
+
+    def apply(self):
+        """(Re)set the driver to the policy's default implicit wait."""
+        self._set(self.implicit_wait)
+
+    @contextmanager
+    def probing(self):
+        """Run lookups that are expected to miss with the implicit wait at zero."""
+        previous = self.current
+        if previous:
+            self._set(0)
+        try:
+            yield self
+        finally:
+            if previous:
+                self._set(previous)
+
+    def reset_stats(self):
+        self.lost_seconds = 0.0
+        self.misses = 0
+
+    def stats(self):
+        return {"implicit_lost_s": round(self.lost_seconds, 3), "implicit_misses": self.misses}
+
+    def _set(self, seconds: float):
+        self.driver.implicitly_wait(seconds)
+
+    def _tracked_execute(self, driver_command, params=None):
+        if driver_command == Command.SET_TIMEOUTS and params and "implicit" in params:
+            response = self._execute(driver_command, params)
+            self.current = params["implicit"] / 1000.0
+            return response
+        if driver_command not in FIND_COMMANDS or not self.current:
+            return self._execute(driver_command, params)
+
+        start = time.perf_counter()
+        try:
+            response = self._execute(driver_command, params)
+        except NoSuchElementException:
+            self._miss(start)
+            raise
+        if not (response or {}).get("value"):
+            self._miss(start)
+        return response
+
+    def _miss(self, start: float):
+        self.lost_seconds += time.perf_counter() - start
+        self.misses += 1
+
+
+@contextmanager
+def probing(driver):
+    """`with probing(driver): ...` — zero implicit wait for lookups that usually miss."""
+    if getattr(driver, "is_static", False):
+        # StaticDriver lookups never wait
+        yield driver
+        return
+    policy = getattr(driver, "_ep_wait_policy", None) or WaitPolicy.install(driver)
+    with policy.probing():
+        yield driver
@@ -0,0 +1,257 @@
+# support/waits.py
+"""
+Event-driven waits evaluated inside the page.
+
+A condition is a small JSON spec built with the helpers below. BrowserWait
+sends it to the browser in a single async script that re-checks it whenever a
+MutationObserver or page event fires and reports back the moment it holds,
+instead of polling over HTTP every 500 ms like WebDriverWait.
+"""
+import time
+from selenium.common.exceptions import InvalidSelectorException, JavascriptException, TimeoutException
+from .idle_tracker import IDLE_TRACKER_JS
+from .locator_cache import FINGERPRINT_JS, locator_cache
+from .locators import FIND_JS, ChainMatch, as_locator
+
+
+def present(locator, root=None):
+    return {"type": "present", "locator": as_locator(locator), "root": root}
+
+
+def visible(locator, root=None):
+    return {"type": "visible", "locator": as_locator(locator), "root": root}
+
+
+def clickable(locator, root=None):
+    return {"type": "clickable", "locator": as_locator(locator), "root": root}
+
+
+def text_present(locator, text, root=None):
+    return {"type": "text", "locator": as_locator(locator), "text": text, "root": root}
+
+
+def contains_text(text, scope=None, case_insensitive: bool = True):
+    """
+    Some element matched by `scope` (a CSS selector or (By, value); default the
+    whole document) has `text` in its text content, whitespace collapsed.
+    Hidden text counts, as it did when tests searched page_source.
+    """
+    if isinstance(scope, str):
+        scope = ("css selector", scope)
+    return {"type": "contains", "text": text, "scope": as_locator(scope) if scope else None,
+            "ci": case_insensitive}
+
+
+def url_changes(url):
+    return {"type": "url_changes", "url": url}
+
+
+def url_contains(fragment):
+    return {"type": "url_contains", "text": fragment}
+
+
+def document_ready():
+    return {"type": "ready"}
+
+
+def idle(quiet_ms: int = 100):
+    """
+    The page is loaded and quiescent: no XHR/fetch in flight, no short timers
+    or jQuery animations pending, and nothing changed for `quiet_ms`.
+    """
+    return {"type": "idle", "quiet": quiet_ms}
+
+
+def first_of(chain, root=None):
+    """Condition for a LocatorChain: resolves with the earliest candidate that satisfies it."""
+    return any_of(*({"type": chain.require, "locator": as_locator(loc), "root": root} for loc in chain))
+
+
+def any_of(*conditions):
+    """Resolves with {"index": i, "value": ...} for the first condition (in order) that holds."""
+    return {"type": "any", "conditions": list(conditions)}
+
+
+def all_of(*conditions):
+    """Resolves with the list of every condition's value once all of them hold."""
+    return {"type": "all", "conditions": list(conditions)}
+
+
+CHECK_JS = r"""
+function epCheck(c) {
+  switch (c.type) {
+    case 'present': { const els = epFind(c.locator, c.root); return els.length ? els : null; }
+    case 'visible': { const els = epFind(c.locator, c.root).filter(epVisible); return els.length ? els : null; }
+    case 'clickable': {
+      const els = epFind(c.locator, c.root).filter(e => epVisible(e) && epEnabled(e));
+      return els.length ? els : null;
+    }
+    case 'text': {
+      const els = epFind(c.locator, c.root).filter(e => (e.innerText || e.textContent || '').includes(c.text));
+      return els.length ? els : null;
+    }
+    case 'contains': {
+      const norm = s => { s = (s || '').replace(/\s+/g, ' '); return c.ci ? s.toLowerCase() : s; };
+      const want = norm(c.text).trim();
+      const scopes = c.scope ? epFind(c.scope) : [document.documentElement];
+      return scopes.some(el => norm(el.textContent).includes(want)) ? true : null;
+    }
+    case 'url_changes': return location.href !== c.url ? location.href : null;
+    case 'url_contains': return location.href.includes(c.text) ? location.href : null;
+    case 'ready': return document.readyState === 'complete' ? true : null;
+    case 'idle': {
+      if (document.readyState !== 'complete') return null;
+      const s = epInstallIdle();
+      if (s.unloading || s.xhr > 0 || s.fetch > 0 || s.timers > 0) return null;
+      const $ = window.jQuery;
+      if ($ && ($.active > 0 || ($.timers && $.timers.length))) return null;
+      return performance.now() - s.last >= c.quiet ? true : null;
+    }
+    case 'any':
+      for (let i = 0; i < c.conditions.length; i++) {
+        const r = epCheck(c.conditions[i]);
+        if (r !== null) return {index: i, value: r};
+      }
+      return null;
+    case 'all': {
+      const out = [];
+      for (const sub of c.conditions) {
+        const r = epCheck(sub);
+        if (r === null) return null;
+        out.push(r);
+      }
+      return out;
+    }
+  }
+  throw new SyntaxError('Unknown wait condition: ' + c.type);
+}
+"""
+
+WAIT_JS = FIND_JS + CHECK_JS + FINGERPRINT_JS + IDLE_TRACKER_JS + r"""
+const cond = arguments[0], timeoutMs = arguments[1], withFingerprint = arguments[2];
+const done = arguments[arguments.length - 1];
+const events = ['load', 'readystatechange', 'hashchange', 'popstate', 'transitionend', 'animationend', 'ep-idle-change'];
+const rawSetTimeout = (window.__epIdle && window.__epIdle.setTimeout) || window.setTimeout;
+const rawClearTimeout = (window.__epIdle && window.__epIdle.clearTimeout) || window.clearTimeout;
+let finished = false, observer = null, timer = null, poll = null;
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  rawClearTimeout(timer);
+  clearInterval(poll);
+  events.forEach(e => { window.removeEventListener(e, check, true); document.removeEventListener(e, check, true); });
+  if (result.ok && withFingerprint) result.fingerprint = epFingerprint();
+  done(result);
+}
+function check() {
+  try {
+    const r = epCheck(cond);
+    if (r !== null) finish({ok: true, value: r});
+  } catch (e) {
+    if (e.name === 'SyntaxError') finish({ok: false, error: String(e.message || e)});
+  }
+}
+check();
+if (!finished) {
+  observer = new MutationObserver(check);
+  observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+  events.forEach(e => { window.addEventListener(e, check, true); document.addEventListener(e, check, true); });
+  // safety net for changes no event reports (e.g. a stylesheet arriving)
+  poll = setInterval(check, 250);
+  timer = rawSetTimeout(() => finish({ok: false}), timeoutMs);
+}
+"""
+
+
+class BrowserWait:
+    """Drop-in for WebDriverWait.until() that takes the condition specs above."""
+
+    def __init__(self, driver, timeout: float = 10):
+        self.driver = driver
+        self.timeout = timeout
+
+    def until(self, condition, timeout=None, message: str = ""):
+        """
+        Return the condition's value as soon as it holds. The condition is
+        always checked at least once, so timeout=0 is a single probe.
+        """
+        return self._run(condition, timeout, message)["value"]
+
+    def first(self, chain, timeout=None, root=None, cache_key: str = None) -> ChainMatch:
+        """
+        Resolve a LocatorChain under one shared timeout and report which candidate matched.
+
+        With a `cache_key` the candidate that won last time (on a page with the
+        same DOM fingerprint) is tried first, and the winner is recorded.
+        """
+        # a static document has no template to drift, and no fingerprint to key on
+        cache = locator_cache() if cache_key and not getattr(self.driver, "is_static", False) else None
+        ordered = chain
+        if cache:
+            current = self.driver.execute_script(FINGERPRINT_JS + "return epFingerprint();")
+            ordered = cache.order(cache_key, chain, current)
+        result = self._run(first_of(ordered, root), timeout, f"No candidate of {chain!r} matched",
+                           fingerprint=cache is not None)
+        hit = result["value"]
+        locator = ordered.locators[hit["index"]]
+        if cache:
+            cache.record(cache_key, result.get("fingerprint", ""), locator, promoted=ordered is not chain)
+        return ChainMatch(hit["value"], chain.locators.index(locator), locator)
+
+    def _run(self, condition, timeout, message, fingerprint=False):
+        timeout = self.timeout if timeout is None else timeout
+        evaluate = getattr(self.driver, "evaluate_condition", None)
+        if evaluate:
+            # StaticDriver: the parsed page cannot change while we wait
+            value = evaluate(condition)
+            if value is None:
+                raise TimeoutException(message)
+            return {"ok": True, "value": value}
+        deadline = time.monotonic() + timeout
+        _ensure_script_timeout(self.driver, timeout)
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                result = self.driver.execute_async_script(WAIT_JS, condition, int(remaining * 1000), fingerprint)
+            except JavascriptException as e:
+                # the page navigated mid-wait; re-arm the observer on the new document
+                if "unload" not in str(e).lower() or time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+                continue
+            if result and result.get("ok"):
+                return result
+            if result and result.get("error"):
+                raise InvalidSelectorException(result["error"])
+            raise TimeoutException(message)
+
+
+def page_contains(driver, text, scope=None, case_insensitive: bool = True, timeout: float = 0) -> bool:
+    """
+    True if the page (or `scope`) contains `text`, checked inside the browser so the
+    document is never serialised; with a timeout it waits for the text to appear.
+    """
+    try:
+        return BrowserWait(driver, timeout).until(contains_text(text, scope, case_insensitive))
+    except TimeoutException:
+        return False
+
+
+def wait_for_idle(driver, timeout: float = 10, quiet_ms: int = 100) -> bool:
+    """Page-object-free form of BasePage.wait_for_idle() for tests that drive the browser directly."""
+    try:
+        BrowserWait(driver, timeout).until(idle(quiet_ms))
+        return True
+    except TimeoutException:
+        return False
+
+
+def _ensure_script_timeout(driver, seconds: float):
+    # the JS timer enforces the real deadline; the session limit only has to be larger,
+    # so it is raised once per driver instead of on every wait
+    needed = max(seconds + 5, 60)
+    if getattr(driver, "_ep_script_timeout", 0) < needed:
+        driver.set_script_timeout(needed)
+        driver._ep_script_timeout = needed
+
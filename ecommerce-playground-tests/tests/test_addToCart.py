@@ -1,33 +1,16 @@
 import pytest
 from pages.home_page import HomePage
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
-BASE_URL = "https://ecommerce-playground.lambdatest.io"
-
-@pytest.fixture(scope="session")
-def driver():
-    """Initialize Chrome WebDriver"""
-    opts = Options()
-    opts.add_argument("--window-size=1600,1000")
-    service = ChromeService(ChromeDriverManager().install())
-    drv = webdriver.Chrome(service=service, options=opts)
-    yield drv
-    drv.quit()
-
-
-def test_add_to_cart_function(driver):
+def test_add_to_cart_function(driver, base_url):
     """
     Function Name: Add to Cart Function
     Objective: Verify that the product selected from the homepage is correctly added to the shopping cart.
     """
 
-    home = HomePage(driver, BASE_URL)
+    home = HomePage(driver, base_url)
     home.open()
 
     product_name = "HTC Touch HD"
@@ -1,13 +1,14 @@
 
 # Test case for F6 Blog Comment Submission
 import pytest
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from pages.blog_page import BlogPage
+from support.wait_policy import probing
 
 
+@pytest.mark.profile("faithful")
 @pytest.mark.usefixtures("driver")
 class TestBlogComment:
     def test_blog_comment_submission(self, driver, base_url):
@@ -26,7 +27,6 @@ class TestBlogComment:
         # scrolling to the comment section first - scroll directly to the form element
         page.scroll_to_comment_form()
         page.wait_for_page_ready()
-        time.sleep(0.5)  # Wait for scroll to complete
         
         # Verify comment form is visible before taking screenshot
         try:
@@ -60,14 +60,11 @@ class TestBlogComment:
         
         # ensuring the success alert is visible in viewport for screenshot
         if success_message:
-            # Wait a moment for alert to be fully visible
-            time.sleep(1)
             # scrolling to form to ensure alert is visible in screenshot
             page.ensure_success_alert_visible()
         else:
             # if no message yet, scrolling to form area anyway
-            page.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
+            page.driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'instant'});")
         
         page.take_screenshot("comment_submitted")
         
@@ -102,7 +99,8 @@ class TestBlogComment:
             # Try to find any success indicator
             try:
                 # Look for any alert or success indicator
-                alerts = page.driver.find_elements(By.CSS_SELECTOR, ".alert, [class*='success'], [class*='alert-success']")
+                with probing(page.driver):
+                    alerts = page.driver.find_elements(By.CSS_SELECTOR, ".alert, [class*='success'], [class*='alert-success']")
                 if alerts:
                     for alert in alerts:
                         text = alert.text.strip()
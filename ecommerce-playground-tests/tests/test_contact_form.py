@@ -1,9 +1,9 @@
 
 import pytest
-import time
 from pages.contact_page import ContactPage
 
 
+@pytest.mark.profile("faithful")
 @pytest.mark.usefixtures("driver")
 class TestContactForm:
     def test_contact_form_submission(self, driver, base_url):
@@ -15,8 +15,6 @@ class TestContactForm:
         print("="*60)
         print("Contact Us page loaded successfully!")
         page.open()
-        #delay to see page loaded
-        time.sleep(1) 
 
         #Verifying page loaded correctly
         print("Verifying page loaded correctly...")
@@ -24,7 +22,6 @@ class TestContactForm:
         print("Page loaded successfully!")
         print("Taking screenshot of page loaded...")
         page.take_screenshot("F11_contact_page_loaded")
-        time.sleep(1)  
         
         #Filling contact form
         print("Filling contact form...")
@@ -36,12 +33,10 @@ class TestContactForm:
        
         print("Taking screenshot of filled form...")
         page.take_screenshot("F11_contact_form_filled")
-        time.sleep(1)  
         
         #Submitting form
         print("Submitting form...")
         page.submit_form()
-        time.sleep(1)  
         
         #Waiting for redirect to success page
         print("Waiting for redirect to success page...")
@@ -50,7 +45,6 @@ class TestContactForm:
         print("Redirect to success page done!")
         print("Taking screenshot of success page...")
         page.take_screenshot("F11_contact_success_page")
-        time.sleep(1)
         
         # Verifying success message on success page
         print("Verifying success message...")
@@ -63,13 +57,11 @@ class TestContactForm:
         print(f"Success message confirmed: '{success_message}'")
         print("Taking screenshot of success message visible...")
         page.take_screenshot("F11_contact_success_message_displayed")
-        time.sleep(2)
         
         # Clicking Continue button to go to home page
         print("Clicking Continue button to return to home page...")
         continue_clicked = page.click_continue_button()
         if continue_clicked:
-            time.sleep(2)  # Wait for navigation
             print("Continue button clicked!")
             
             # Verifying on home page
@@ -78,7 +70,6 @@ class TestContactForm:
                 print(f"  Current URL: {driver.current_url}")
                 print("Taking screenshot of home page...")
                 page.take_screenshot("F11_contact_home_page")
-                time.sleep(2)
             else:
                 print(f"Navigation completed. Current URL: {driver.current_url}")
                 page.take_screenshot("F11_contact_after_continue")
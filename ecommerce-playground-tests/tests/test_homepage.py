@@ -1,6 +1,9 @@
 import pytest
+from selenium.webdriver.common.by import By
 from pages.home_page import HomePage
+from support.extract import Query
 
+@pytest.mark.static
 def test_homepage_loads(driver, base_url):
     home = HomePage(driver, base_url)
     home.open()
@@ -14,7 +17,8 @@ def test_homepage_loads(driver, base_url):
     if not has_products:
         print("DIAG: url=", driver.current_url)
         print("DIAG: title=", driver.title)
-        print("DIAG: snapshot (first 3000 chars) =", driver.page_source[:3000])
+        body = home.extract({"body": Query((By.TAG_NAME, "body"), first=True)})["body"] or ""
+        print("DIAG: visible text (first 3000 chars) =", body[:3000])
     assert has_products
 
     # Success message for visibility in CI or local runs
@@ -1,10 +1,11 @@
 
 # Test case for F5: Product compare
 import pytest
-import time
 from pages.compare_page import ComparePage
+from support.wait_policy import probing
 
 
+@pytest.mark.profile("faithful")
 @pytest.mark.usefixtures("driver")
 class TestProductCompare: 
     def test_product_compare_functionality(self, driver, base_url):
@@ -18,10 +19,9 @@ class TestProductCompare:
         print("\nOpening search page...")
         search_url = "index.php?route=product/search&search="
         driver.get(f"{base_url}/{search_url}")
-        time.sleep(2)
+        compare_page.wait_for_idle()
         print("Search page loaded!")
         compare_page.take_screenshot("Search page loaded")
-        time.sleep(1)
         
         # Adding at least 2 products to compare
         print("\nAdding products to compare list...")
@@ -42,12 +42,13 @@ class TestProductCompare:
             ]
             
             all_compare_buttons = []
-            for selector in compare_button_selectors:
-                try:
-                    buttons = driver.find_elements("css selector", selector)
-                    all_compare_buttons.extend(buttons)
-                except Exception:
-                    continue
+            with probing(driver):
+                for selector in compare_button_selectors:
+                    try:
+                        buttons = driver.find_elements("css selector", selector)
+                        all_compare_buttons.extend(buttons)
+                    except Exception:
+                        continue
             
             # Removing duplicates while preserving order
             seen = set()
@@ -61,36 +62,34 @@ class TestProductCompare:
             if len(unique_buttons) >= 2:  
                 # Add first product
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", unique_buttons[0])
-                    time.sleep(0.5)
+                    compare_page.scroll_into_view(unique_buttons[0])
                     try:
                         unique_buttons[0].click()
                     except Exception:
                         driver.execute_script("arguments[0].click();", unique_buttons[0])
+                    # the add-to-compare call is AJAX; wait for it instead of sleeping
+                    compare_page.wait_for_idle()
                     products_added += 1
                     print(f"Added product {products_added} to compare list!")
-                    time.sleep(1)
                 except Exception as e:
                     print(f" Could not add first product: {e}")
                 
                 # Add second product
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", unique_buttons[1])
-                    time.sleep(0.5)
+                    compare_page.scroll_into_view(unique_buttons[1])
                     try:
                         unique_buttons[1].click()
                     except Exception:
                         driver.execute_script("arguments[0].click();", unique_buttons[1])
+                    compare_page.wait_for_idle()
                     products_added += 1
                     print(f"Added product {products_added} to compare list!")
-                    time.sleep(1)
                 except Exception as e:
                     print(f" Could not add second product: {e}")
                 
                 if products_added > 0:
                     print(f"Taking screenshot after adding {products_added} product(s)...")
                     compare_page.take_screenshot("Products added to compare list")
-                    time.sleep(1)
             else:
                 print(f" Found only {len(unique_buttons)} compare button(s). Added {products_added} product(s).")
         except Exception as e:
@@ -99,10 +98,9 @@ class TestProductCompare:
         # Opening the compare page
         print("\nOpening compare page...")
         compare_page.open_from_main_header()
-        time.sleep(2)
+        compare_page.wait_for_idle()
         print("Compare page loaded!")
         compare_page.take_screenshot("Compare page loaded")
-        time.sleep(1)
         
         # Verifying the compare page loaded
         print("\nVerifying compare page...")
@@ -123,7 +121,6 @@ class TestProductCompare:
         print(f"  Products: {product_names}")
         print("Taking screenshot with products...")
         compare_page.take_screenshot("Products in compare list")
-        time.sleep(2)
 
         # Removing a product from compare list
         print("\nRemoving a product from compare list...")
@@ -148,7 +145,6 @@ class TestProductCompare:
             print(f"Success message displayed: '{success_message}'")
             print("Taking screenshot with success message...")
             compare_page.take_screenshot("success_message")
-            time.sleep(1)
         else:
             print(" Success message not found (this may be normal depending on the site behavior)")
         
@@ -1,28 +1,11 @@
 import pytest
 from pages.home_page import HomePage
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
-BASE_URL = "https://ecommerce-playground.lambdatest.io"
 
-
-@pytest.fixture(scope="session")
-def driver():
-    """Initialize Chrome WebDriver."""
-    opts = Options()
-    opts.add_argument("--window-size=1600,1000")
-    service = ChromeService(ChromeDriverManager().install())
-    drv = webdriver.Chrome(service=service, options=opts)
-    yield drv
-    drv.quit()
-
-
-def test_promotion_link_washing_machine(driver):
+def test_promotion_link_washing_machine(driver, base_url):
     """
     Function: Promotional Link Function
     Goal: Verify the 'Shop Now' button in the 'Up to 50% Off on Fully Automatic Top Load Washing Machine'
@@ -34,7 +17,7 @@ def test_promotion_link_washing_machine(driver):
     change the assertion to check for 'category' in the URL.
     """
 
-    home = HomePage(driver, BASE_URL)
+    home = HomePage(driver, base_url)
     home.open()
 
     driver.execute_script("window.scrollBy(0, 1200);")
@@ -63,12 +46,12 @@ def test_promotion_link_washing_machine(driver):
 
 
 @pytest.mark.xfail(reason="Expected correct behavior after bug is fixed")
-def test_promotion_link_washing_machine_expected_after_fix(driver):
+def test_promotion_link_washing_machine_expected_after_fix(driver, base_url):
     """
     Same scenario as above, but expresses the correct expectation for when the site is fixed.
     This test is marked xfail for now.
     """
-    home = HomePage(driver, BASE_URL)
+    home = HomePage(driver, base_url)
     home.open()
     driver.execute_script("window.scrollBy(0, 1200);")
 
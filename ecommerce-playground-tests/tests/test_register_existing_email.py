@@ -5,8 +5,8 @@ from pages.register_page import RegisterPage
 @pytest.mark.usefixtures("driver")
 class TestRegisterExistingEmail:
     #This test is for Function F14 Unique User Emails
-    def test_register_with_existing_email_shows_warning(self, driver):
-        page = RegisterPage(driver, base_url="https://ecommerce-playground.lambdatest.io/")
+    def test_register_with_existing_email_shows_warning(self, driver, base_url):
+        page = RegisterPage(driver, base_url=base_url)
         page.open_from_home()
         # fill using the CSV test data: first/last/email/telephone/password
         page.fill_registration_form(
@@ -1,13 +1,12 @@
 import time, random, string
-from selenium import webdriver
+import pytest
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from support.waits import page_contains
 
-REGISTER_URL = "https://ecommerce-playground.lambdatest.io/index.php?route=account/register"
+REGISTER_PATH = "index.php?route=account/register"
 
 def unique_email():
     suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
@@ -18,23 +17,15 @@ def click_js(driver, element):
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
     driver.execute_script("arguments[0].click();", element)
 
-def test_user_registration():
+def test_user_registration(driver, base_url):
     email = unique_email()
     print(email)
     password = "Test@12345"
 
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.set_window_size(1300, 900)
-
     print("Working on the URL + field values to be set")
 
     try:
-        driver.get(REGISTER_URL)
+        driver.get(urljoin(base_url, REGISTER_PATH))
 
         # Fill fields
         driver.find_element(By.NAME, "firstname").send_keys("Sumangala")
@@ -57,17 +48,12 @@ def test_user_registration():
         click_js(driver, cont)
 
         # Verify
-        WebDriverWait(driver, 10).until(EC.text_to_be_present_in_element(
-            (By.TAG_NAME, "body"), "Your Account Has Been Created!"
-        ))
-        assert "Your Account Has Been Created!" in driver.page_source
+        assert page_contains(driver, "Your Account Has Been Created!", case_insensitive=False, timeout=10)
         print("!!!!!!!!!!!Test Passed...Registration Successful!!!!!!!!!!!!!")
 
     except Exception as e:
         print("!!!!!!!!!!Test Failed!!!!!!!!!!!!!:", e)
         raise
-    finally:
-        driver.quit()
 
 if __name__ == "__main__":
-    test_user_registration()
+    raise SystemExit(pytest.main([__file__, "-s"]))
@@ -3,6 +3,7 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from support.wait_policy import probing
 
 PDP_PATH = "/index.php?route=product/product&product_id=107"  # iPhone
 
@@ -16,11 +17,12 @@ def test_review_submission_logged_in(driver, helpers, creds):
 
     # Open the Reviews tab (many OpenCart themes have #tab-review or an anchor with text)
     # Try a few robust locators:
-    for css in ["a[href='#tab-review']", "a[data-toggle='tab'][href*='review']", "li a[href*='review']"]:
-        tabs = driver.find_elements(By.CSS_SELECTOR, css)
-        if tabs:
-            tabs[0].click()
-            break
+    with probing(driver):
+        for css in ["a[href='#tab-review']", "a[data-toggle='tab'][href*='review']", "li a[href*='review']"]:
+            tabs = driver.find_elements(By.CSS_SELECTOR, css)
+            if tabs:
+                tabs[0].click()
+                break
 
     # Wait for review form presence (try multiple selectors)
     name_input = WebDriverWait(driver, 15).until(
@@ -50,11 +52,12 @@ def test_review_submission_logged_in(driver, helpers, creds):
 
     # Submit review (OpenCart classic: #button-review or input[value='Continue'])
     submit = None
-    for css in ["#button-review", "button#button-review", "input[value='Continue']", "button[type='submit']"]:
-        elems = driver.find_elements(By.CSS_SELECTOR, css)
-        if elems:
-            submit = elems[0]
-            break
+    with probing(driver):
+        for css in ["#button-review", "button#button-review", "input[value='Continue']", "button[type='submit']"]:
+            elems = driver.find_elements(By.CSS_SELECTOR, css)
+            if elems:
+                submit = elems[0]
+                break
     assert submit, "Review submit button not found"
     submit.click()
 
@@ -69,11 +72,12 @@ def test_review_too_short_validation(driver, helpers, creds):
     helpers.login(creds["email"], creds["password"])
     helpers.open(PDP_PATH)
 
-    for css in ["a[href='#tab-review']", "a[data-toggle='tab'][href*='review']", "li a[href*='review']"]:
-        tabs = driver.find_elements(By.CSS_SELECTOR, css)
-        if tabs:
-            tabs[0].click()
-            break
+    with probing(driver):
+        for css in ["a[href='#tab-review']", "a[data-toggle='tab'][href*='review']", "li a[href*='review']"]:
+            tabs = driver.find_elements(By.CSS_SELECTOR, css)
+            if tabs:
+                tabs[0].click()
+                break
 
     name_input = WebDriverWait(driver, 15).until(
         EC.visibility_of_element_located((By.CSS_SELECTOR, "#input-name, input[name='name'], input#name"))
@@ -88,11 +92,12 @@ def test_review_too_short_validation(driver, helpers, creds):
     review_textarea.send_keys("Too short")
 
     submit = None
-    for css in ["#button-review", "button#button-review", "input[value='Continue']", "button[type='submit']"]:
-        elems = driver.find_elements(By.CSS_SELECTOR, css)
-        if elems:
-            submit = elems[0]
-            break
+    with probing(driver):
+        for css in ["#button-review", "button#button-review", "input[value='Continue']", "button[type='submit']"]:
+            elems = driver.find_elements(By.CSS_SELECTOR, css)
+            if elems:
+                submit = elems[0]
+                break
     assert submit
     submit.click()
 
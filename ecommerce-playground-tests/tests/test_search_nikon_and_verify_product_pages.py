@@ -1,29 +1,24 @@
 # This tests F15 Search products
 import pytest
-import time
 import traceback
+from urllib.parse import urljoin
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-
-HOME_URL = "https://ecommerce-playground.lambdatest.io/index.php?route=common/home"
+from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, WebDriverException
+from support.extract import Query, extract
+from support.fan_out import fan_out
+from support.locators import LocatorChain
+from support.wait_policy import probing
+from support.waits import BrowserWait, wait_for_idle
+
+HOME_PATH = "index.php?route=common/home"
 SEARCH_TERM = "Nikon"
 TIMEOUT = 20  # increased timeout for slower responses
 SHORT = 2
 
-def make_driver(headless=True):
-    opts = Options()
-    if headless:
-        opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1400,1000")
-    return webdriver.Chrome(options=opts)
-
 def try_close_overlays(driver):
     selectors = [
         ".modal .close",
@@ -32,34 +27,34 @@ def try_close_overlays(driver):
         ".fancybox-close",
         ".mfp-close"
     ]
-    for sel in selectors:
-        try:
-            els = driver.find_elements(By.CSS_SELECTOR, sel)
-            for el in els:
-                if el.is_displayed():
-                    try:
-                        el.click()
-                        time.sleep(0.2)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+    with probing(driver):
+        for sel in selectors:
+            try:
+                els = driver.find_elements(By.CSS_SELECTOR, sel)
+                for el in els:
+                    if el.is_displayed():
+                        try:
+                            el.click()
+                            wait_for_idle(driver, SHORT)
+                        except Exception:
+                            pass
+            except Exception:
+                pass
 
-def find_search_input(driver, wait):
-    selectors = [
-        "input[name='search']",
-        "input[type='search']",
-        "input#search",
-        "input.form-control[type='text']"
-    ]
-    for sel in selectors:
-        try:
-            el = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, sel)))
-            if el.is_displayed():
-                return el
-        except Exception:
-            continue
-    raise RuntimeError("Search input not found on home page (tried several selectors)")
+SEARCH_INPUT = LocatorChain(
+    (By.CSS_SELECTOR, "input[name='search']"),
+    (By.CSS_SELECTOR, "input[type='search']"),
+    (By.CSS_SELECTOR, "input#search"),
+    (By.CSS_SELECTOR, "input.form-control[type='text']"),
+    name="search input",
+    require="visible",
+)
+
+def find_search_input(driver, timeout=TIMEOUT):
+    try:
+        return BrowserWait(driver, timeout).first(SEARCH_INPUT, cache_key=f"{__name__}.find_search_input").element
+    except TimeoutException:
+        raise RuntimeError("Search input not found on home page (tried several selectors)")
 
 def collect_product_links_from_results(driver, wait):
     try:
@@ -77,10 +72,10 @@ def collect_product_links_from_results(driver, wait):
         "h4 a",
         ".product-name a"
     ]
+    hrefs = extract(driver, {sel: Query((By.CSS_SELECTOR, sel), "href") for sel in link_selectors})
     links = []
     for sel in link_selectors:
-        for el in driver.find_elements(By.CSS_SELECTOR, sel):
-            href = el.get_attribute("href")
+        for href in hrefs[sel]:
             if href and href not in links:
                 links.append(href)
     return links
@@ -88,60 +83,66 @@ def collect_product_links_from_results(driver, wait):
 def product_page_contains_term(driver, term):
     term_lower = term.lower()
 
-    for sel in ["h1", ".product-info h1", ".product-title h1", "h1#content"]:
-        try:
-            el = driver.find_element(By.CSS_SELECTOR, sel)
-            if el and term_lower in el.text.strip().lower():
-                return True, f"found in name ({sel})"
-        except Exception:
-            pass
+    # every section is read in one call; most of them are optional on a product page
+    name_selectors = ["h1", ".product-info h1", ".product-title h1", "h1#content"]
+    spec = {sel: Query((By.CSS_SELECTOR, sel), "text", first=True) for sel in name_selectors}
+    spec.update({
+        "details": Query((By.CSS_SELECTOR, ".list-unstyled li, .product-info .list-unstyled li, #content .list-unstyled li")),
+        "tags": Query((By.CSS_SELECTOR, ".tags a, .product-tags a, .tag-list a")),
+        "description": Query((By.CSS_SELECTOR, ".description, #tab-description, .product-desc, .tab-content")),
+        "body": Query((By.TAG_NAME, "body"), first=True),
+    })
+    page = extract(driver, spec)
 
-    try:
-        details = driver.find_elements(By.CSS_SELECTOR, ".list-unstyled li, .product-info .list-unstyled li, #content .list-unstyled li")
-        details_text = " ".join([d.text for d in details]).lower()
-        if term_lower in details_text:
-            return True, "found in product details/manufacturer"
-    except Exception:
-        pass
+    for sel in name_selectors:
+        if page[sel] and term_lower in page[sel].lower():
+            return True, f"found in name ({sel})"
 
-    try:
-        tags = driver.find_elements(By.CSS_SELECTOR, ".tags a, .product-tags a, .tag-list a")
-        tags_text = " ".join([t.text for t in tags]).lower()
-        if term_lower in tags_text:
-            return True, "found in tags"
-    except Exception:
-        pass
+    if term_lower in " ".join(page["details"]).lower():
+        return True, "found in product details/manufacturer"
 
-    try:
-        desc_els = driver.find_elements(By.CSS_SELECTOR, ".description, #tab-description, .product-desc, .tab-content")
-        desc_text = " ".join([d.text for d in desc_els]).lower()
-        if term_lower in desc_text:
-            return True, "found in description"
-    except Exception:
-        pass
+    if term_lower in " ".join(page["tags"]).lower():
+        return True, "found in tags"
 
-    try:
-        body_text = driver.find_element(By.TAG_NAME, "body").text.lower()
-        if term_lower in body_text:
-            return True, "found in page body (fallback)"
-    except Exception:
-        pass
+    if term_lower in " ".join(page["description"]).lower():
+        return True, "found in description"
+
+    if term_lower in (page["body"] or "").lower():
+        return True, "found in page body (fallback)"
 
     return False, "not found"
 
+def check_product_page(driver, url):
+    """fan_out check: None when the product page mentions SEARCH_TERM, else the report text."""
+    try:
+        driver.get(url)
+    except WebDriverException as e:
+        return f"page failed to load ({e.msg})"
+    # only a StaticDriver sees the HTTP status; a browser (driver_pool) gets the store's "not found" page
+    status = getattr(driver, "status_code", None)
+    if status is not None and status >= 400:
+        return f"page failed to load (HTTP {status})"
+    if "not found" in driver.title.lower():
+        return f"page failed to load (title: {driver.title})"
+
+    found, reason = product_page_contains_term(driver, SEARCH_TERM)
+    if found:
+        return None
+    snippet = driver.find_element(By.TAG_NAME, "body").text[:600].replace("\n", " ")
+    return f"title: {driver.title} -- reason: {reason} -- snippet: {snippet}"
+
 @pytest.mark.integration
-def test_search_nikon_and_verify_product_pages():
-    driver = make_driver(headless=True)
+def test_search_nikon_and_verify_product_pages(driver, base_url):
     wait = WebDriverWait(driver, TIMEOUT)
     errors = []
     links = []
 
     try:
-        driver.get(HOME_URL)
-        time.sleep(0.3)
+        driver.get(urljoin(base_url, HOME_PATH))
+        wait_for_idle(driver, SHORT)
         try_close_overlays(driver)
 
-        search_input = find_search_input(driver, wait)
+        search_input = find_search_input(driver)
         search_input.clear()
         search_input.send_keys(SEARCH_TERM)
 
@@ -177,24 +178,13 @@ def test_search_nikon_and_verify_product_pages():
             except TimeoutException:
                 raise TimeoutException("Search results page did not load (no product tiles and URL unchanged)")
 
-        time.sleep(0.5)
+        wait_for_idle(driver, SHORT)
 
         links = collect_product_links_from_results(driver, wait)
         assert links, "No product links found on the search results page"
 
-        for idx, url in enumerate(links, start=1):
-            driver.get(url)
-            try:
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            except TimeoutException:
-                errors.append(f"{idx}. {url} -- page failed to load (timeout)")
-                continue
-
-            found, reason = product_page_contains_term(driver, SEARCH_TERM)
-            if not found:
-                title = driver.title
-                snippet = driver.find_element(By.TAG_NAME, "body").text[:600].replace("\n", " ")
-                errors.append(f"{idx}. {url} -- title: {title} -- reason: {reason} -- snippet: {snippet}")
+        # product pages are server-rendered, so they are read over HTTP, several at a time
+        errors = [f"{f.index}. {f.url} -- {f.reason}" for f in fan_out(links, check_product_page)]
 
         if errors:
             pytest.fail("The following product pages failed verification:\n" + "\n".join(errors))
@@ -210,6 +200,3 @@ def test_search_nikon_and_verify_product_pages():
         except Exception:
             pass
         pytest.fail(f"Unexpected error during test: {exc}\nURL: {driver.current_url}\nTitle: {driver.title}\nSnippet: {page_snippet}\nTraceback:\n{tb}")
-
-    finally:
-        driver.quit()
@@ -0,0 +1,90 @@
+import json
+import os
+import socket
+import time
+import pytest
+from support.account_pool import AccountPool, _is_stale
+from support.accounts import Account
+
+
+class FakeProvisioner:
+    base_url = "http://127.0.0.1:1/"
+
+    def __init__(self):
+        self.registered = 0
+
+    def register(self):
+        self.registered += 1
+        return Account(f"user{self.registered}@example.com", "Test@12345")
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return AccountPool(FakeProvisioner(), size=2, path=str(tmp_path))
+
+
+def test_ensure_tops_up_to_size(pool):
+    pool.ensure()
+    pool.ensure()
+    assert pool.provisioner.registered == 2
+    assert [r["email"] for r in pool._read()] == ["user1@example.com", "user2@example.com"]
+
+
+def test_leases_are_exclusive(pool, tmp_path):
+    pool.ensure()
+    other = AccountPool(pool.provisioner, size=2, path=str(tmp_path))
+    first, second = pool.lease(), other.lease()
+    assert first["email"] != second["email"]
+    # both taken: the next lease registers a new account on the spot
+    assert pool.lease()["email"] == "user3@example.com"
+
+
+def test_release_frees_and_counts_uses(pool):
+    pool.ensure(1)
+    creds = pool.lease()
+    pool.release(creds, test="t::a")
+    assert pool.lease() == creds
+    record = pool._read()[0]
+    assert (record["uses"], record["last_test"]) == (1, "t::a")
+
+
+def test_retired_account_is_not_leased_again(pool):
+    pool.ensure(1)
+    creds = pool.lease()
+    pool.release(creds, retire=True)
+    pool._filler.join()
+    assert pool.lease()["email"] != creds["email"]
+    assert pool.report()["retired"] == 1
+
+
+def _lease_file(tmp_path, **owner):
+    path = tmp_path / "x.lock"
+    path.write_text(json.dumps(dict({"host": socket.gethostname(), "pid": os.getpid(), "time": time.time()}, **owner)))
+    return str(path)
+
+
+def test_lease_of_a_live_process_is_not_stale(tmp_path):
+    assert not _is_stale(_lease_file(tmp_path), ttl=900)
+
+
+def test_lease_of_a_dead_process_is_stale(tmp_path):
+    # pid_max on Linux is at most 2**22
+    assert _is_stale(_lease_file(tmp_path, pid=2 ** 22 + 1), ttl=900)
+
+
+def test_lease_from_another_host_waits_for_the_ttl(tmp_path):
+    path = _lease_file(tmp_path, host="elsewhere", pid=2 ** 22 + 1)
+    assert not _is_stale(path, ttl=900)
+    old = time.time() - 1000
+    os.utime(path, (old, old))
+    assert _is_stale(path, ttl=900)
+
+
+def test_ensure_prunes_old_retired_records(pool, monkeypatch):
+    monkeypatch.setattr("support.account_pool.RETIRED_KEEP", 2)
+    pool._write([{"email": f"old{i}@example.com", "password": "x", "retired": True, "last_used": i}
+                  for i in range(5)])
+    pool.ensure()
+    records = pool._read()
+    assert [r["email"] for r in records if r.get("retired")] == ["old3@example.com", "old4@example.com"]
+    assert sum(1 for r in records if not r.get("retired")) == 2
@@ -0,0 +1,96 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from support.asset_cache import AssetCache, _fresh_for, _storable
+from support.static_driver import http_session
+
+CSS = {"content-type": "text/css"}
+
+
+def test_storable_static_response():
+    assert _storable(200, CSS)
+    assert _storable(200, dict(CSS, vary="Accept-Encoding"))
+
+
+@pytest.mark.parametrize("status, extra", [
+    (404, {}),
+    (200, {"cache-control": "no-store"}),
+    (200, {"cache-control": "private, max-age=60"}),
+    (200, {"set-cookie": "OCSESSID=abc"}),
+    (200, {"vary": "Cookie"}),
+    (200, {"content-type": "text/html; charset=utf-8"}),
+])
+def test_not_storable(status, extra):
+    assert not _storable(status, dict(CSS, **extra))
+
+
+def test_fresh_for():
+    assert _fresh_for({"cache-control": "public, max-age=3600"}, 600) == 3600
+    assert _fresh_for({}, 600) == 600
+    assert _fresh_for({"cache-control": "no-cache, max-age=3600"}, 600) == 0
+
+
+def test_handles_only_static_gets():
+    cache = AssetCache.__new__(AssetCache)
+    assert cache.handles("GET", "https://store.example/catalog/view/theme/style.css?v=2")
+    assert not cache.handles("POST", "https://store.example/style.css")
+    assert not cache.handles("GET", "https://store.example/index.php?route=common/home")
+
+
+class _Asset(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    max_age = 0
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"body{color:red}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/css")
+        self.send_header("Cache-Control", f"max-age={self.max_age}")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def asset_server():
+    _Asset.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Asset)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/style.css"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_stores_then_revalidates(tmp_path, asset_server):
+    cache = AssetCache(path=str(tmp_path))
+    session = http_session()
+    first = cache.fetch(session, asset_server, {}, 5)
+    second = cache.fetch(session, asset_server, {}, 5)
+    assert first[0] == second[0] == 200
+    assert first[3] == second[3] == b"body{color:red}"
+    # max-age=0: the second request asks the server, which answers 304
+    assert _Asset.hits == [None, '"v1"']
+    report = cache.report()
+    assert (report["misses"], report["revalidated"], report["hits"]) == (1, 1, 0)
+    assert report["stored_bytes"] == len(b"body{color:red}")
+
+
+def test_fetch_serves_fresh_entries_from_disk(tmp_path, asset_server, monkeypatch):
+    monkeypatch.setattr(_Asset, "max_age", 60)
+    cache = AssetCache(path=str(tmp_path))
+    session = http_session()
+    cache.fetch(session, asset_server, {}, 5)
+    assert cache.fetch(session, asset_server, {}, 5)[3] == b"body{color:red}"
+    assert len(_Asset.hits) == 1
+    assert cache.report()["hits"] == 1
@@ -0,0 +1,80 @@
+import json
+import pytest
+from support.auth_state import AuthStateStore
+from support.helpers import Helpers
+
+BASE = "http://shop.test/"
+SESSION = {"name": "OCSESSID", "value": "abc", "domain": "shop.test", "path": "/"}
+CURRENCY = {"name": "currency", "value": "USD", "domain": "shop.test", "path": "/"}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.cdp = []
+        self.visited = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {"identifier": "1"}
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AuthStateStore(BASE, str(tmp_path))
+
+
+@pytest.fixture
+def helpers(store, monkeypatch):
+    h = Helpers(FakeDriver(), BASE)
+    h.store = store
+    monkeypatch.setattr("support.helpers.wait_for_idle", lambda driver, timeout: None)
+    return h
+
+
+def test_snapshot_keeps_the_session_cookie(store):
+    store.save("a@example.com", [SESSION, CURRENCY], {"origin": BASE[:-1], "localStorage": {"k": "v"}}, 2.0)
+    state = store.load("a@example.com")
+    assert [c["name"] for c in state["cookies"]] == ["OCSESSID", "currency"]
+    assert state["localStorage"] == {"k": "v"}
+
+
+def test_snapshot_without_a_session_is_not_restored(store):
+    store.save("a@example.com", [CURRENCY], {}, 2.0)
+    assert store.load("a@example.com") is None
+
+
+def test_login_restores_without_contacting_the_store(helpers, store):
+    store.save("a@example.com", [SESSION, CURRENCY], {"origin": "http://shop.test", "localStorage": {"k": "v"}}, 2.0)
+    helpers.login("a@example.com", "pw")
+    assert helpers.driver.visited == []
+    (set_cookies, cookies), (add_script, script) = helpers.driver.cdp
+    assert set_cookies == "Network.setCookies"
+    assert [c["name"] for c in cookies["cookies"]] == ["OCSESSID", "currency"]
+    assert add_script == "Page.addScriptToEvaluateOnNewDocument" and json.dumps({"k": "v"}) in script["source"]
+    assert store.report()["restores"] == 1
+
+
+def test_open_logs_in_again_only_when_redirected_to_login(helpers, store, monkeypatch):
+    store.save("a@example.com", [SESSION], {}, 2.0)
+    form_logins = []
+    monkeypatch.setattr(helpers, "_form_login", lambda email, password: form_logins.append(email))
+    helpers.login("a@example.com", "pw")
+
+    helpers.open("index.php?route=account/newsletter")
+    assert form_logins == []
+
+    # the store no longer knows the session and sends the browser to the login page
+    monkeypatch.setattr(helpers.driver, "get", lambda url: (
+        helpers.driver.visited.append(url),
+        setattr(helpers.driver, "current_url", BASE + "index.php?route=account/login"),
+    ))
+    helpers.open("index.php?route=account/newsletter")
+    assert form_logins == ["a@example.com"]
+    assert helpers.driver.visited[-2:] == [BASE + "index.php?route=account/newsletter"] * 2
+    report = store.report()
+    assert (report["restores"], report["expired"], report["saved_s"]) == (1, 1, 0.0)
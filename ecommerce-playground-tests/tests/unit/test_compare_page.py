@@ -0,0 +1,27 @@
+from lxml import html as lxml_html
+from pages.compare_page import ComparePage
+from support.static_driver import StaticDriver
+
+
+def _page(source):
+    driver = StaticDriver()
+    driver.page_source = source
+    driver._doc = lxml_html.document_fromstring(source, base_url="http://store.test/")
+    return ComparePage(driver, "http://store.test/")
+
+
+def test_product_names_from_the_first_row():
+    page = _page('<table id="compare-products"><thead><tr>'
+                 '<th><a href="http://store.test/index.php?route=product/product&product_id=31">Nikon D300</a></th>'
+                 '<th><a href="http://store.test/index.php?route=product/product&product_id=40">iPhone</a></th>'
+                 '</tr></thead></table>')
+    assert page.get_product_names() == ["Nikon D300", "iPhone"]
+
+
+def test_candidate_with_only_remove_links_falls_through():
+    # the header candidate matches, but only a Remove link: the next candidate must be tried
+    page = _page('<table id="compare-products"><thead><tr>'
+                 '<th><a href="http://store.test/index.php?route=product/product&remove=31">Remove</a></th>'
+                 '</tr></thead><tbody><tr><td><strong>Nikon D300</strong></td><td><strong>iPhone</strong></td>'
+                 '<td><strong>Nikon D300</strong></td></tr></tbody></table>')
+    assert page.get_product_names() == ["Nikon D300", "iPhone"]
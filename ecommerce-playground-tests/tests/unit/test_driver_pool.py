@@ -0,0 +1,115 @@
+import threading
+from types import SimpleNamespace
+import pytest
+from support.driver_pool import DriverPool, summarize
+
+
+class FakeDriver:
+    """Just enough of a Chrome session for DriverPool: scripts, CDP, windows, quit."""
+
+    def __init__(self):
+        self.session_id = "s1"
+        self.timeouts = SimpleNamespace(implicit_wait=0)
+        self.window_handles = ["main"]
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+        self.visited = []
+        self.cdp = []
+        self.quit_called = False
+        self.broken = False
+
+    def execute(self, command, params=None):
+        return {"value": None}
+
+    def implicitly_wait(self, seconds):
+        self.execute("setTimeouts", {"implicit": int(seconds * 1000)})
+
+    def execute_script(self, script, *args):
+        if self.broken:
+            raise RuntimeError("session deleted")
+        return 1 if script == "return 1" else None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+        return {}
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.made = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        drv = FakeDriver()
+        with self._lock:
+            self.made.append(drv)
+        return drv
+
+
+@pytest.fixture
+def factory():
+    return Factory()
+
+
+def test_released_drivers_are_reset_and_reused(factory):
+    pool = DriverPool(factory, implicit_wait=0)
+    first = pool.acquire()
+    pool.release(first, test="t1")
+    second = pool.acquire()
+    assert second.driver is first.driver and (first.hit, second.hit) == (False, True)
+    assert "Network.clearBrowserCookies" in first.driver.cdp
+    assert first.driver.visited[-1] == DriverPool.BLANK_URL
+    assert len(factory.made) == 1
+
+
+def test_failed_and_worn_out_sessions_are_recycled(factory):
+    pool = DriverPool(factory, max_uses=2, implicit_wait=0)
+    lease = pool.acquire()
+    pool.release(lease, failed=True)
+    assert lease.recycled and lease.driver.quit_called
+
+    lease = pool.acquire()
+    pool.release(lease)
+    lease = pool.acquire()
+    pool.release(lease)
+    assert lease.recycled and lease.driver.quit_called
+    assert len(factory.made) == 2
+
+
+def test_unhealthy_idle_sessions_are_replaced(factory):
+    pool = DriverPool(factory, implicit_wait=0)
+    lease = pool.acquire()
+    pool.release(lease)
+    lease.driver.broken = True
+    fresh = pool.acquire()
+    assert fresh.driver is not lease.driver and not fresh.hit
+    assert lease.driver.quit_called
+
+
+def test_prewarmed_spares_are_handed_out(factory):
+    pool = DriverPool(factory, spares=1, implicit_wait=0)
+    pool.prewarm()
+    lease = pool.acquire()
+    assert lease.hit and lease.prewarmed
+    pool.release(lease)
+    pool.close()
+    assert all(drv.quit_called for drv in factory.made)
+
+
+def test_report_totals(factory):
+    pool = DriverPool(factory, implicit_wait=0)
+    for failed in (False, False, True):
+        pool.release(pool.acquire(), failed=failed, test="t")
+    totals = summarize([pool.report()])
+    assert (totals["leases"], totals["hits"], totals["misses"], totals["recycled"]) == (3, 2, 1, 1)
+    assert totals["launches"] == 1
+
+
+def test_unknown_isolation_is_rejected(factory):
+    with pytest.raises(ValueError):
+        DriverPool(factory, isolation="incognito")
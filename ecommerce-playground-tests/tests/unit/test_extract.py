@@ -0,0 +1,71 @@
+import pytest
+from selenium.webdriver.common.by import By
+from support.extract import EXTRACT_JS, Query, extract
+from support.locators import LocatorChain
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+
+NAMES = (By.CSS_SELECTOR, ".product-thumb h4 a")
+HIDDEN_MENU = (By.CSS_SELECTOR, "#widget-navbar-217834 a")
+
+
+@pytest.fixture(scope="module")
+def page():
+    server = StandIn().start()
+    driver = StaticDriver()
+    driver.get(server.base_url + "index.php?route=product/category&path=33")
+    yield driver
+    driver.quit()
+    server.stop()
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="colour"):
+        Query(NAMES, ("text", "colour"))
+    assert Query(NAMES, "@title").fields == "@title"
+
+
+def test_one_call_reads_every_key(page):
+    data = extract(page, {
+        "names": Query(NAMES),
+        "rows": Query(NAMES, ("text", "href", "tag"), limit=1),
+        "title": Query((By.TAG_NAME, "h1"), "text", first=True),
+        "missing": Query((By.ID, "no-such-element"), first=True),
+    })
+    assert "Nikon D300" in data["names"]
+    [row] = data["rows"]
+    assert row["text"] == data["names"][0] and row["tag"] == "a"
+    assert row["href"].startswith("http") and "product_id=" in row["href"]
+    assert (data["title"], data["missing"]) == ("Cameras", None)
+
+
+def test_chains_within_and_visible_only(page):
+    data = extract(page, {
+        "fallback": Query(LocatorChain((By.ID, "no-such-element"), (By.TAG_NAME, "h1"))),
+        "scoped": Query((By.TAG_NAME, "a"), within=(By.ID, "logo")),
+        "unscoped": Query((By.TAG_NAME, "a"), within=(By.ID, "no-such-element")),
+        "hidden": Query(HIDDEN_MENU, "visible"),
+        "shown": Query(HIDDEN_MENU, visible_only=True),
+    })
+    assert data["fallback"] == ["Cameras"]
+    assert data["scoped"] == ["Your Store"]
+    assert data["unscoped"] == []
+    assert data["hidden"] and not any(data["hidden"])
+    assert data["shown"] == []
+
+
+def test_browsers_get_the_whole_spec_in_one_script():
+    class Browser:
+        def __init__(self):
+            self.calls = []
+
+        def execute_script(self, script, *args):
+            self.calls.append((script, args))
+            return {"title": "Cameras"}
+
+    driver = Browser()
+    assert extract(driver, {"title": Query((By.TAG_NAME, "h1"), first=True)}) == {"title": "Cameras"}
+    [(script, (specs, root))] = driver.calls
+    assert script == EXTRACT_JS and root is None
+    assert specs == {"title": {"locators": [["tag name", "h1"]], "fields": "text", "first": True,
+                               "within": None, "visibleOnly": False, "limit": None}}
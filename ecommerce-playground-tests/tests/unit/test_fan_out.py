@@ -0,0 +1,85 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from support.fan_out import PageFailure, fan_out, map_pages
+from support.stand_in import StandIn
+
+CATEGORIES = (25, 33, 24, 18)
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = StandIn().start()
+    yield server
+    server.stop()
+
+
+def test_map_pages_returns_results_in_url_order(stand_in):
+    urls = [f"{stand_in.base_url}index.php?route=product/category&path={cid}" for cid in CATEGORIES]
+    titles = map_pages(urls, lambda d, u: (d.get(u), d.title)[1], workers=4)
+    assert titles == ["Components", "Cameras", "Phones & PDAs", "Laptops & Notebooks"]
+
+
+def test_results_keep_their_order_when_pages_finish_out_of_order():
+    def read(driver, delay):
+        time.sleep(delay)
+        return delay
+    assert map_pages([0.05, 0.0, 0.02], read, workers=3) == [0.05, 0.0, 0.02]
+
+
+def test_map_pages_reraises_the_first_error():
+    def read(driver, url):
+        raise LookupError(url)
+    with pytest.raises(LookupError):
+        map_pages(["a", "b"], read)
+
+
+def test_fan_out_reports_reasons_and_exceptions_by_index():
+    def check(driver, url):
+        if url == "bad":
+            return "HTTP 500"
+        if url == "boom":
+            raise RuntimeError("  ")
+        return None
+    failures = fan_out(["ok", "bad", "ok", "boom"], check, workers=2)
+    assert failures == [PageFailure(2, "bad", "HTTP 500"), PageFailure(4, "boom", "RuntimeError: no message")]
+
+
+def test_fail_fast_skips_urls_not_yet_started():
+    seen = []
+
+    def check(driver, url):
+        seen.append(url)
+        return "broken"
+    failures = fan_out(["a", "b", "c"], check, workers=1, fail_fast=True)
+    assert (failures, seen) == ([PageFailure(1, "a", "broken")], ["a"])
+
+
+class FakeDriverPool:
+    def __init__(self):
+        self.leased, self.released = [], []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        lease = SimpleNamespace(driver=object())
+        with self._lock:
+            self.leased.append(lease)
+        return lease
+
+    def release(self, lease, failed, test):
+        self.released.append((lease, failed, test))
+
+
+def test_each_worker_leases_one_browser_and_returns_it():
+    pool = FakeDriverPool()
+    barrier = threading.Barrier(2)
+
+    def read(driver, url):
+        barrier.wait(timeout=5)   # both workers busy at once, so each leases its own driver
+        return driver
+    drivers = map_pages(["a", "b", "c", "d"], read, workers=2, driver_pool=pool)
+    assert len(pool.leased) == 2
+    assert set(map(id, drivers)) == {id(lease.driver) for lease in pool.leased}
+    assert sorted((id(lease), failed, test) for lease, failed, test in pool.released) == \
+        sorted((id(lease), False, "fan_out") for lease in pool.leased)
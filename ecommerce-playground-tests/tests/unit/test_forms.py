@@ -0,0 +1,85 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from support.forms import INSERT_TEXT, PREPARE_INSERT_JS, SCRIPTED_FIELDS_JS, SET_VALUES_JS, fill_form
+from support.locators import LocatorChain
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+
+FIRSTNAME = (By.NAME, "firstname")
+EMAIL = (By.NAME, "email")
+AGREE = (By.NAME, "agree")
+
+
+class RecordingDriver(StaticDriver):
+    """StaticDriver that records the scripts fill_form sends instead of running them."""
+
+    def __init__(self):
+        super().__init__()
+        self.scripts = []
+        self.cdp = []
+        self.errors = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if script == SCRIPTED_FIELDS_JS:
+            return [el.tag_name == "select" or el.get_attribute("type") in ("checkbox", "radio") for el in args[0]]
+        if script == SET_VALUES_JS:
+            return self.errors
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = StandIn().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def driver(stand_in):
+    d = RecordingDriver()
+    d.get(stand_in.base_url + "index.php?route=account/register")
+    yield d
+    d.quit()
+
+
+def test_set_value_fills_the_form_in_one_script(driver):
+    fill_form(driver, {FIRSTNAME: "Ada", EMAIL: "ada@example.com", AGREE: True, (By.NAME, "telephone"): None},
+              timeout=0)
+    [(script, (pairs,))] = driver.scripts
+    assert script == SET_VALUES_JS
+    assert [(el.get_attribute("name"), value) for el, value in pairs] == [
+        ("firstname", "Ada"), ("email", "ada@example.com"), ("agree", True)]
+
+
+def test_chains_resolve_to_their_first_match(driver):
+    fill_form(driver, {LocatorChain((By.ID, "no-such-field"), FIRSTNAME): "Ada"}, timeout=0)
+    [(_, (pairs,))] = driver.scripts
+    assert pairs[0][0].get_attribute("name") == "firstname"
+
+
+def test_insert_text_scripts_only_toggles_and_types_the_rest(driver):
+    fill_form(driver, {FIRSTNAME: "Ada", AGREE: True, EMAIL: "ada@example.com"}, fidelity=INSERT_TEXT, timeout=0)
+    scripts = [script for script, _ in driver.scripts]
+    assert scripts == [SCRIPTED_FIELDS_JS, SET_VALUES_JS, PREPARE_INSERT_JS, PREPARE_INSERT_JS]
+    assert [el.get_attribute("name") for el, _ in driver.scripts[1][1][0]] == ["agree"]
+    assert driver.cdp == [("Input.insertText", {"text": "Ada"}), ("Input.insertText", {"text": "ada@example.com"})]
+
+
+def test_missing_fields_are_named(driver):
+    with pytest.raises(NoSuchElementException, match="no-such-field") as error:
+        fill_form(driver, {FIRSTNAME: "Ada", (By.ID, "no-such-field"): "x"}, timeout=0)
+    assert "firstname" not in str(error.value)
+    assert driver.scripts == []
+
+
+def test_script_errors_and_bad_fidelity_raise_value_error(driver):
+    driver.errors = ["zone_id: no option \"Nowhere\""]
+    with pytest.raises(ValueError, match="Nowhere"):
+        fill_form(driver, {FIRSTNAME: "Ada"}, timeout=0)
+    with pytest.raises(ValueError, match="Unknown fill fidelity"):
+        fill_form(driver, {FIRSTNAME: "Ada"}, fidelity="paste")
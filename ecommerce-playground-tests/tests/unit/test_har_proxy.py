@@ -0,0 +1,68 @@
+import os
+from datetime import datetime, timezone
+from support.har_proxy import (REPLAY, SESSION_ARCHIVE, HarProxy, _har_entry, _local_cookie, _match_key,
+                               merge_session_archives)
+
+
+def test_match_key_drops_jquery_cache_buster():
+    assert _match_key("GET", "/index.php?route=a&_=1700000000&x=1") == "GET /index.php?route=a&x=1"
+
+
+def test_match_key_ignores_body_for_get():
+    assert _match_key("GET", "/p?route=a", b"q=1") == _match_key("GET", "/p?route=a")
+
+
+def test_match_key_tells_post_bodies_apart():
+    first = _match_key("POST", "/index.php?route=account/login", b"email=a%40x.com")
+    second = _match_key("POST", "/index.php?route=account/login", b"email=b%40x.com")
+    plain = _match_key("POST", "/index.php?route=account/login")
+    assert first != second
+    assert first.startswith(plain + " #") and second.startswith(plain + " #")
+
+
+def test_match_key_digests_bodies_as_archived():
+    # the archive keeps bodies as text, so undecodable bytes must key like their replacement characters
+    raw = b"name=\xff"
+    assert _match_key("POST", "/p", raw) == _match_key("POST", "/p", raw.decode("utf-8", "replace").encode("utf-8"))
+
+
+def test_local_cookie_drops_domain_and_secure():
+    cookie = _local_cookie("OCSESSID=abc; Domain=.lambdatest.io; Path=/; Secure; HttpOnly; SameSite=None")
+    assert cookie == "OCSESSID=abc; Path=/; HttpOnly; SameSite=Lax"
+
+
+def test_local_cookie_keeps_other_attributes():
+    assert _local_cookie("currency=USD; path=/; expires=Wed, 01 Jan 2031 00:00:00 GMT") == \
+        "currency=USD; path=/; expires=Wed, 01 Jan 2031 00:00:00 GMT"
+
+
+def test_rewrite_body_points_store_urls_at_the_proxy():
+    proxy = HarProxy("https://store.example/", archive_dir="unused")
+    proxy.base_url = "http://127.0.0.1:8123/"
+    body = (b'<a href="https://store.example/index.php?route=a">'
+            b'{"redirect":"https:\\/\\/store.example\\/index.php"} http://store.example/x https://cdn.example/y')
+    assert proxy._rewrite_body(body) == (
+        b'<a href="http://127.0.0.1:8123/index.php?route=a">'
+        b'{"redirect":"http:\\/\\/127.0.0.1:8123\\/index.php"} http://127.0.0.1:8123/x https://cdn.example/y'
+    )
+
+
+def _session_recording(archive_dir, worker, path, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+    proxy = HarProxy("https://store.example/", archive_dir=str(archive_dir))
+    entry = _har_entry("GET", "https://store.example" + path, [], b"", datetime.now(timezone.utc), 0.01,
+                       200, "OK", [("Content-Type", "text/plain")], worker.encode())
+    proxy._entries[SESSION_ARCHIVE] = [entry]
+    proxy.stop()
+
+
+def test_workers_session_recordings_are_merged(tmp_path, monkeypatch):
+    _session_recording(tmp_path, "gw0", "/a", monkeypatch)
+    _session_recording(tmp_path, "gw1", "/b", monkeypatch)
+    assert sorted(os.listdir(tmp_path)) == ["_session.gw0.har.gz", "_session.gw1.har.gz"]
+    assert merge_session_archives(str(tmp_path)) == 2
+    assert os.listdir(tmp_path) == ["_session.har.gz"]
+    replay = HarProxy("https://store.example/", REPLAY, archive_dir=str(tmp_path))
+    # a test that never recorded these requests finds both workers' session traffic
+    assert replay._lookup("test_x", "GET", "/a")["response"]["status"] == 200
+    assert replay._lookup("test_x", "GET", "/b") is not None
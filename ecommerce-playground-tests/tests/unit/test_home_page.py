@@ -0,0 +1,85 @@
+import pytest
+from selenium.webdriver.common.by import By
+from pages.home_page import CategoryLink, HomePage
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = StandIn().start()
+    yield server
+    server.stop()
+
+
+class _Panel:
+    def __init__(self, names):
+        self.names = names
+
+    def find_elements(self, by, value):
+        assert (by, value) == (By.TAG_NAME, "a")
+        return [_Link(name) for name in self.names]
+
+
+class _Link:
+    def __init__(self, text):
+        self.text = text
+
+    def click(self):
+        pass
+
+
+class _Home(HomePage):
+    """The panel read and the browser click are faked; following links runs for real over HTTP."""
+
+    def __init__(self, base_url, links, panel=()):
+        super().__init__(StaticDriver(), base_url)
+        self.links = links
+        self.panel = list(panel)
+        self.clicked = []
+
+    def visit(self, path):
+        pass
+
+    def open_category_panel(self, timeout=None):
+        return _Panel(self.panel)
+
+    def category_links(self):
+        return self.links
+
+    def wait_for_page_ready(self, timeout=None):
+        self.clicked.append(self.driver.current_url)
+        return True
+
+
+def test_links_are_followed_over_http(stand_in):
+    cameras = stand_in.base_url + "index.php?route=product/category&path=33"
+    home = stand_in.base_url + "index.php?route=common/home"
+    page = _Home(stand_in.base_url, [("Cameras", cameras), ("Gaming consoles", home), ("Cameras", cameras)])
+    assert page.audit_categories(workers=2) == [
+        CategoryLink("Cameras", cameras, cameras),
+        CategoryLink("Gaming consoles", home, home),
+        CategoryLink("Cameras", cameras, cameras),
+    ]
+    assert page.clicked == []
+
+
+def test_only_unfollowable_links_are_clicked(stand_in):
+    cameras = stand_in.base_url + "index.php?route=product/category&path=33"
+    page = _Home(stand_in.base_url, [("Cameras", cameras), ("Deals", "javascript:void(0)")],
+                 panel=["Cameras", "Deals"])
+    links = page.audit_categories()
+    assert [link.name for link in links] == ["Cameras", "Deals"]
+    assert len(page.clicked) == 1
+
+
+def test_link_that_does_not_load_fails_the_audit(stand_in):
+    broken = stand_in.base_url + "index.php?route=no/such/category"
+    with pytest.raises(AssertionError, match="Broken: .* HTTP 404"):
+        _Home(stand_in.base_url, [("Broken", broken)]).audit_categories()
+
+
+def test_category_missing_after_rerender_is_named(stand_in):
+    page = _Home(stand_in.base_url, [("Cameras", "#"), ("Deals", "#")], panel=["Cameras"])
+    with pytest.raises(AssertionError, match="'Deals' \\(link 2\\) is missing"):
+        page.audit_categories()
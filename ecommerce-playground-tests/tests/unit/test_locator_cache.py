@@ -0,0 +1,50 @@
+import json
+from selenium.webdriver.common.by import By
+from support.locator_cache import LocatorCache
+from support.locators import LocatorChain
+
+PRIMARY = (By.ID, "button-cart")
+FALLBACK = (By.CSS_SELECTOR, "button.btn-cart")
+CHAIN = LocatorChain(PRIMARY, FALLBACK)
+
+
+def test_unknown_key_keeps_the_chain(tmp_path):
+    cache = LocatorCache(str(tmp_path / "locators.json"))
+    assert cache.order("ProductPage.add", CHAIN, "f1") is CHAIN
+
+
+def test_winner_is_promoted_on_the_same_fingerprint(tmp_path):
+    cache = LocatorCache(str(tmp_path / "locators.json"))
+    cache.record("ProductPage.add", "f1", FALLBACK)
+    ordered = cache.order("ProductPage.add", CHAIN, "f1")
+    assert ordered.locators == [FALLBACK, PRIMARY]
+    assert cache.order("ProductPage.add", CHAIN, "f2") is CHAIN
+
+
+def test_hits_count_only_promoted_wins(tmp_path):
+    cache = LocatorCache(str(tmp_path / "locators.json"))
+    cache.record("k", "f1", FALLBACK)
+    cache.record("k", "f1", FALLBACK)
+    cache.record("k", "f1", FALLBACK, promoted=True)
+    assert cache.report() == {"lookups": 3, "hits": 1, "invalidated": 0}
+
+
+def test_new_fingerprint_invalidates_and_relearns(tmp_path):
+    cache = LocatorCache(str(tmp_path / "locators.json"))
+    cache.record("k", "f1", FALLBACK)
+    cache.record("k", "f2", PRIMARY, promoted=True)
+    assert cache.report()["invalidated"] == 1
+    assert cache.report()["hits"] == 0
+    assert cache.order("k", CHAIN, "f2").locators[0] == PRIMARY
+
+
+def test_save_merges_with_other_processes(tmp_path):
+    path = tmp_path / "locators.json"
+    path.write_text(json.dumps({"other": {"fingerprint": "f9", "locator": ["id", "x"]}}))
+    cache = LocatorCache(str(path))
+    cache.record("k", "f1", FALLBACK)
+    cache.save()
+    saved = json.loads(path.read_text())
+    assert saved["other"]["locator"] == ["id", "x"]
+    assert saved["k"] == {"fingerprint": "f1", "locator": list(FALLBACK)}
+    assert LocatorCache(str(path)).order("k", CHAIN, "f1").locators[0] == FALLBACK
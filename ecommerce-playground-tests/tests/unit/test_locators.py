@@ -0,0 +1,53 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from support.locators import LocatorChain
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+from support.waits import BrowserWait
+
+MISSING = (By.ID, "no-such-element")
+HIDDEN_MENU = (By.CSS_SELECTOR, "#widget-navbar-217834 a")
+HEADING = (By.TAG_NAME, "h1")
+
+
+@pytest.fixture(scope="module")
+def page():
+    server = StandIn().start()
+    driver = StaticDriver()
+    driver.get(server.base_url + "index.php?route=product/category&path=33")
+    yield driver
+    driver.quit()
+    server.stop()
+
+
+def test_chain_validates_its_arguments():
+    with pytest.raises(ValueError):
+        LocatorChain()
+    with pytest.raises(ValueError):
+        LocatorChain(HEADING, require="enabled")
+
+
+def test_prefer_moves_a_candidate_to_the_front():
+    chain = LocatorChain(MISSING, HIDDEN_MENU, HEADING, name="heading", require="visible")
+    preferred = chain.prefer(list(HEADING))
+    assert preferred.locators == [HEADING, MISSING, HIDDEN_MENU]
+    assert (preferred.name, preferred.require) == ("heading", "visible")
+    assert chain.locators == [MISSING, HIDDEN_MENU, HEADING]
+
+
+def test_first_returns_the_earliest_candidate_that_matches(page):
+    match = BrowserWait(page, 0).first(LocatorChain(MISSING, HIDDEN_MENU, HEADING))
+    assert (match.index, match.locator) == (1, HIDDEN_MENU)
+    assert match.element is match.elements[0]
+
+
+def test_first_honours_the_chain_requirement(page):
+    match = BrowserWait(page, 0).first(LocatorChain(MISSING, HIDDEN_MENU, HEADING, require="visible"))
+    assert (match.index, match.locator) == (2, HEADING)
+    assert match.element.text == "Cameras"
+
+
+def test_first_names_the_chain_when_nothing_matches(page):
+    with pytest.raises(TimeoutException, match="LocatorChain\\(missing\\)"):
+        BrowserWait(page, 0).first(LocatorChain(MISSING, name="missing"))
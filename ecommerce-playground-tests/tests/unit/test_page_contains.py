@@ -0,0 +1,37 @@
+import pytest
+from selenium.webdriver.common.by import By
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+from support.waits import contains_text, page_contains
+
+
+@pytest.fixture(scope="module")
+def page():
+    server = StandIn().start()
+    driver = StaticDriver()
+    driver.get(server.base_url + "index.php?route=product/category&path=33")
+    yield driver
+    driver.quit()
+    server.stop()
+
+
+def test_matches_ignore_case_and_whitespace(page):
+    assert page_contains(page, "nikon   d300")
+    assert not page_contains(page, "nikon d300", case_insensitive=False)
+    assert not page_contains(page, "Canon EOS 9D")
+
+
+def test_scope_limits_where_text_is_looked_for(page):
+    assert page_contains(page, "Cameras", scope="h1")
+    assert not page_contains(page, "Nikon D300", scope=(By.TAG_NAME, "h1"))
+    assert not page_contains(page, "Cameras", scope="#no-such-element")
+
+
+def test_hidden_text_counts_like_page_source(page):
+    # the category menu is display: none
+    assert page_contains(page, "washing machine")
+
+
+def test_css_scopes_become_locators():
+    assert contains_text("x", "h1")["scope"] == ["css selector", "h1"]
+    assert contains_text("x")["scope"] is None
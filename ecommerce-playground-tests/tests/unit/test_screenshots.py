@@ -0,0 +1,120 @@
+import base64
+import os
+import threading
+import time
+import pytest
+from support.screenshots import ScreenshotWriter, _link
+
+
+def _png(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def test_submit_returns_a_handle_to_the_written_file(tmp_path):
+    writer = ScreenshotWriter(root=str(tmp_path))
+    shot = writer.submit(_png(b"frame"), "home", str(tmp_path / "w"))
+    assert os.path.basename(shot.path).startswith("home_")
+    with open(shot, "rb") as fh:
+        assert fh.read() == b"frame"
+    writer.close()
+    assert shot.done() and writer.shots == 1
+
+
+def test_same_name_never_overwrites(tmp_path):
+    writer = ScreenshotWriter(root=str(tmp_path))
+    shots = [writer.submit(_png(bytes([i])), "same", str(tmp_path / "w")) for i in range(5)]
+    writer.close()
+    paths = [shot.result() for shot in shots]
+    assert len(set(paths)) == 5
+    assert [open(p, "rb").read() for p in paths] == [bytes([i]) for i in range(5)]
+
+
+def test_full_queue_makes_the_caller_wait(tmp_path):
+    writer = ScreenshotWriter(queue_size=1, root=str(tmp_path))
+    threads = [threading.Thread(target=writer.submit, args=(_png(b"x" * i), "q", str(tmp_path / "w")))
+               for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    assert writer.shots == 8 and not writer.errors
+
+
+def test_write_errors_reach_the_handle(tmp_path):
+    (tmp_path / "blocked").write_text("a file, not a directory")
+    writer = ScreenshotWriter(root=str(tmp_path))
+    shot = writer.submit(_png(b"frame"), "x", str(tmp_path / "blocked"))
+    writer.close()
+    with pytest.raises(OSError):
+        shot.result()
+    assert writer.errors
+
+
+def test_link_never_overwrites(tmp_path):
+    obj = tmp_path / "obj.png"
+    obj.write_bytes(b"one")
+    target = str(tmp_path / "shot.png")
+    assert _link(str(obj), target) == target
+    assert _link(str(obj), target) == str(tmp_path / "shot-1.png")
+    assert (tmp_path / "shot-1.png").read_bytes() == b"one"
+
+
+def test_identical_frames_are_stored_once(tmp_path):
+    writer = ScreenshotWriter(root=str(tmp_path))
+    first = writer.submit(_png(b"frame"), "a", str(tmp_path / "w"))
+    second = writer.submit(_png(b"frame"), "b", str(tmp_path / "w"))
+    writer.close()
+    assert os.path.samefile(first.result(), second.result())
+    assert len(os.listdir(tmp_path / ".objects")) == 1
+    assert (writer.shots, writer.deduplicated) == (2, 1)
+
+
+def test_prune_removes_least_recent_image_with_all_its_names(tmp_path):
+    writer = ScreenshotWriter(root=str(tmp_path), max_bytes=10)
+    old = [writer.submit(_png(b"old-frame"), name, str(tmp_path / "w")) for name in ("a", "b")]
+    writer.flush()
+    past = time.time() - 60
+    os.utime(os.path.join(tmp_path, ".objects", os.listdir(tmp_path / ".objects")[0]), (past, past))
+    new = writer.submit(_png(b"new-frame"), "c", str(tmp_path / "w"))
+    writer.close()   # prunes
+    assert [os.path.exists(shot.result()) for shot in old] == [False, False]
+    assert os.path.exists(new.result())
+    assert (writer.evicted, writer.stored_bytes) == (1, len(b"new-frame"))
+
+
+def test_on_failure_keeps_only_failed_tests(tmp_path):
+    writer = ScreenshotWriter(mode="on-failure", root=str(tmp_path))
+    writer.start_test("t::pass")
+    passed = writer.submit(_png(b"p"), "p", str(tmp_path / "w"))
+    writer.finish_test(False, "t::pass")
+    writer.start_test("t::fail")
+    failed = writer.submit(_png(b"f"), "f", str(tmp_path / "w"))
+    assert failed.held
+    writer.finish_test(True, "t::fail")
+    writer.close()
+    assert os.path.exists(failed.result())
+    assert passed.done() and writer.dropped == 1
+
+
+def test_sampled_out_tests_skip_the_capture(tmp_path):
+    class Driver:
+        def get_screenshot_as_base64(self):
+            raise AssertionError("a sampled-out test must not render a screenshot")
+
+    writer = ScreenshotWriter(mode="sampled", sample_rate=0.0, root=str(tmp_path))
+    writer.start_test("t::a")
+    assert writer.capture(Driver(), "x", str(tmp_path / "w")) is None
+    writer.finish_test(False, "t::a")
+    assert writer.dropped == 1
+
+
+def test_worker_thread_shots_follow_their_test(tmp_path):
+    writer = ScreenshotWriter(mode="on-failure", root=str(tmp_path))
+    writer.start_test("t::a")
+    test = writer._running_test()
+    writer.finish_test(True, "t::a")
+    # a fan_out worker's shot that lands after the (failed) test ended is still written
+    late = writer.submit(_png(b"late"), "late", str(tmp_path / "w"), test=test)
+    writer.close()
+    assert os.path.exists(late.result())
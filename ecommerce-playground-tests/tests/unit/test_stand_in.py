@@ -0,0 +1,53 @@
+import pytest
+from support.accounts import AccountProvisioner
+from support.stand_in import SEED_ACCOUNTS, SESSION_COOKIE, StandIn
+from support.static_driver import http_session
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn().start()
+    yield server
+    server.stop()
+
+
+def test_home_page_sets_a_session(stand_in):
+    session = http_session()
+    resp = session.get(stand_in.base_url)
+    assert resp.status_code == 200
+    assert SESSION_COOKIE in session.cookies
+    session.get(stand_in.base_url)
+    assert stand_in.report()["sessions"] == 1
+
+
+def test_unknown_route_is_a_listed_404(stand_in):
+    resp = http_session().get(stand_in.base_url + "index.php?route=no/such")
+    assert resp.status_code == 404
+    assert stand_in.report()["not_found"] == ["GET /index.php?route=no/such"]
+
+
+def test_login_with_a_seeded_account(stand_in):
+    session = http_session()
+    seed = SEED_ACCOUNTS[1]
+    resp = session.post(stand_in.base_url + "index.php?route=account/login",
+                        data={"email": seed["email"], "password": seed["password"]})
+    assert resp.url.endswith("route=account/account")
+    assert "My Account" in resp.text
+
+
+def test_wrong_password_is_refused(stand_in):
+    resp = http_session().post(stand_in.base_url + "index.php?route=account/login",
+                               data={"email": SEED_ACCOUNTS[1]["email"], "password": "wrong"})
+    assert "No match for E-Mail Address and/or Password" in resp.text
+
+
+def test_unknown_session_cookie_gets_a_new_session(stand_in):
+    resp = http_session().get(stand_in.base_url, headers={"Cookie": f"{SESSION_COOKIE}=from-an-earlier-run"})
+    assert resp.cookies[SESSION_COOKIE] != "from-an-earlier-run"
+
+
+def test_provisioner_registers_over_http(stand_in):
+    account = AccountProvisioner(stand_in.base_url).register()
+    assert account.email.lower() in stand_in.accounts
+    assert any(c["name"] == SESSION_COOKIE for c in account.cookies)
+    assert stand_in.report()["registered"] == 1
@@ -0,0 +1,36 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver, http_session
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = StandIn().start()
+    yield server
+    server.stop()
+
+
+def test_reads_server_rendered_pages(stand_in):
+    driver = StaticDriver()
+    driver.get(stand_in.base_url + "index.php?route=product/category&path=33")
+    assert driver.status_code == 200
+    assert driver.title == "Cameras"
+    names = [el.text for el in driver.find_elements(By.CSS_SELECTOR, ".product-thumb h4 a")]
+    assert "Nikon D300" in names
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.ID, "no-such-element")
+
+
+def test_quit_leaves_the_shared_pool_open(stand_in):
+    other = http_session()
+    other.get(stand_in.base_url)
+    driver = StaticDriver()
+    driver.get(stand_in.base_url)
+    driver.quit()
+    assert not driver.session.cookies
+    # the adapter is shared: its pooled connections must survive another session's quit
+    adapter = other.get_adapter(stand_in.base_url)
+    assert adapter.poolmanager.pools
+    assert other.get(stand_in.base_url).status_code == 200
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.command import Command
+from support.wait_policy import WaitPolicy, probing
+
+
+class FakeDriver:
+    """Routes implicitly_wait and lookups through execute(), like RemoteWebDriver; finds nothing."""
+
+    def __init__(self, implicit_wait=5.0):
+        self.timeouts = SimpleNamespace(implicit_wait=implicit_wait)
+        self.log = []
+
+    def execute(self, command, params=None):
+        self.log.append((command, params))
+        if command == Command.FIND_ELEMENT:
+            raise NoSuchElementException(params["value"])
+        return {"value": [] if command == Command.FIND_ELEMENTS else None}
+
+    def implicitly_wait(self, seconds):
+        self.execute(Command.SET_TIMEOUTS, {"implicit": int(seconds * 1000)})
+
+    def find_element(self, by, value):
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by, value):
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})["value"]
+
+    def implicit_waits(self):
+        return [params["implicit"] for command, params in self.log if command == Command.SET_TIMEOUTS]
+
+
+def test_install_is_idempotent_and_adopts_the_current_wait():
+    driver = FakeDriver(implicit_wait=5.0)
+    policy = WaitPolicy.install(driver)
+    assert WaitPolicy.install(driver) is policy
+    assert (policy.implicit_wait, driver.implicit_waits()) == (5.0, [])
+    WaitPolicy.install(driver, implicit_wait=2)
+    assert (policy.implicit_wait, policy.current, driver.implicit_waits()) == (2, 2, [2000])
+
+
+def test_probing_zeroes_the_implicit_wait_and_restores_it():
+    driver = FakeDriver()
+    WaitPolicy.install(driver, implicit_wait=3)
+    with probing(driver):
+        assert driver.find_elements("css selector", ".cookie-banner") == []
+    assert driver.implicit_waits() == [3000, 0, 3000]
+    assert driver._ep_wait_policy.stats()["implicit_misses"] == 0
+
+
+def test_misses_under_an_implicit_wait_are_counted():
+    driver = FakeDriver()
+    policy = WaitPolicy.install(driver, implicit_wait=3)
+    with pytest.raises(NoSuchElementException):
+        driver.find_element("id", "missing")
+    driver.find_elements("css selector", ".none")
+    # a test that sets its own implicit wait is tracked too
+    driver.implicitly_wait(0)
+    driver.find_elements("css selector", ".none")
+    stats = policy.stats()
+    assert stats["implicit_misses"] == 2 and stats["implicit_lost_s"] >= 0
+    policy.reset_stats()
+    assert policy.stats() == {"implicit_lost_s": 0.0, "implicit_misses": 0}
+
+
+def test_probing_without_a_wait_sends_no_timeouts():
+    driver = FakeDriver(implicit_wait=0)
+    with probing(driver):
+        driver.find_elements("css selector", ".none")
+    assert driver.implicit_waits() == []
@@ -0,0 +1,90 @@
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from support.stand_in import StandIn
+from support.static_driver import StaticDriver
+from support.waits import (BrowserWait, all_of, any_of, present, text_present, url_changes, url_contains,
+                           visible)
+
+HIDDEN_MENU = (By.CSS_SELECTOR, "#widget-navbar-217834 a")
+HEADING = (By.TAG_NAME, "h1")
+
+
+@pytest.fixture(scope="module")
+def page():
+    server = StandIn().start()
+    driver = StaticDriver()
+    driver.get(server.base_url + "index.php?route=product/category&path=33")
+    yield driver
+    driver.quit()
+    server.stop()
+
+
+def test_present_and_visible_differ_on_hidden_elements(page):
+    waits = BrowserWait(page, 0)
+    assert waits.until(present(HIDDEN_MENU))
+    with pytest.raises(TimeoutException, match="menu hidden"):
+        waits.until(visible(HIDDEN_MENU), message="menu hidden")
+
+
+def test_text_and_url_conditions(page):
+    waits = BrowserWait(page, 0)
+    assert [el.text for el in waits.until(text_present(HEADING, "Cameras"))] == ["Cameras"]
+    assert "path=33" in waits.until(url_contains("product/category"))
+    assert waits.until(url_changes("about:blank")) == page.current_url
+    with pytest.raises(TimeoutException):
+        waits.until(url_changes(page.current_url))
+
+
+def test_any_of_reports_the_first_condition_that_holds(page):
+    hit = BrowserWait(page, 0).until(any_of(visible(HIDDEN_MENU), present(HEADING), url_contains("category")))
+    assert hit["index"] == 1 and hit["value"][0].text == "Cameras"
+
+
+def test_all_of_needs_every_condition(page):
+    waits = BrowserWait(page, 0)
+    assert len(waits.until(all_of(present(HEADING), url_contains("category")))) == 2
+    with pytest.raises(TimeoutException):
+        waits.until(all_of(present(HEADING), visible(HIDDEN_MENU)))
+
+
+class ScriptedDriver:
+    """Answers execute_async_script from a list of results (or exceptions to raise)."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+        self.script_timeout = None
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_async_script(self, script, condition, timeout_ms, fingerprint):
+        self.calls.append(timeout_ms)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_browser_wait_returns_the_scripts_value_in_one_call():
+    driver = ScriptedDriver({"ok": True, "value": "http://shop.test/"})
+    assert BrowserWait(driver, 5).until(url_contains("shop")) == "http://shop.test/"
+    assert len(driver.calls) == 1 and 0 < driver.calls[0] <= 5000
+    assert driver.script_timeout >= 10
+
+
+def test_browser_wait_rearms_after_a_navigation():
+    driver = ScriptedDriver(JavascriptException("document unloaded while waiting for result"),
+                            {"ok": True, "value": True})
+    assert BrowserWait(driver, 5).until(present(HEADING)) is True
+    assert len(driver.calls) == 2
+
+
+def test_browser_wait_surfaces_timeouts_and_bad_conditions():
+    with pytest.raises(TimeoutException, match="no heading"):
+        BrowserWait(ScriptedDriver({"ok": False}), 0).until(present(HEADING), message="no heading")
+    with pytest.raises(InvalidSelectorException, match="Unknown wait condition"):
+        BrowserWait(ScriptedDriver({"ok": False, "error": "Unknown wait condition: x"}), 0).until({"type": "x"})
+    with pytest.raises(JavascriptException):
+        BrowserWait(ScriptedDriver(JavascriptException("TypeError")), 5).until(present(HEADING))